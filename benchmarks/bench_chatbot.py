@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from chatbot import BasicChatbot, IntentTable, load_intent_table  # noqa: E402
+
+# Mix of matching, non-matching and multi-intent messages seen in our logs
+SAMPLE_MESSAGES = [
+    "Hello",
+    "hi there, how are you?",
+    "What's your name?",
+    "How old are you?",
+    "What can you do?",
+    "Tell me about programming",
+    "Thank you so much",
+    "Goodbye",
+    "thanks, bye!",
+    "is it going to be sunny tomorrow",
+    "I had a long day at work and I just want to talk about something",
+    "the quick brown fox jumps over the lazy dog",
+    "can you help me write some python code",
+    "see you later",
+    "asdf qwerty zxcv",
+    "what's up",
+]
+
+
+# Everyday sentences that match no intent; any the fuzzy fallback classifies is a false positive
+ORDINARY_MESSAGES = [
+    "this is bold",
+    "my node server keeps crashing",
+    "the leaves are falling",
+    "she told me a long story",
+    "the paint is still wet",
+    "we walked along the beach",
+    "my brother bought a new bike",
+    "the movie starts at eight",
+    "please pass the salt",
+    "they painted the fence blue",
+    "the coffee was too strong",
+    "our garden needs more water",
+    "the train leaves in five minutes",
+    "he plays the guitar every night",
+    "the library closes early today",
+    "my sister works at a bakery",
+    "the kids are playing outside",
+    "the package arrived this morning",
+    "i lost my house keys",
+    "the meeting was moved to friday",
+]
+
+
+def build_corpus(size, seed=42):
+    """Build a corpus of messages by sampling the fixed message mix"""
+    rng = random.Random(seed)
+    return [rng.choice(SAMPLE_MESSAGES) for _ in range(size)]
+
+
+def legacy_match_category(bot, cleaned_input):
+    """The original per-category re.search loop, kept as the baseline"""
+    for category, data in bot.responses.items():
+        for pattern in data['patterns']:
+            if re.search(pattern, cleaned_input):
+                return category
+    return None
+
+
+def time_matcher(label, match, bot, corpus):
+    """Classify the whole corpus with one matcher and report the throughput"""
+    start = time.perf_counter()
+    results = [match(bot.clean_input(message)) for message in corpus]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:>8.2f}s  {len(corpus) / elapsed:>12,.0f} msg/s")
+    return results, elapsed
+
+
+def bench_matcher(size):
+    """Compare the keyword-index matcher against the legacy loop"""
+    bot = BasicChatbot()
+    corpus = build_corpus(size)
+    print(f"Classifying {size:,} messages")
+
+    legacy, legacy_time = time_matcher("legacy loop", lambda text: legacy_match_category(bot, text), bot, corpus)
+    compiled, compiled_time = time_matcher("indexed", bot.match_category, bot, corpus)
+
+    if legacy != compiled:
+        raise SystemExit("❌ Indexed matcher disagrees with the legacy loop!")
+    print(f"Speedup: {legacy_time / compiled_time:.2f}x (results identical)")
+
+
+def bench_batch(size, workers):
+    """Compare per-message find_response with respond_batch on the same seed"""
+    bot = BasicChatbot()
+    corpus = build_corpus(size)
+    print(f"Responding to {size:,} messages")
+
+    random.seed(7)
+    start = time.perf_counter()
+    single = [bot.find_response(message) for message in corpus]
+    single_time = time.perf_counter() - start
+    print(f"{'one by one':<12} {single_time:>8.2f}s  {size / single_time:>12,.0f} msg/s")
+
+    start = time.perf_counter()
+    _, batch = bot.respond_batch(corpus, rng=random.Random(7), workers=workers)
+    batch_time = time.perf_counter() - start
+    print(f"{'batch':<12} {batch_time:>8.2f}s  {size / batch_time:>12,.0f} msg/s  (workers={workers or 1})")
+
+    if single != batch:
+        raise SystemExit("❌ respond_batch disagrees with find_response!")
+    print(f"Speedup: {single_time / batch_time:.2f}x (replies identical)")
+
+    # The fuzzy fallback must give the same labels in both paths too
+    typo_rng = random.Random(11)
+    typos = [add_typos(message, typo_rng) for message in corpus[:20_000]]
+    fuzzy_single = BasicChatbot(fuzzy=True, seed=5)
+    fuzzy_batch = BasicChatbot(fuzzy=True, seed=5)
+    if [fuzzy_single.find_response(message) for message in typos] != fuzzy_batch.respond_batch(typos, workers=workers)[1]:
+        raise SystemExit("❌ respond_batch disagrees with find_response with fuzzy matching!")
+    print("Fuzzy replies identical")
+
+
+def bench_cache(size):
+    """Compare find_response with and without the classification cache"""
+    corpus = build_corpus(size)
+    print(f"Answering {size:,} messages")
+
+    for label, bot in (("no cache", BasicChatbot(cache_size=0, seed=1)), ("lru cache", BasicChatbot(seed=1))):
+        start = time.perf_counter()
+        for message in corpus:
+            bot.find_response(message)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {elapsed:>8.2f}s  {size / elapsed:>12,.0f} msg/s")
+    print(f"Cache stats: {bot.cache.stats()}")
+
+
+def add_typos(message, rng, rate=0.3):
+    """Misspell some words of a message with one random edit each"""
+    def misspell(match):
+        word = match.group()
+        if len(word) < 4 or rng.random() > rate:
+            return word
+        position = rng.randrange(len(word) - 1)
+        edit = rng.choice(('delete', 'swap', 'replace', 'insert'))
+        if edit == 'delete':
+            return word[:position] + word[position + 1:]
+        if edit == 'swap':
+            return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+        letter = rng.choice('abcdefghijklmnopqrstuvwxyz')
+        if edit == 'replace':
+            return word[:position] + letter + word[position + 1:]
+        return word[:position] + letter + word[position:]
+
+    return re.sub(r'\w+', misspell, message)
+
+
+def bench_fuzzy(size):
+    """Default-fallback rate and latency on a noisy corpus, with and without fuzzy matching"""
+    rng = random.Random(11)
+    corpus = [add_typos(message, rng) for message in build_corpus(size)]
+    print(f"Classifying {size:,} noisy messages")
+
+    for label, bot in (("exact only", BasicChatbot(cache_size=0)),
+                       ("fuzzy", BasicChatbot(cache_size=0, fuzzy=True))):
+        start = time.perf_counter()
+        fallbacks = sum(1 for message in corpus if bot.classify(message).category is None)
+        elapsed = time.perf_counter() - start
+        false_positives = [message for message in ORDINARY_MESSAGES if bot.classify(message).category is not None]
+        print(f"{label:<12} fallback rate {fallbacks / size:>6.1%}  "
+              f"{elapsed / size * 1e6:>8.1f} us/msg  "
+              f"false positives {len(false_positives)}/{len(ORDINARY_MESSAGES)}")
+        for message in false_positives:
+            print(f"    {message!r} -> {bot.classify(message).category}")
+
+
+def build_intents_document(count):
+    """Synthetic intents file with count intents, shaped like intents.json"""
+    intents = []
+    for index in range(count):
+        intents.append({
+            'name': f'intent_{index}',
+            'patterns': [rf'\b(topic{index}|subject{index}|tell me about item {index})\b'],
+            'replies': [f"Reply {variant} about topic {index} from {{name}}!" for variant in range(4)]
+        })
+    return {'bot_name': 'CodeBot', 'intents': intents, 'default_responses': ["I'm not sure I understand."]}
+
+
+def measure(label, build, instances, setup=None):
+    """Time building some instances, then report the memory they keep alive"""
+    def build_all():
+        kept = []
+        for _ in range(instances):
+            if setup:
+                setup()
+            kept.append(build())
+        return kept
+
+    start = time.perf_counter()
+    build_all()
+    elapsed = time.perf_counter() - start
+
+    # Measured in a second round, since tracemalloc slows allocation down a lot
+    tracemalloc.start()
+    kept = build_all()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+
+    print(f"{label:<28} {elapsed / instances * 1000:>10.2f} ms/instance  "
+          f"{retained / instances / 1024:>10.1f} KiB/instance")
+
+
+def bench_startup(intent_count, instances=10):
+    """Compare rebuilding the table in every constructor with the shared, cached loader"""
+    document = build_intents_document(intent_count)
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'intents.json')
+    with open(path, 'w', encoding='utf-8') as intents_file:
+        json.dump(document, intents_file)
+    print(f"Startup with {intent_count:,} intents")
+
+    try:
+        # The old constructor rebuilt the whole response table in every instance
+        measure("rebuild in constructor", lambda: IntentTable(
+            document['intents'], document['default_responses'], document['bot_name']), instances)
+
+        def clear_all_caches():
+            chatbot._loaded_tables.clear()
+            shutil.rmtree(os.path.join(directory, '__pycache__'), ignore_errors=True)
+
+        measure("cold load (no cache)", lambda: load_intent_table(path), 1, clear_all_caches)
+        measure("warm load (disk cache)", lambda: load_intent_table(path), 1, chatbot._loaded_tables.clear)
+
+        measure("new instance (shared)", lambda: BasicChatbot(path), instances)
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chatbot benchmarks")
+    parser.add_argument('--messages', type=int, default=1_000_000, help="corpus size")
+    parser.add_argument('--workers', type=int, default=None, help="process pool size for batch mode")
+    parser.add_argument('--intents', type=int, default=10000, help="intent count for the startup benchmark")
+    args = parser.parse_args()
+
+    bench_startup(args.intents)
+    print()
+
+    bench_matcher(args.messages)
+    print()
+    bench_batch(args.messages, args.workers)
+    print()
+    bench_cache(args.messages)
+    print()
+    bench_fuzzy(args.messages)
+
+
+if __name__ == "__main__":
+    main()
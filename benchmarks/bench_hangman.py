@@ -0,0 +1,291 @@
+import argparse
+import io
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hangman import (FrameRenderer, HangmanGame, WordState, display_hangman, display_word,  # noqa: E402
+                     load_words, mask_letters)
+from hangman_solver import WordIndex  # noqa: E402
+from hangman_stats import GameStatsStore  # noqa: E402
+from hangman_wordlist import build_word_list, difficulty  # noqa: E402
+
+
+def build_phrase(length, seed=42):
+    """Random lowercase phrase with spaces between words of 2-10 letters"""
+    rng = random.Random(seed)
+    words = []
+    total = 0
+    while total < length:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10)))
+        words.append(word)
+        total += len(word) + 1
+    return ' '.join(words)[:length]
+
+
+def play_legacy(phrase, guesses):
+    """Original loop: rebuild the display and rescan the phrase on every guess"""
+    guessed_letters = set(' ')  # spaces count as revealed so the phrase can be solved
+    for guess in guesses:
+        display_word(phrase, guessed_letters)
+        if all(letter in guessed_letters for letter in phrase):
+            break
+        guessed_letters.add(guess)
+
+
+def play_incremental(phrase, guesses, render=True):
+    """WordState: reveal in place and check the remaining-letter counter"""
+    state = WordState(phrase)
+    for guess in guesses:
+        if render:
+            state.display()
+        if state.is_solved():
+            break
+        state.reveal(guess)
+
+
+def timed(label, play, *args):
+    start = time.perf_counter()
+    play(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:>10.1f} ms")
+    return elapsed
+
+
+def bench_word_state(length):
+    """Play every letter of the alphabet against one long phrase"""
+    phrase = build_phrase(length)
+    guesses = list(string.ascii_lowercase)
+    random.Random(1).shuffle(guesses)
+    print(f"Guessing 26 letters on a {length:,}-character phrase")
+
+    legacy = timed("display_word + all()", play_legacy, phrase, guesses)
+    incremental = timed("WordState + display()", play_incremental, phrase, guesses)
+    timed("WordState, no rendering", play_incremental, phrase, guesses, False)
+    print(f"Speedup with rendering: {legacy / incremental:.1f}x")
+
+
+def build_dictionary(size, seed=7):
+    """Random pronounceable-ish words of 4-12 letters, weighted like English text"""
+    rng = random.Random(seed)
+    letters = 'etaoinshrdlcumwfgypbvkjxqz'
+    weights = [26 - rank for rank in range(26)]
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choices(letters, weights, k=rng.randint(4, 12))))
+    return sorted(words)
+
+
+def loop_suggest(dictionary, masked, guessed_letters):
+    """Plain filter: test every dictionary word against the board, then count letters"""
+    revealed = {shown for shown in masked if shown != '_'}
+    wrong = guessed_letters - revealed
+    counts = dict.fromkeys(string.ascii_lowercase, 0)
+    for word in dictionary:
+        if len(word) != len(masked):
+            continue
+        fits = all(shown == letter if shown != '_' else letter not in revealed and letter not in wrong
+                   for shown, letter in zip(masked, word))
+        if fits:
+            for letter in set(word):
+                counts[letter] += 1
+
+    best, best_count = None, 0
+    for letter in string.ascii_lowercase:
+        if letter not in guessed_letters and counts[letter] > best_count:
+            best, best_count = letter, counts[letter]
+    return best
+
+
+def bench_solver(size, boards):
+    """Index build time and per-guess suggestion latency against the plain filter"""
+    dictionary = build_dictionary(size)
+    print(f"\nSuggesting letters from a {size:,}-word dictionary")
+
+    start = time.perf_counter()
+    index = WordIndex(dictionary)
+    print(f"{'WordIndex build':<28} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+    # Boards come from real games, a few guesses into each
+    rng = random.Random(3)
+    positions = []
+    for _ in range(boards):
+        game = HangmanGame(rng.choice(dictionary))
+        for _ in range(rng.randint(0, 4)):
+            game.guess(index.suggest(game.state.masked, game.guessed))
+        positions.append((list(game.state.masked), game.guessed))
+
+    start = time.perf_counter()
+    indexed = [index.suggest(masked, guessed) for masked, guessed in positions]
+    indexed_time = (time.perf_counter() - start) / boards
+
+    start = time.perf_counter()
+    looped = [loop_suggest(dictionary, masked, set(mask_letters(guessed))) for masked, guessed in positions]
+    loop_time = (time.perf_counter() - start) / boards
+
+    assert indexed == looped
+    print(f"{'loop filter per guess':<28} {loop_time * 1000:>10.2f} ms")
+    print(f"{'WordIndex per guess':<28} {indexed_time * 1000:>10.2f} ms")
+    print(f"Speedup: {loop_time / indexed_time:.0f}x")
+
+
+def measure_load(label, load, path):
+    """Time and traced allocations of loading a word list"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    words = load(path)
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed * 1000:>10.1f} ms  {allocated / 1e6:>8.1f} MB allocated")
+    return words
+
+
+def bench_word_list(size, picks=100_000):
+    """Startup and selection cost of a text word list against the packed, mmapped one"""
+    print(f"\nLoading a {size:,}-word list")
+    words = build_dictionary(size)
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'words.txt')
+        packed_path = os.path.join(directory, 'words.hwl')
+        with open(text_path, 'w', encoding='utf-8') as text_file:
+            text_file.write('\n'.join(words))
+        start = time.perf_counter()
+        build_word_list(((word, difficulty(word)) for word in words), packed_path)
+        print(f"{'offline build':<28} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+        del words
+
+        listed = measure_load("text file -> list", load_words, text_path)
+        packed = measure_load("packed file -> mmap", load_words, packed_path)
+
+        rng = random.Random(5)
+        for label, pick in (("random.choice(list)", lambda: rng.choice(listed)),
+                            ("WordList.choice", lambda: packed.choice(rng)),
+                            ("WordList.weighted_choice", lambda: packed.weighted_choice(rng))):
+            start = time.perf_counter()
+            for _ in range(picks):
+                pick()
+            print(f"{label:<28} {(time.perf_counter() - start) / picks * 1e6:>10.2f} us per word")
+        packed.close()
+
+
+class CountingRaw(io.RawIOBase):
+    """Raw stream that counts write calls (one syscall each on a real terminal) and bytes"""
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.writes += 1
+        self.bytes += len(data)
+        return len(data)
+
+
+def terminal_stream():
+    """Text stream that buffers and flushes like stdout attached to a terminal"""
+    raw = CountingRaw()
+    return raw, io.TextIOWrapper(io.BufferedWriter(raw), encoding='utf-8', line_buffering=True)
+
+
+def render_legacy(game, status, stream):
+    """Original turn output: a print() per line of the screen"""
+    if status:
+        print(status, file=stream)
+        print("-" * 40, file=stream)
+    print(display_hangman(game.wrong_guesses), file=stream)
+    print(f"Word: {game.display()}", file=stream)
+    print(f"Guessed letters: {', '.join(sorted(set(game.guessed_letters))) if game.guessed else 'None'}",
+          file=stream)
+    print(f"Wrong guesses remaining: {game.remaining_guesses}", file=stream)
+    print(file=stream)
+
+
+def bench_render(games=200):
+    """Bytes and write syscalls per turn for each way of drawing the screen"""
+    print(f"\nDrawing every turn of {games:,} games")
+    letters = list(string.ascii_lowercase)
+    renderers = {
+        'print() per line': lambda stream: (lambda game, status: render_legacy(game, status, stream)),
+        'one write per frame': lambda stream: FrameRenderer(stream).render,
+        'ANSI changed lines': lambda stream: FrameRenderer(stream, ansi=True).render,
+    }
+    for label, make in renderers.items():
+        rng = random.Random(11)  # same games for every renderer
+        raw, stream = terminal_stream()
+        turns = 0
+        start = time.perf_counter()
+        for _ in range(games):
+            game = HangmanGame(rng.choice(['hangman', 'keyboard', 'programming', 'monitor']))
+            render = make(stream)
+            rng.shuffle(letters)
+            status = ''
+            for letter in letters:
+                render(game, status)
+                turns += 1
+                if game.is_over:
+                    break
+                status = f"Guessed '{letter}': {game.guess(letter)}"
+        elapsed = time.perf_counter() - start
+        stream.flush()
+        print(f"{label:<28} {raw.bytes / turns:>8.0f} bytes  {raw.writes / turns:>5.1f} writes  "
+              f"{elapsed / turns * 1e6:>7.1f} us per turn")
+
+
+def bench_stats(games, queries=20):
+    """Recording throughput, then summary-table queries against a GROUP BY over every game"""
+    print(f"\nRecording {games:,} games")
+    rng = random.Random(13)
+    words = build_dictionary(10_000)
+    with tempfile.TemporaryDirectory() as directory:
+        with GameStatsStore(os.path.join(directory, 'stats.db'), batch_size=10_000) as stats:
+            start = time.perf_counter()
+            for _ in range(games):
+                wrong = rng.randint(0, 6)
+                stats.record(rng.choice(words), rng.randint(wrong, 26), wrong, wrong < 6, rng.random() * 60)
+            stats.flush()
+            elapsed = time.perf_counter() - start
+            print(f"{'record + flush':<28} {games / elapsed:>10,.0f} games/s")
+
+            connection = stats._connection
+            samples = [rng.choice(words) for _ in range(queries)]
+            for label, query in (
+                    ("word_stats (summary)", lambda word: stats.word_stats(word)),
+                    ("WHERE word = ? (scan)", lambda word: connection.execute(
+                        'SELECT COUNT(*), SUM(won) FROM games WHERE word = ?', (word,)).fetchall()),
+                    ("length_stats (summary)", lambda word: stats.length_stats()),
+                    ("GROUP BY length (scan)", lambda word: connection.execute(
+                        'SELECT length, COUNT(*), SUM(won) FROM games GROUP BY length').fetchall())):
+                start = time.perf_counter()
+                for word in samples:
+                    query(word)
+                print(f"{label:<28} {(time.perf_counter() - start) / queries * 1000:>10.3f} ms per query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hangman benchmarks")
+    parser.add_argument('--length', type=int, default=100_000, help="phrase length in characters")
+    parser.add_argument('--dictionary-size', type=int, default=500_000, help="words in the solver dictionary")
+    parser.add_argument('--boards', type=int, default=20, help="boards to ask the solver about")
+    parser.add_argument('--word-list-size', type=int, default=1_000_000, help="words in the word list benchmark")
+    parser.add_argument('--stats-games', type=int, default=1_000_000, help="games written to the stats store")
+    args = parser.parse_args()
+
+    bench_word_state(args.length)
+    bench_render()
+    bench_solver(args.dictionary_size, args.boards)
+    bench_word_list(args.word_list_size)
+    bench_stats(args.stats_games)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import math
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_chatbot import SAMPLE_MESSAGES, build_intents_document  # noqa: E402
+from chatbot import DEFAULT_LABEL, IntentTable  # noqa: E402
+
+INTENT_COUNTS = [10, 100, 1000, 10000, 50000]
+
+# Width of the longest bar in the latency plot
+PLOT_WIDTH = 50
+
+
+def build_corpus(intent_count, size, seed=42):
+    """Everyday messages mixed with messages aimed at the synthetic intents"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        kind = rng.random()
+        if kind < 0.5:
+            corpus.append(rng.choice(SAMPLE_MESSAGES).lower())
+        elif kind < 0.75:
+            corpus.append(f"what do you know about topic{rng.randrange(intent_count)}")
+        else:
+            corpus.append(f"please tell me about item {rng.randrange(intent_count)} today")
+    return corpus
+
+
+class LinearMatcher:
+    def __init__(self, table):
+        """The original engine: every category regex, precompiled, tried in priority order"""
+        self.patterns = [re.compile('|'.join(table.responses[category]['patterns']))
+                         for category in table.categories]
+
+    def scan(self, cleaned_input):
+        for priority, pattern in enumerate(self.patterns):
+            if pattern.search(cleaned_input):
+                return priority
+        return DEFAULT_LABEL
+
+
+def time_engine(scan, corpus):
+    """Average microseconds per message, plus the labels for cross-checking"""
+    # Warm up first so lazily compiled regexes are not counted as matching time
+    for message in corpus:
+        scan(message)
+
+    start = time.perf_counter()
+    labels = [scan(message) for message in corpus]
+    return (time.perf_counter() - start) / len(corpus) * 1e6, labels
+
+
+def plot(rows):
+    """Draw per-message latency against intent count as log-scaled ASCII bars"""
+    top = math.log10(max(max(linear, indexed) for _, linear, indexed in rows) + 1)
+    print("\nLatency per message (log scale):")
+    for count, linear, indexed in rows:
+        for label, value in (('linear', linear), ('indexed', indexed)):
+            bar = '#' * max(1, round(math.log10(value + 1) / top * PLOT_WIDTH))
+            print(f"{count:>7,} {label:<8} {bar} {value:,.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent matching latency vs. intent count")
+    parser.add_argument('--messages', type=int, default=2000, help="messages per intent count")
+    parser.add_argument('--counts', type=int, nargs='+', default=INTENT_COUNTS)
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'Intents':>8} {'Linear (us)':>12} {'Indexed (us)':>13}")
+    for count in args.counts:
+        document = build_intents_document(count)
+        table = IntentTable(document['intents'], document['default_responses'], document['bot_name'])
+        corpus = build_corpus(count, args.messages)
+
+        linear_time, linear_labels = time_engine(LinearMatcher(table).scan, corpus)
+        indexed_time, indexed_labels = time_engine(lambda text: table.scan(text)[0], corpus)
+        if linear_labels != indexed_labels:
+            raise SystemExit(f"❌ Engines disagree at {count:,} intents!")
+
+        rows.append((count, linear_time, indexed_time))
+        print(f"{count:>8,} {linear_time:>12,.1f} {indexed_time:>13,.1f}")
+
+    plot(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from datetime import date, datetime
+from itertools import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import portfolio_tracker  # noqa: E402
+from portfolio_accounts import AccountBook  # noqa: E402
+from portfolio_io import import_trades, read_trades, write_history, write_holdings  # noqa: E402
+from portfolio_journal import JOURNAL_NAME, SNAPSHOT_NAME, PortfolioStore, encode_trade, write_snapshot  # noqa: E402
+from portfolio_ledger import BUY, DATE_FORMAT, SELL, TransactionLedger  # noqa: E402
+from portfolio_prices import (PriceStore, annualized_volatility, daily_returns, max_drawdown,  # noqa: E402
+                              rolling_mean, rolling_volatility, write_price_store)
+from portfolio_quotes import RandomWalkFeed  # noqa: E402
+from portfolio_tracker import StockPortfolioTracker  # noqa: E402
+
+
+def build_market(symbols, seed=21):
+    """{symbol: price} for a synthetic market"""
+    rng = random.Random(seed)
+    return {f"SYM{index:05d}": round(rng.uniform(5, 500), 2) for index in range(symbols)}
+
+
+def build_tracker(symbols, held_fraction=0.5, seed=21):
+    """Tracker on a random-walk feed, holding shares in a fraction of the symbols"""
+    rng = random.Random(seed)
+    tracker = StockPortfolioTracker(RandomWalkFeed(build_market(symbols, seed), seed=seed))
+    for symbol in tracker.stock_prices:
+        if rng.random() < held_fraction:
+            tracker.buy(symbol, rng.randint(1, 1000))
+    return tracker
+
+
+def exact_value(tracker):
+    return sum(quantity * tracker.stock_prices[symbol] for symbol, quantity in tracker.portfolio.items())
+
+
+def bench_ticks(symbols, ticks, batch_size):
+    """Apply pre-generated ticks, then run the provider and tracker together through the feed thread"""
+    print(f"{ticks:,} ticks over {symbols:,} symbols, batches of {batch_size:,}")
+    tracker = build_tracker(symbols)
+    batches = [tracker.provider.next_ticks(batch_size) for _ in range(ticks // batch_size)]
+
+    # Resyncing would hide the drift the running total picks up
+    resync_ticks, portfolio_tracker.RESYNC_TICKS = portfolio_tracker.RESYNC_TICKS, ticks + 1
+    start = time.perf_counter()
+    for batch in batches:
+        tracker.apply_ticks(batch)
+    elapsed = time.perf_counter() - start
+    print(f"{'apply_ticks only':<28} {ticks / elapsed:>12,.0f} ticks/s")
+
+    drift = abs(tracker.market_value - exact_value(tracker)) / exact_value(tracker)
+    print(f"{'running value drift':<28} {drift:>12.2e} (relative, no resync)")
+    portfolio_tracker.RESYNC_TICKS = resync_ticks
+
+    # Re-summing every holding per tick, as display_portfolio used to, for comparison
+    sample = batches[0][:200]
+    start = time.perf_counter()
+    for symbol, price in sample:
+        tracker.stock_prices[symbol] = price
+        exact_value(tracker)
+    per_tick = (time.perf_counter() - start) / len(sample)
+    print(f"{'full re-sum per tick':<28} {1 / per_tick:>12,.0f} ticks/s")
+
+    tracker = build_tracker(symbols)
+    feed = tracker.start_feed(ticks_per_second=None)
+    time.sleep(2.0)
+    tracker.stop_feed()
+    print(f"{'feed thread, end to end':<28} {feed.ticks / 2.0:>12,.0f} ticks/s")
+
+
+def bench_trades(symbols, transactions):
+    """Trade throughput, then summary totals from running aggregates against rescanning the history"""
+    print(f"\n{transactions:,} trades over {symbols:,} symbols")
+    rng = random.Random(8)
+    tracker = StockPortfolioTracker(RandomWalkFeed(build_market(symbols)))
+    names = list(tracker.stock_prices)
+
+    start = time.perf_counter()
+    for _ in range(transactions):
+        symbol = rng.choice(names)
+        held = tracker.portfolio.get(symbol, 0)
+        if held and rng.random() < 0.4:
+            tracker.sell(symbol, rng.randint(1, held))
+        else:
+            tracker.buy(symbol, rng.randint(1, 100))
+    elapsed = time.perf_counter() - start
+    print(f"{'buy/sell':<28} {transactions / elapsed:>12,.0f} trades/s")
+
+    start = time.perf_counter()
+    net_invested = tracker.total_invested - tracker.total_sold
+    running = time.perf_counter() - start
+
+    start = time.perf_counter()
+    total_invested, total_sold = tracker.portfolio_history.totals()
+    rescan = time.perf_counter() - start
+    assert abs((total_invested - total_sold) - net_invested) <= 1e-6 * total_invested
+
+    print(f"{'summary, running totals':<28} {running * 1e6:>12.1f} us")
+    print(f"{'summary, ledger scan':<28} {rescan * 1e6:>12.1f} us")
+
+    start = time.perf_counter()
+    tracker.holdings()
+    print(f"{'holdings snapshot':<28} {(time.perf_counter() - start) * 1e6:>12.1f} us "
+          f"({len(tracker.portfolio):,} holdings)")
+
+
+def build_ledger(transactions, symbols, seed=5):
+    """Ledger of random trades, one per second"""
+    rng = random.Random(seed)
+    ledger = TransactionLedger()
+    for index in range(symbols):
+        ledger.symbols.intern(f"SYM{index:05d}")
+    start = 1_700_000_000
+    names = list(ledger.symbols)
+    ledger.extend((start + index, (BUY if rng.random() < 0.6 else SELL) * rng.randint(1, 100),
+                   rng.uniform(5, 500), rng.choice(names)) for index in range(transactions))
+    return ledger
+
+
+def dict_history(ledger, count):
+    """The first count trades as the list of dicts the tracker used to keep"""
+    return [{'date': datetime.fromtimestamp(timestamp).strftime(DATE_FORMAT), 'action': action,
+             'symbol': symbol, 'quantity': quantity, 'price': price, 'total': total}
+            for timestamp, action, symbol, quantity, price, total in ledger.rows(0, count)]
+
+
+def bench_ledger(transactions, symbols, dict_sample=1_000_000):
+    """Memory and scan speed of the columnar ledger against a list of dicts"""
+    print(f"\nLedger with {transactions:,} transactions over {symbols:,} symbols")
+    ledger = build_ledger(transactions, symbols)
+
+    sample = min(dict_sample, transactions)
+    tracemalloc.start()
+    history = dict_history(ledger, sample)
+    dict_bytes = tracemalloc.get_traced_memory()[0] * transactions / sample
+    tracemalloc.stop()
+    print(f"{'list of dicts':<28} {dict_bytes / 1e6:>10,.0f} MB (from {sample:,})")
+    print(f"{'columnar ledger':<28} {ledger.nbytes / 1e6:>10,.0f} MB")
+
+    start = time.perf_counter()
+    sum(t['total'] for t in history if t['action'] == 'BUY')
+    sum(t['total'] for t in history if t['action'] == 'SELL')
+    dict_scan = (time.perf_counter() - start) * transactions / sample
+    del history
+    print(f"{'totals, list of dicts':<28} {dict_scan * 1000:>10,.0f} ms (from {sample:,})")
+
+    for label, query in (
+            ("totals, ledger", lambda: ledger.totals()),
+            ("one symbol's totals", lambda: ledger.symbol_totals('SYM00042')),
+            ("totals over one day", lambda: ledger.totals(*ledger.date_range(1_700_500_000, 1_700_586_400))),
+            ("net shares per symbol", lambda: ledger.net_shares())):
+        start = time.perf_counter()
+        query()
+        print(f"{label:<28} {(time.perf_counter() - start) * 1000:>10,.1f} ms")
+
+
+def write_journal(directory, events, market, snapshot_at, seed=13):
+    """Journal of valid random trades, with a snapshot of the state after the first snapshot_at
+
+    The state is tracked here the way apply_trade() does it, rather than by
+    replaying, so building the snapshot costs no more than writing the journal.
+    """
+    rng = random.Random(seed)
+    names = list(market)
+    portfolio, cost_basis = {}, {}
+    total_invested = total_sold = 0.0
+    start = 1_700_000_000
+    with open(os.path.join(directory, JOURNAL_NAME), 'wb') as journal_file:
+        chunk = []
+        for index in range(events):
+            if index == snapshot_at:
+                journal_file.write(b''.join(chunk))
+                chunk.clear()
+                write_snapshot(os.path.join(directory, SNAPSHOT_NAME), journal_file.tell(), index,
+                               total_invested, total_sold, portfolio, cost_basis, market)
+
+            symbol = rng.choice(names)
+            price = market[symbol]
+            held = portfolio.get(symbol, 0)
+            if held and rng.random() < 0.4:
+                change = -rng.randint(1, held)
+                total_sold -= change * price
+                if held + change:
+                    portfolio[symbol] = held + change
+                    cost_basis[symbol] *= (held + change) / held
+                else:
+                    del portfolio[symbol], cost_basis[symbol]
+            else:
+                change = rng.randint(1, 100)
+                total_invested += change * price
+                portfolio[symbol] = held + change
+                cost_basis[symbol] = cost_basis.get(symbol, 0.0) + change * price
+            chunk.append(encode_trade(start + index, change, price, symbol))
+            if len(chunk) >= 100_000:
+                journal_file.write(b''.join(chunk))
+                chunk.clear()
+        journal_file.write(b''.join(chunk))
+    return portfolio
+
+
+def recover(directory, market):
+    tracker = StockPortfolioTracker(RandomWalkFeed(market))
+    start = time.perf_counter()
+    replayed = tracker.open_store(PortfolioStore(directory, sync_interval=None))
+    elapsed = time.perf_counter() - start
+    tracker.store.close()
+    return tracker, replayed, elapsed
+
+
+def bench_journal(symbols, events, tail, transactions):
+    """Journaled trade throughput, then recovery by snapshot plus tail against a full journal replay"""
+    print(f"\nJournal with {events:,} trades over {symbols:,} symbols, snapshot {tail:,} trades from the end")
+    market = build_market(symbols)
+    with tempfile.TemporaryDirectory() as directory:
+        rng = random.Random(8)
+        tracker = StockPortfolioTracker(RandomWalkFeed(market))
+        tracker.open_store(PortfolioStore(directory))
+        names = list(market)
+        start = time.perf_counter()
+        for _ in range(transactions):
+            symbol = rng.choice(names)
+            held = tracker.portfolio.get(symbol, 0)
+            if held and rng.random() < 0.4:
+                tracker.sell(symbol, rng.randint(1, held))
+            else:
+                tracker.buy(symbol, rng.randint(1, 100))
+        tracker.close_store()
+        elapsed = time.perf_counter() - start
+        print(f"{'buy/sell, journaled':<28} {transactions / elapsed:>12,.0f} trades/s (including snapshots)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        expected = write_journal(directory, events, market, events - tail)
+        size = os.path.getsize(os.path.join(directory, JOURNAL_NAME))
+        print(f"{'write journal':<28} {time.perf_counter() - start:>10,.1f} s ({size / 1e6:,.0f} MB)")
+
+        tracker, replayed, elapsed = recover(directory, market)
+        assert tracker.portfolio == expected and replayed == tail and len(tracker.portfolio_history) == events
+        print(f"{'snapshot + tail':<28} {elapsed * 1000:>10,.1f} ms ({replayed:,} trades replayed, "
+              f"{events - replayed:,} read into the history)")
+
+        os.remove(os.path.join(directory, SNAPSHOT_NAME))
+        del tracker
+        tracker, replayed, elapsed = recover(directory, market)
+        assert tracker.portfolio == expected and replayed == events
+        print(f"{'full replay':<28} {elapsed * 1000:>10,.1f} ms ({events / elapsed:,.0f} trades/s)")
+
+
+def write_trade_file(path, rows, symbols, seed=17):
+    """Broker-style CSV or JSONL of valid trades, one per second"""
+    rng = random.Random(seed)
+    names = [f"SYM{index:05d}" for index in range(symbols)]
+    held = dict.fromkeys(names, 0)
+    jsonl = path.endswith('.jsonl')
+    start = 1_700_000_000
+    with open(path, 'w', newline='') as trade_file:
+        if not jsonl:
+            trade_file.write("date,action,symbol,quantity,price\n")
+        lines = []
+        for index in range(rows):
+            symbol = rng.choice(names)
+            if held[symbol] and rng.random() < 0.4:
+                action, quantity = 'SELL', rng.randint(1, held[symbol])
+                held[symbol] -= quantity
+            else:
+                action, quantity = 'BUY', rng.randint(1, 100)
+                held[symbol] += quantity
+            date = datetime.fromtimestamp(start + index).strftime(DATE_FORMAT)
+            price = round(rng.uniform(5, 500), 2)
+            if jsonl:
+                lines.append(f'{{"date": "{date}", "action": "{action}", "symbol": "{symbol}", '
+                             f'"quantity": {quantity}, "price": {price}}}\n')
+            else:
+                lines.append(f"{date},{action},{symbol},{quantity},{price}\n")
+            if len(lines) >= 100_000:
+                trade_file.write(''.join(lines))
+                lines.clear()
+        trade_file.write(''.join(lines))
+
+
+def bench_io(symbols, rows):
+    """Bulk import from CSV and JSONL, then streaming export of history and holdings"""
+    print(f"\nImport and export of {rows:,} trades over {symbols:,} symbols")
+    market = build_market(symbols)
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ('trades.csv', 'trades.jsonl'):
+            path = os.path.join(directory, name)
+            write_trade_file(path, rows, symbols)
+            tracker = StockPortfolioTracker(RandomWalkFeed(market))
+            start = time.perf_counter()
+            imported, rejected, _ = import_trades(tracker, path)
+            elapsed = time.perf_counter() - start
+            assert imported == rows and not rejected
+            print(f"{'import ' + name:<28} {rows / elapsed:>12,.0f} rows/s")
+
+        # Reading and validating holds one chunk at a time, however big the file
+        tracemalloc.start()
+        for _ in read_trades(path):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{'reader peak memory':<28} {peak / 1e6:>10,.1f} MB")
+
+        for name in ('history.csv', 'history.csv.gz'):
+            path = os.path.join(directory, name)
+            start = time.perf_counter()
+            write_history(tracker, path)
+            elapsed = time.perf_counter() - start
+            print(f"{'export ' + name:<28} {rows / elapsed:>12,.0f} rows/s ({os.path.getsize(path) / 1e6:,.0f} MB)")
+
+        start = time.perf_counter()
+        count = write_holdings(tracker, os.path.join(directory, 'holdings.csv'), os.path.join(directory, 'report.txt'))
+        elapsed = time.perf_counter() - start
+        print(f"{'export holdings + report':<28} {count / elapsed:>12,.0f} rows/s ({count:,} holdings)")
+
+
+def build_book(accounts, symbols, max_positions, seed=29):
+    """Book of accounts holding 1 to max_positions random symbols each, filled row by row"""
+    rng = random.Random(seed)
+    book = AccountBook()
+    for index in range(symbols):
+        book.symbols.intern(f"SYM{index:05d}")
+    symbol_ids = range(symbols)
+    columns, offsets = book.columns, book.offsets
+    for _ in range(accounts):
+        columns.extend(sorted(rng.sample(symbol_ids, rng.randint(1, max_positions))))
+        offsets.append(len(columns))
+    book.quantities = array('q', (rng.randint(1, 1000) for _ in range(len(columns))))
+    return book
+
+
+def bench_accounts(accounts, symbols, max_positions, workers, trades):
+    """Revaluation of a multi-account book, in one process and across a pool, plus trades and compaction"""
+    print(f"\n{accounts:,} accounts over {symbols:,} symbols, 1-{max_positions} positions each")
+    start = time.perf_counter()
+    book = build_book(accounts, symbols, max_positions)
+    print(f"{'build':<28} {time.perf_counter() - start:>10,.1f} s "
+          f"({len(book.columns):,} positions, {book.nbytes / 1e6:,.0f} MB)")
+
+    vector = book.price_vector(build_market(symbols))
+    start = time.perf_counter()
+    values = book.revalue(vector)
+    elapsed = time.perf_counter() - start
+    print(f"{'revalue, one process':<28} {elapsed * 1000:>10,.0f} ms ({accounts / elapsed:,.0f} accounts/s)")
+
+    if workers > 1:
+        start = time.perf_counter()
+        pooled = book.revalue(vector, workers=workers)
+        elapsed = time.perf_counter() - start
+        assert pooled == values
+        print(f"{f'revalue, {workers} workers':<28} {elapsed * 1000:>10,.0f} ms ({accounts / elapsed:,.0f} accounts/s)")
+
+    rng = random.Random(4)
+    names = book.symbols
+    start = time.perf_counter()
+    for _ in range(trades):
+        book.trade(rng.randrange(accounts), rng.choice(names), rng.randint(1, 100))
+    elapsed = time.perf_counter() - start
+    print(f"{'trades':<28} {trades / elapsed:>12,.0f} trades/s ({len(book.pending):,} new positions pending)")
+
+    start = time.perf_counter()
+    book.compact()
+    print(f"{'compact':<28} {(time.perf_counter() - start) * 1000:>10,.0f} ms")
+
+
+def build_price_file(path, symbols, days, seed=31):
+    """Store of random-walk closes over consecutive weekdays from 1985; symbols list at staggered dates"""
+    rng = random.Random(seed)
+    calendar = array('i')
+    day = date(1985, 1, 1).toordinal()
+    while len(calendar) < days:
+        if date.fromordinal(day).weekday() < 5:
+            calendar.append(day)
+        day += 1
+
+    columns = {}
+    for index in range(symbols):
+        first = rng.randrange(days // 4)
+        price = rng.uniform(5, 500)
+        closes = array('d')
+        for step in map(rng.gauss, repeat(0.0005, days - first), repeat(0.02)):
+            price *= 1.0 + step
+            closes.append(price)
+        columns[f"SYM{index:05d}"] = (first, closes)
+    write_price_store(path, calendar, columns)
+
+
+def bench_prices(symbols, years, held):
+    """Historical analytics for a portfolio over a memory-mapped price store"""
+    days = years * 252
+    print(f"\nPrice store of {symbols:,} symbols over {years} years ({days:,} days), {held} holdings")
+    rng = random.Random(6)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'prices.store')
+        start = time.perf_counter()
+        build_price_file(path, symbols, days)
+        print(f"{'build':<28} {time.perf_counter() - start:>10,.1f} s ({os.path.getsize(path) / 1e6:,.0f} MB)")
+
+        start = time.perf_counter()
+        store = PriceStore(path)
+        print(f"{'open':<28} {(time.perf_counter() - start) * 1000:>10,.1f} ms")
+
+        holdings = {symbol: rng.randint(1, 1000) for symbol in rng.sample(sorted(store.columns), held)}
+        results = {}
+        for label, analysis in (
+                ("value series", lambda done: store.value_series(holdings)[1]),
+                ("daily returns", lambda done: daily_returns(done["value series"])),
+                ("volatility", lambda done: annualized_volatility(done["daily returns"])),
+                ("max drawdown", lambda done: max_drawdown(done["value series"])),
+                ("rolling 1y mean return", lambda done: rolling_mean(done["daily returns"], 252)),
+                ("rolling 1y volatility", lambda done: rolling_volatility(done["daily returns"], 252))):
+            start = time.perf_counter()
+            results[label] = analysis(results)
+            print(f"{label:<28} {(time.perf_counter() - start) * 1000:>10,.1f} ms")
+        del results
+
+        # The closes are read through the mapping, so the heap only holds the series
+        tracemalloc.start()
+        values = store.value_series(holdings)[1]
+        rolling_volatility(daily_returns(values), 252)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{'peak Python memory':<28} {peak / 1e6:>10,.1f} MB (over {len(values):,} days)")
+        del values
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio tracker benchmarks")
+    parser.add_argument('--symbols', type=int, default=10_000)
+    parser.add_argument('--ticks', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--transactions', type=int, default=1_000_000)
+    parser.add_argument('--ledger-transactions', type=int, default=10_000_000)
+    parser.add_argument('--journal-events', type=int, default=10_000_000)
+    parser.add_argument('--io-rows', type=int, default=2_000_000)
+    parser.add_argument('--accounts', type=int, default=1_000_000)
+    parser.add_argument('--account-symbols', type=int, default=5000)
+    parser.add_argument('--max-positions', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--price-symbols', type=int, default=1000)
+    parser.add_argument('--years', type=int, default=40)
+    parser.add_argument('--holdings', type=int, default=100)
+    parser.add_argument('--journal-tail', type=int, default=100_000, help="trades after the last snapshot")
+    args = parser.parse_args()
+
+    bench_ticks(args.symbols, args.ticks, args.batch_size)
+    bench_trades(args.symbols, args.transactions)
+    bench_ledger(args.ledger_transactions, args.symbols)
+    bench_journal(args.symbols, args.journal_events, args.journal_tail, args.transactions)
+    bench_io(args.symbols, args.io_rows)
+    bench_accounts(args.accounts, args.account_symbols, args.max_positions, args.workers, args.transactions)
+    bench_prices(args.price_symbols, args.years, args.holdings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_chatbot import SAMPLE_MESSAGES  # noqa: E402
+
+# Goodbye messages would end the session early, so the load mix leaves them out
+LOAD_MESSAGES = [message for message in SAMPLE_MESSAGES
+                 if not any(word in message.lower() for word in ('bye', 'see you'))]
+
+
+async def run_session(open_connection, messages, latencies):
+    """Send messages one at a time on a single session, recording round-trip times"""
+    reader, writer = await open_connection()
+    try:
+        for index in range(messages):
+            line = json.dumps({'message': LOAD_MESSAGES[index % len(LOAD_MESSAGES)]}).encode() + b'\n'
+            start = time.perf_counter()
+            writer.write(line)
+            await writer.drain()
+            reply = await reader.readline()
+            latencies.append(time.perf_counter() - start)
+            if not reply:
+                break
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run_load(args):
+    """Open all sessions concurrently and report latency and throughput"""
+    if args.unix:
+        def open_connection():
+            return asyncio.open_unix_connection(args.unix)
+    else:
+        def open_connection():
+            return asyncio.open_connection(args.host, args.port)
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(open_connection, args.messages, latencies)
+                           for _ in range(args.sessions)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Sessions: {args.sessions:,}  Messages: {len(latencies):,}  Time: {elapsed:.2f}s")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} msg/s")
+    print(f"Latency p50: {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"Latency p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for chatbot_server.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="connect to a Unix socket path instead of TCP")
+    parser.add_argument('--sessions', type=int, default=1000, help="concurrent sessions")
+    parser.add_argument('--messages', type=int, default=100, help="messages per session")
+    args = parser.parse_args()
+
+    asyncio.run(run_load(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot_load import percentile  # noqa: E402
+from hangman_solver import ENGLISH_FREQUENCY  # noqa: E402
+
+
+async def request(reader, writer, obj):
+    """Send one request and return the reply, or None if the server closed the connection"""
+    writer.write(json.dumps(obj).encode() + b'\n')
+    await writer.drain()
+    line = await reader.readline()
+    return json.loads(line) if line else None
+
+
+async def run_player(open_connection, games, latencies):
+    """Play games back to back on one connection, guessing by letter frequency"""
+    reader, writer = await open_connection()
+    finished = 0
+    try:
+        for _ in range(games):
+            view = await request(reader, writer, {'new': True})
+            if view is None or 'error' in view:
+                break
+            game_id = view['game']
+            for letter in ENGLISH_FREQUENCY:
+                start = time.perf_counter()
+                view = await request(reader, writer, {'game': game_id, 'guess': letter})
+                latencies.append(time.perf_counter() - start)
+                if view is None or 'error' in view or view['status'] != 'playing':
+                    break
+            if view is None:
+                break  # the server closed the connection
+            if 'error' not in view:
+                finished += 1
+    finally:
+        writer.close()
+    return finished
+
+
+async def run_load(args):
+    """Run all players concurrently and report games per second and turn latency"""
+    if args.unix:
+        def open_connection():
+            return asyncio.open_unix_connection(args.unix)
+    else:
+        def open_connection():
+            return asyncio.open_connection(args.host, args.port)
+
+    latencies = []
+    start = time.perf_counter()
+    finished = await asyncio.gather(*(run_player(open_connection, args.games, latencies)
+                                      for _ in range(args.players)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Players: {args.players:,}  Games: {sum(finished):,}  Turns: {len(latencies):,}  Time: {elapsed:.2f}s")
+    print(f"Throughput: {sum(finished) / elapsed:,.0f} games/s  {len(latencies) / elapsed:,.0f} turns/s")
+    print(f"Turn latency p50: {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"Turn latency p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for hangman_server.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--unix', help="connect to a Unix socket path instead of TCP")
+    parser.add_argument('--players', type=int, default=1000, help="concurrent connections")
+    parser.add_argument('--games', type=int, default=10, help="games per player")
+    args = parser.parse_args()
+
+    asyncio.run(run_load(args))
+
+
+if __name__ == "__main__":
+    main()
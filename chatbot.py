@@ -1,151 +1,569 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import pickle
+import cProfile
+import pstats
 import random
 import re
+import sys
+import threading
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter
 
+from chatbot_fuzzy import FuzzyIndex
+from chatbot_metrics import ChatMetrics
 
-class BasicChatbot:
-    def __init__(self):
-        """Initialize the chatbot with predefined responses"""
-        self.name = "CodeBot"
-
-        # Define response patterns and their corresponding replies
-        self.responses = {
-            # Greetings
-            'greetings': {
-                'patterns': [r'\b(hello|hi|hey|greetings|good morning|good afternoon|good evening)\b'],
-                'replies': [
-                    f"Hello! I'm {self.name}, your friendly chatbot! 👋",
-                    f"Hi there! Nice to meet you! I'm {self.name}.",
-                    "Hey! How can I help you today?",
-                    "Hello! Welcome! How are you doing?"
-                ]
-            },
-
-            # How are you
-            'how_are_you': {
-                'patterns': [r'\b(how are you|how do you do|how\'s it going|what\'s up)\b'],
-                'replies': [
-                    "I'm doing great, thank you for asking! How about you?",
-                    "I'm fantastic! Thanks for asking. How are you?",
-                    "I'm doing well! Ready to chat with you!",
-                    "All good here! How's your day going?"
-                ]
-            },
-
-            # Name questions
-            'name': {
-                'patterns': [r'\b(what is your name|your name|who are you|what are you called)\b'],
-                'replies': [
-                    f"I'm {self.name}, a simple chatbot created for CodeAlpha internship!",
-                    f"My name is {self.name}! I'm here to chat with you.",
-                    f"I'm {self.name}, your friendly AI assistant!",
-                    f"Call me {self.name}! I'm a basic chatbot."
-                ]
-            },
-
-            # Age questions
-            'age': {
-                'patterns': [r'\b(how old are you|your age|age)\b'],
-                'replies': [
-                    "I'm just a few lines of code old! 😄",
-                    "Age is just a number for bots like me!",
-                    "I was born when my creator wrote my first line of code!",
-                    "I'm timeless in the digital world!"
-                ]
-            },
-
-            # Help
-            'help': {
-                'patterns': [r'\b(help|what can you do|capabilities|commands)\b'],
-                'replies': [
-                    "I can chat with you about basic topics! Try asking me about my name, how I'm doing, or just say hello!",
-                    "I'm a simple chatbot. I can respond to greetings, answer basic questions about myself, and have a friendly conversation!",
-                    "I can help with basic conversation! Ask me how I'm doing, what my name is, or just chat casually!",
-                    "My capabilities include: greeting you, answering basic questions, and being a friendly chat companion!"
-                ]
-            },
-
-            # Goodbye
-            'goodbye': {
-                'patterns': [r'\b(bye|goodbye|see you|farewell|exit|quit|leave)\b'],
-                'replies': [
-                    "Goodbye! It was nice chatting with you! 👋",
-                    "See you later! Have a great day!",
-                    "Farewell! Thanks for the chat!",
-                    "Bye! Come back anytime for a chat!"
-                ]
-            },
-
-            # Thanks
-            'thanks': {
-                'patterns': [r'\b(thank you|thanks|thank|appreciate)\b'],
-                'replies': [
-                    "You're welcome! Happy to help! 😊",
-                    "No problem at all!",
-                    "You're very welcome!",
-                    "Glad I could help! Anytime!"
-                ]
-            },
-
-            # Weather (simple responses)
-            'weather': {
-                'patterns': [r'\b(weather|temperature|hot|cold|sunny|rainy|cloudy)\b'],
-                'replies': [
-                    "I can't check the actual weather, but I hope it's nice where you are!",
-                    "I don't have access to weather data, but I hope you're having good weather!",
-                    "Weather talk! I wish I could check the forecast for you!",
-                    "I'm just a simple bot and can't check weather, but I hope it's pleasant outside!"
-                ]
-            },
-
-            # Programming related
-            'programming': {
-                'patterns': [r'\b(programming|code|coding|python|software|developer)\b'],
-                'replies': [
-                    "Programming is awesome! I was created using Python for a CodeAlpha internship project!",
-                    "I love programming talk! I'm actually a Python program myself!",
-                    "Coding is great! I'm a simple example of what you can build with Python!",
-                    "Programming rocks! I'm proof that even simple code can create something interactive!"
-                ]
+# Word tokens, matching the \b boundaries used by the response patterns
+WORD_PATTERN = re.compile(r'\w+')
+
+# Patterns of the form \b(word|some phrase|...)\b can be served from the keyword index
+KEYWORD_LIST_PATTERN = re.compile(r'\\b\((.*)\)\\b')
+PLAIN_KEYWORD_PATTERN = re.compile(r"\w+(?:[ ']\w+)*")
+
+# Words that end the conversation, checked in the same pass as the categories
+TERMINATE_PATTERN = r'\b(bye|goodbye|exit|quit|leave|end)\b'
+
+# Batch label for messages that fall through to the default responses
+DEFAULT_LABEL = -1
+
+# Messages handed to each worker process in one go
+BATCH_CHUNK_SIZE = 20000
+
+# Classification cache defaults; most traffic is a handful of repeated messages
+DEFAULT_CACHE_SIZE = 4096
+CACHE_POLICIES = ('lru', 'fifo')
+
+# Read and write buffer size for the non-interactive pipeline
+PIPELINE_BUFFER_SIZE = 1024 * 1024
+
+# Rows of the cProfile report printed after --profile
+PROFILE_TOP_FUNCTIONS = 20
+
+# Bot instance and table used inside worker processes, set up once per worker
+_worker_bot = None
+_worker_table = None
+
+# Intent data shipped with the bot, and the version of its on-disk compiled cache
+# (bump the version whenever IntentTable's attributes change)
+DEFAULT_INTENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intents.json')
+INTENT_CACHE_VERSION = b'intent-table-3\n'
+
+# Tables already built in this process, by content hash
+_loaded_tables = {}
+
+
+class ClassificationResult:
+    """Outcome of matching one message: the intent, the terminate flag and their spans"""
+
+    __slots__ = ('cleaned_input', 'category', 'span', 'terminate', 'terminate_span', 'corrected_input')
+
+    def __init__(self, cleaned_input, category, span, terminate, terminate_span, corrected_input=None):
+        self.cleaned_input = cleaned_input
+        self.category = category  # None when a default reply is due
+        self.span = span  # (start, end) of the matched intent, in corrected_input if set
+        self.terminate = terminate
+        self.terminate_span = terminate_span  # always in cleaned_input
+        self.corrected_input = corrected_input  # spelling-corrected text the intent matched, if any
+
+    def __repr__(self):
+        return (f"ClassificationResult(category={self.category!r}, span={self.span}, "
+                f"terminate={self.terminate}, terminate_span={self.terminate_span}, "
+                f"corrected_input={self.corrected_input!r})")
+
+
+class IntentTable:
+    """Intents in priority order with their replies and the keyword index built over them
+
+    A table is never modified after it is built. Hot reloads build a new table and
+    swap it in whole, so a message that is being answered keeps a consistent view.
+    """
+
+    def __init__(self, intents, default_responses, bot_name):
+        self.bot_name = bot_name
+        self.content_hash = None
+
+        # Fill the bot name into the replies once, instead of on every instance
+        self.responses = {}
+        for intent in intents:
+            self.responses[intent['name']] = {
+                'patterns': list(intent['patterns']),
+                'replies': [reply.replace('{name}', bot_name) for reply in intent['replies']]
             }
+        self.default_responses = [reply.replace('{name}', bot_name) for reply in default_responses]
+
+        self._build_index()
+
+    @classmethod
+    def from_json(cls, data):
+        """Build a table from the contents of an intents JSON file"""
+        document = json.loads(data)
+        return cls(document['intents'], document['default_responses'], document.get('bot_name', 'CodeBot'))
+
+    def _build_index(self):
+        """Build a keyword index over all patterns, keeping file order as priority"""
+        self.categories = list(self.responses)
+        self._keyword_priority = {}  # single word -> best category priority
+        self._phrase_index = {}  # rarest word of a phrase -> priorities to verify
+        self._verify_sources = []  # combined category regex source for each priority
+        self._verify_patterns = []  # compiled category regexes; lazily again after unpickling
+        self._always_verify = []  # priorities whose patterns are not plain word lists
+        phrases = []  # (priority, words) for every multi-word keyword
+        vocabulary = set()  # every word of every keyword, for spelling correction
+
+        for priority, category in enumerate(self.categories):
+            patterns = self.responses[category]['patterns']
+            self._verify_sources.append('|'.join(f'(?:{pattern})' for pattern in patterns))
+            # Compiled now so a bad pattern fails the load, not a later classify
+            self._verify_patterns.append(re.compile(self._verify_sources[-1]))
+
+            for pattern in patterns:
+                keywords = self._extract_keywords(pattern)
+                if keywords is None:
+                    self._always_verify.append(priority)
+                    continue
+
+                for keyword in keywords:
+                    words = WORD_PATTERN.findall(keyword)
+                    vocabulary.update(words)
+                    if keyword == words[0]:
+                        self._keyword_priority.setdefault(keyword, priority)
+                    else:
+                        phrases.append((priority, words))
+
+        # Every word of a phrase shows up as a token of any message it matches, so a
+        # phrase can be filed under any of its words. The rarest one keeps the candidate
+        # lists short even when thousands of phrases start with "what" or "how".
+        word_counts = Counter(word for _, words in phrases for word in set(words))
+        for priority, words in phrases:
+            key = min(words, key=word_counts.__getitem__)
+            self._phrase_index.setdefault(key, set()).add(priority)
+
+        # Frozen key sets let each message intersect its few words against the index;
+        # a dict keys view would copy every keyword into a new set on each "&"
+        self._keywords = frozenset(self._keyword_priority)
+        self._phrase_words = frozenset(self._phrase_index)
+
+        self.vocabulary = frozenset(vocabulary)
+        self._fuzzy_index = None  # built on first use by fuzzy_index()
+
+        # The goodbye check rides on the same word set instead of its own scan
+        self.terminate_pattern = re.compile(TERMINATE_PATTERN)
+        self._terminate_words = frozenset(self._extract_keywords(TERMINATE_PATTERN))
+
+    def __getstate__(self):
+        """Pickle without compiled regexes; they were checked when the table was built and are
+        recompiled lazily after loading"""
+        state = self.__dict__.copy()
+        state['_verify_patterns'] = [None] * len(self.categories)
+        return state
+
+    @staticmethod
+    def _extract_keywords(pattern):
+        """Return the literal alternatives of a \\b(a|b c)\\b pattern, or None for anything else"""
+        match = KEYWORD_LIST_PATTERN.fullmatch(pattern)
+        if not match:
+            return None
+
+        keywords = match.group(1).replace("\\'", "'").split('|')
+        if not all(PLAIN_KEYWORD_PATTERN.fullmatch(keyword) for keyword in keywords):
+            return None
+        return keywords
+
+    def fuzzy_index(self):
+        """Spelling-correction index over the keyword vocabulary, built on first use"""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex(self.vocabulary)
+        return self._fuzzy_index
+
+    def verify_pattern(self, priority):
+        """Return the compiled regex for one category, compiling it on first use"""
+        pattern = self._verify_patterns[priority]
+        if pattern is None:
+            pattern = self._verify_patterns[priority] = re.compile(self._verify_sources[priority])
+        return pattern
+
+    def scan(self, cleaned_input):
+        """Single matching pass, returning (category index or DEFAULT_LABEL, terminate, regex match or None)"""
+        # One tokenizing pass, then set lookups against the keyword index
+        words = set(WORD_PATTERN.findall(cleaned_input))
+        hits = words & self._keywords
+        best = min([self._keyword_priority[word] for word in hits]) if hits else len(self.categories)
+        terminate = not self._terminate_words.isdisjoint(words)
+
+        # Phrases and free-form patterns are confirmed with their regex only when
+        # they could still beat the best single-word hit
+        candidates = set(self._always_verify)
+        for word in words & self._phrase_words:
+            candidates.update(self._phrase_index[word])
+
+        match = None
+        for priority in sorted(candidates):
+            if priority >= best:
+                break
+            match = self.verify_pattern(priority).search(cleaned_input)
+            if match:
+                best = priority
+                break
+
+        if best == len(self.categories):
+            return DEFAULT_LABEL, terminate, None
+        return best, terminate, match
+
+
+def load_intent_table(path=DEFAULT_INTENTS_PATH):
+    """Load an intents file, reusing tables already built in this process or cached on disk"""
+    with open(path, 'rb') as intents_file:
+        data = intents_file.read()
+    content_hash = hashlib.sha256(INTENT_CACHE_VERSION + data).hexdigest()
+
+    table = _loaded_tables.get(content_hash)
+    if table is not None:
+        return table
+
+    # The built table is pickled next to the source file, keyed by its content hash
+    directory, filename = os.path.split(os.path.abspath(path))
+    cache_path = os.path.join(directory, '__pycache__', f"{os.path.splitext(filename)[0]}.{content_hash[:16]}.pickle")
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            table = pickle.load(cache_file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        table = IntentTable.from_json(data)
+        table.content_hash = content_hash
+        _write_table_cache(table, cache_path)
+
+    _loaded_tables[content_hash] = table
+    return table
+
+
+def _write_table_cache(table, cache_path):
+    """Write a table cache atomically; a read-only directory just means no cache"""
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, 'wb') as cache_file:
+            pickle.dump(table, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+
+class IntentWatcher(threading.Thread):
+    def __init__(self, chatbot, interval=1.0):
+        """Poll a chatbot's intents file and swap in a new table when it changes"""
+        super().__init__(daemon=True)
+        self.chatbot = chatbot
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._last_stat = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.chatbot.intents_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            current = self._stat()
+            if current is None or current == self._last_stat:
+                continue
+            self._last_stat = current
+
+            try:
+                table = load_intent_table(self.chatbot.intents_path)
+            except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+                # Keep serving the old table until the file is valid again
+                print(f"❌ Could not reload intents: {e}", file=sys.stderr)
+                continue
+
+            # A single attribute assignment, so readers see either the old or the new table
+            previous, self.chatbot.table = self.chatbot.table, table
+            if previous is not table:
+                # Bots still holding the old table keep it; this process just stops caching it
+                _loaded_tables.pop(previous.content_hash, None)
+
+    def stop(self):
+        self._stopped.set()
+
+
+class ClassificationCache:
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, policy='lru'):
+        """Bounded map from cleaned input to ClassificationResult, with hit/miss counters
+
+        'lru' evicts the entry used least recently; 'fifo' evicts the oldest entry
+        and skips the reordering on every hit.
+        """
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy {policy!r}, expected one of {CACHE_POLICIES}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.table = None  # the IntentTable the cached results belong to
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def get(self, cleaned_input, table):
+        """Return the cached result for this table, or None"""
+        if table is not self.table:
+            # Results from a table that has been reloaded are no longer valid
+            self._entries.clear()
+            self.table = table
+
+        result = self._entries.get(cleaned_input)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.policy == 'lru':
+            self._entries.move_to_end(cleaned_input)
+        return result
+
+    def put(self, cleaned_input, result):
+        self._entries[cleaned_input] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """Counters for sizing the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'policy': self.policy,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
         }
 
-        # Default responses for unmatched input
-        self.default_responses = [
-            "I'm not sure I understand. Could you rephrase that?",
-            "That's interesting! Tell me more.",
-            "I'm still learning. Can you ask me something else?",
-            "Hmm, I don't quite get that. Try asking me how I'm doing or what my name is!",
-            "I'm a simple bot, so I might not understand everything. What else would you like to chat about?",
-            "Could you try asking me something different? I'm better with basic conversation!",
-            "That's beyond my simple capabilities! Try greeting me or asking about my name!"
-        ]
+
+class BasicChatbot:
+    def __init__(self, intents_path=DEFAULT_INTENTS_PATH, cache_size=DEFAULT_CACHE_SIZE,
+                 cache_policy='lru', seed=None, fuzzy=False):
+        """Initialize the chatbot with the intents loaded from a data file
+
+        Pass a seed to draw replies from a private RNG, for reproducible conversations;
+        cache_size=0 turns the classification cache off, and fuzzy=True lets misspelled
+        keywords ("helo", "thnks") match when nothing matches exactly.
+        """
+        # Instances loading the same file share one table
+        self.intents_path = intents_path
+        self.table = load_intent_table(intents_path)
+        self.name = self.table.bot_name
+
+        # Repeated messages skip matching; replies still vary through the RNG
+        self.cache = ClassificationCache(cache_size, cache_policy) if cache_size else None
+        self.rng = random.Random(seed) if seed is not None else None
+
+        self.fuzzy = fuzzy
+
+        # Instrumentation is off unless enable_metrics() is called
+        self.metrics = None
+
+    def __getstate__(self):
+        """Worker processes only need the table, not this process's cache or metrics"""
+        state = self.__dict__.copy()
+        state['cache'] = None
+        state['metrics'] = None
+        return state
+
+    @property
+    def responses(self):
+        return self.table.responses
+
+    @property
+    def default_responses(self):
+        return self.table.default_responses
+
+    @property
+    def categories(self):
+        return self.table.categories
+
+    def watch_intents(self, interval=1.0):
+        """Start reloading the intents file in the background whenever it changes"""
+        watcher = IntentWatcher(self, interval)
+        watcher.start()
+        return watcher
 
     def clean_input(self, user_input):
         """Clean and normalize user input"""
         return user_input.lower().strip()
 
-    def find_response(self, user_input):
-        """Find appropriate response based on user input"""
+    def enable_metrics(self):
+        """Start recording ChatMetrics for classify and reply_for, and return them"""
+        if self.metrics is None:
+            self.metrics = ChatMetrics()
+        return self.metrics
+
+    def classify(self, user_input):
+        """Match a message once and return its ClassificationResult"""
+        # With metrics off, the only extra cost is this attribute check
+        metrics = self.metrics
+        if metrics is None:
+            return self._classify_cleaned(self.clean_input(user_input))
+
+        start = perf_counter()
         cleaned_input = self.clean_input(user_input)
+        cleaned = perf_counter()
+        result = self._classify_cleaned(cleaned_input)
+        metrics.latency['clean'].observe(cleaned - start)
+        metrics.record_match(result.category, perf_counter() - cleaned)
+        return result
+
+    def _classify_cleaned(self, cleaned_input):
+        """Classify an already cleaned message, going through the cache when enabled"""
+        table = self.table
+        cache = self.cache
+        if cache is not None:
+            result = cache.get(cleaned_input, table)
+            if result is not None:
+                return result
+
+        priority, terminate, match, corrected_input = self._scan(cleaned_input, table)
+        matched_input = corrected_input or cleaned_input
+
+        category = span = terminate_span = None
+        if priority != DEFAULT_LABEL:
+            category = table.categories[priority]
+            # Single-word hits were found by set lookup, so locate them with the category regex
+            if match is None:
+                match = table.verify_pattern(priority).search(matched_input)
+            span = match.span()
+        if terminate:
+            terminate_span = table.terminate_pattern.search(cleaned_input).span()
+
+        result = ClassificationResult(cleaned_input, category, span, terminate, terminate_span, corrected_input)
+        if cache is not None:
+            cache.put(cleaned_input, result)
+        return result
+
+    def _scan(self, cleaned_input, table):
+        """table.scan() with the fuzzy fallback: (priority, terminate, match, corrected input or None)
+
+        Shared by single and batch classification so both give the same label.
+        """
+        priority, terminate, match = table.scan(cleaned_input)
+
+        # Typo-tolerant tier: only messages that would get a default reply pay for it.
+        # The goodbye flag stays exact, so a typo never ends the conversation.
+        if priority == DEFAULT_LABEL and self.fuzzy:
+            corrected_input = table.fuzzy_index().correct(cleaned_input)
+            if corrected_input is not None:
+                corrected_priority, _, corrected_match = table.scan(corrected_input)
+                if corrected_priority != DEFAULT_LABEL:
+                    return corrected_priority, terminate, corrected_match, corrected_input
+        return priority, terminate, match, None
+
+    def match_category(self, cleaned_input):
+        """Return the highest-priority category matching the cleaned input, or None"""
+        table = self.table
+        priority = table.scan(cleaned_input)[0]
+        if priority == DEFAULT_LABEL:
+            return None
+        return table.categories[priority]
 
-        # Check each category of responses
-        for category, data in self.responses.items():
-            for pattern in data['patterns']:
-                if re.search(pattern, cleaned_input):
-                    return random.choice(data['replies'])
+    def find_response(self, user_input):
+        """Find appropriate response based on user input"""
+        return self.reply_for(self.classify(user_input).category)
+
+    def reply_for(self, category, rng=None):
+        """Pick a random reply for a category, or a default reply for None"""
+        metrics = self.metrics
+        if metrics is None:
+            return self._pick_reply(category, rng)
+
+        start = perf_counter()
+        reply = self._pick_reply(category, rng)
+        metrics.latency['select'].observe(perf_counter() - start)
+        return reply
+
+    def _pick_reply(self, category, rng):
+        table = self.table
+        choice = (rng or self.rng or random).choice
+        # A category dropped by a reload in the meantime also gets a default reply
+        data = table.responses.get(category)
+        if data is not None:
+            return choice(data['replies'])
 
         # Return default response if no pattern matches
-        return random.choice(self.default_responses)
+        return choice(table.default_responses)
+
+    def classify_batch(self, messages, workers=None, chunk_size=BATCH_CHUNK_SIZE, table=None):
+        """Classify many messages, returning an array of category indices (DEFAULT_LABEL if unmatched)"""
+        labels = array('i')
+        chunks = _iter_chunks(messages, chunk_size)
+        for _, chunk_labels, _ in self.iter_classified_chunks(chunks, workers, table):
+            labels.extend(chunk_labels)
+        return labels
+
+    def respond_batch(self, messages, rng=None, workers=None, chunk_size=BATCH_CHUNK_SIZE):
+        """Classify many messages and pick a reply for each, returning (labels, replies)
+
+        Replies are drawn in message order from rng (the bot's own RNG, or the random
+        module, by default), so the output matches calling find_response on each
+        message with the same seed.
+        """
+        # Labels and replies must come from the same table, even if a reload lands mid-batch
+        table = self.table
+        labels = self.classify_batch(messages, workers, chunk_size, table)
+        return labels, self.pick_replies(labels, rng, table)
+
+    def pick_replies(self, labels, rng=None, table=None):
+        """Pick one reply per category label, in order"""
+        table = table or self.table
+        choice = (rng or self.rng or random).choice
+        # Index DEFAULT_LABEL (-1) lands on the default responses at the end
+        reply_table = [table.responses[category]['replies'] for category in table.categories]
+        reply_table.append(table.default_responses)
+        return [choice(reply_table[label]) for label in labels]
+
+    def _classify_chunk(self, chunk, table):
+        """Classify one chunk of raw messages into label and terminate-flag arrays"""
+        labels = array('i')
+        terminate = bytearray()
+        scan = table.scan
+        for cleaned in map(self.clean_input, chunk):
+            label, flag, _ = scan(cleaned)
+            if label == DEFAULT_LABEL and self.fuzzy:
+                label = self._scan(cleaned, table)[0]
+            labels.append(label)
+            terminate.append(flag)
+        return labels, terminate
+
+    def iter_classified_chunks(self, chunks, workers=None, table=None):
+        """Yield (chunk, labels, terminate flags) in input order, optionally using a process pool"""
+        table = table or self.table
+        if not workers or workers <= 1:
+            for chunk in chunks:
+                yield (chunk,) + self._classify_chunk(chunk, table)
+            return
+
+        # Keep a bounded window of chunks in flight so huge inputs stay in constant memory
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self, table)) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(_classify_in_worker, chunk)))
+                if len(pending) >= workers * 2:
+                    chunk, future = pending.popleft()
+                    yield (chunk,) + future.result()
+            while pending:
+                chunk, future = pending.popleft()
+                yield (chunk,) + future.result()
 
     def is_goodbye(self, user_input):
         """Check if user wants to end conversation"""
-        goodbye_patterns = [r'\b(bye|goodbye|exit|quit|leave|end)\b']
-        cleaned_input = self.clean_input(user_input)
-
-        for pattern in goodbye_patterns:
-            if re.search(pattern, cleaned_input):
-                return True
-        return False
+        return self.table.scan(self.clean_input(user_input))[1]
 
     def chat(self):
         """Main chat loop"""
@@ -166,15 +584,14 @@ class BasicChatbot:
                 print(f"{self.name}: Please say something! I'm here to chat!")
                 continue
 
-            if self.is_goodbye(user_input):
-                response = self.find_response(user_input)
-                print(f"\n{self.name}: {response}")
-                break
-
-            # Generate and display response
-            response = self.find_response(user_input)
+            # Generate and display response, then stop if the user said goodbye
+            result = self.classify(user_input)
+            response = self.reply_for(result.category)
             print(f"\n{self.name}: {response}")
 
+            if result.terminate:
+                break
+
     def demo_conversation(self):
         """Run a demo conversation to show capabilities"""
         print("\n🎯 DEMO MODE - Sample Conversation:")
@@ -193,15 +610,105 @@ class BasicChatbot:
 
         for user_msg in demo_inputs:
             print(f"You: {user_msg}")
-            response = self.find_response(user_msg)
+            response = self.reply_for(self.classify(user_msg).category)
             print(f"{self.name}: {response}")
             print()
 
 
-def main():
-    """Main function to run the chatbot"""
+def _iter_chunks(iterable, size):
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker(bot, table):
+    """Store the bot and its table once per worker process"""
+    global _worker_bot, _worker_table
+    _worker_bot = bot
+    _worker_table = table
+
+
+def _classify_in_worker(chunk):
+    """Classify a chunk inside a worker process"""
+    return _worker_bot._classify_chunk(chunk, _worker_table)
+
+
+def iter_messages(stream):
+    """Yield non-empty messages from a text stream, one per line"""
+    for line in stream:
+        message = line.rstrip('\r\n')
+        if message.strip():
+            yield message
+
+
+def iter_pipeline_records(chatbot, messages, workers=None, chunk_size=BATCH_CHUNK_SIZE):
+    """Yield lists of (message, category, reply, goodbye) records, one list per chunk"""
+    for chunk, labels, terminate in chatbot.iter_classified_chunks(_iter_chunks(messages, chunk_size), workers):
+        replies = chatbot.pick_replies(labels)
+        yield [
+            (message, chatbot.categories[label] if label != DEFAULT_LABEL else None, reply, bool(flag))
+            for message, label, reply, flag in zip(chunk, labels, replies, terminate)
+        ]
+
+
+def run_pipeline(input_path='-', output_format='jsonl', workers=None, output=None):
+    """Stream messages from a file (or stdin for '-') through the bot to stdout as JSONL or CSV"""
     chatbot = BasicChatbot()
 
+    # Large buffers on both ends; each chunk of results goes out in a single write
+    if input_path == '-':
+        source = open(sys.stdin.fileno(), encoding='utf-8', buffering=PIPELINE_BUFFER_SIZE, closefd=False)
+    else:
+        source = open(input_path, encoding='utf-8', buffering=PIPELINE_BUFFER_SIZE)
+    if output is None:
+        output = open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='',
+                      buffering=PIPELINE_BUFFER_SIZE, closefd=False)
+
+    with source, output:
+        if output_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(['message', 'category', 'reply', 'goodbye'])
+
+        for records in iter_pipeline_records(chatbot, iter_messages(source), workers):
+            if output_format == 'csv':
+                writer.writerows(records)
+                output.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+            else:
+                output.write(''.join([
+                    json.dumps({'message': message, 'category': category, 'reply': reply, 'goodbye': goodbye}) + '\n'
+                    for message, category, reply, goodbye in records
+                ]))
+
+
+def replay_messages(chatbot, messages):
+    """Answer messages one at a time, as chat() would, without printing"""
+    for message in messages:
+        chatbot.reply_for(chatbot.classify(message).category)
+
+
+def run_profile(chatbot, replay_path=None, stats_path='chatbot.prof'):
+    """Run the demo, or replay a file of messages, under cProfile and dump the stats"""
+    profiler = cProfile.Profile()
+    if replay_path:
+        with open(replay_path, encoding='utf-8', buffering=PIPELINE_BUFFER_SIZE) as replay_file:
+            profiler.runcall(replay_messages, chatbot, iter_messages(replay_file))
+    else:
+        profiler.runcall(chatbot.demo_conversation)
+
+    profiler.dump_stats(stats_path)
+    print(f"\n📊 Profile saved to {stats_path}; top functions by cumulative time:")
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+
+
+def run_interactive(chatbot):
+    """Menu for chatting or watching the demo"""
     print("Choose an option:")
     print("1. Start chatting")
     print("2. See demo conversation")
@@ -220,5 +727,38 @@ def main():
     print("\nThanks for using the chatbot! 🤖✨")
 
 
+def main():
+    """Main function to run the chatbot"""
+    parser = argparse.ArgumentParser(description="Chat with CodeBot or run it over a log of messages")
+    parser.add_argument('--pipeline', nargs='?', const='-', metavar='FILE',
+                        help="answer every line of FILE (or stdin) non-interactively")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl', help="pipeline output format")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for the pipeline")
+    parser.add_argument('--profile', nargs='?', const='', metavar='REPLAY_FILE',
+                        help="profile the demo conversation, or a replay of REPLAY_FILE, with cProfile")
+    parser.add_argument('--profile-output', default='chatbot.prof', help="where to dump the cProfile stats")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="record metrics and write them to FILE on exit (.json, else Prometheus text)")
+    args = parser.parse_args()
+
+    if args.pipeline:
+        run_pipeline(args.pipeline, args.format, args.workers)
+        return
+
+    chatbot = BasicChatbot()
+    if args.metrics:
+        chatbot.enable_metrics()
+
+    try:
+        if args.profile is not None:
+            run_profile(chatbot, args.profile, args.profile_output)
+        else:
+            run_interactive(chatbot)
+    finally:
+        if args.metrics:
+            chatbot.metrics.write(args.metrics)
+            print(f"📈 Metrics written to {args.metrics}")
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
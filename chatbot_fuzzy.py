@@ -0,0 +1,126 @@
+import re
+from itertools import combinations
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Words shorter than this are never corrected; too many real words are one edit apart at
+# this length ("bold" and "cold", "node" and "code")
+MIN_FUZZY_LENGTH = 5
+
+# Words this long or longer may be two edits away; shorter ones only one
+TWO_EDIT_LENGTH = 7
+
+# Words whose correction is remembered before the memo starts over
+MAX_REMEMBERED_CORRECTIONS = 65536
+
+# Endings that make another form of the same word ("leaves", "coded"), not a typo
+INFLECTIONS = ('s', 'es', 'd', 'ed', 'r', 'er', 'ing', 'y', 'ly')
+
+
+def allowed_distance(word):
+    """Edits tolerated for a word of this length"""
+    if len(word) < MIN_FUZZY_LENGTH:
+        return 0
+    return 2 if len(word) >= TWO_EDIT_LENGTH else 1
+
+
+def is_inflection(word, other):
+    """Whether one word is the other plus an inflectional ending"""
+    shorter, longer = sorted((word, other), key=len)
+    return longer.startswith(shorter) and longer[len(shorter):] in INFLECTIONS
+
+
+def deletes(word, distance):
+    """Every string made by deleting up to distance characters from word"""
+    variants = {word}
+    for count in range(1, distance + 1):
+        for positions in combinations(range(len(word)), count):
+            variants.add(''.join(char for index, char in enumerate(word) if index not in positions))
+    return variants
+
+
+def edit_distance(first, second, limit):
+    """Optimal string alignment distance (adjacent swaps count as one edit), or limit + 1"""
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+
+    previous_row = None
+    row = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        before_previous, previous_row = previous_row, row
+        row = [i] + [0] * len(second)
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if (i > 1 and j > 1 and first[i - 1] == second[j - 2]
+                    and first[i - 2] == second[j - 1]):
+                row[j] = min(row[j], before_previous[j - 2] + 1)
+    return min(row[-1], limit + 1)
+
+
+class FuzzyIndex:
+    def __init__(self, vocabulary):
+        """Symmetric-deletion dictionary over the words used by the intent patterns
+
+        Each vocabulary word is stored under all of its deletes, so a typo is looked
+        up by generating its own (few) deletes rather than comparing it against
+        every word in the vocabulary.
+        """
+        self.vocabulary = frozenset(vocabulary)
+        self._corrections = {}  # word -> correction (or None) already worked out
+        self._deletes = {}
+        for word in self.vocabulary:
+            for variant in deletes(word, allowed_distance(word)):
+                self._deletes.setdefault(variant, set()).add(word)
+
+    def correct_word(self, word):
+        """The one closest vocabulary word within the allowed distance, or None
+
+        A word with two equally close candidates, or that is another form of its
+        candidate, is left alone: correcting it would more likely turn a real word
+        into a keyword than fix a typo.
+        """
+        try:
+            return self._corrections[word]
+        except KeyError:
+            pass
+
+        if len(self._corrections) >= MAX_REMEMBERED_CORRECTIONS:
+            self._corrections.clear()
+        corrected = self._corrections[word] = self._lookup(word)
+        return corrected
+
+    def _lookup(self, word):
+        limit = allowed_distance(word)
+        if not limit or word in self.vocabulary:
+            return None
+
+        best_distance, best = limit + 1, set()
+        for variant in deletes(word, limit):
+            for candidate in self._deletes.get(variant, ()):
+                distance = edit_distance(word, candidate, min(limit, allowed_distance(candidate)))
+                if distance > limit or distance > allowed_distance(candidate) or distance > best_distance:
+                    continue
+                if distance < best_distance:
+                    best_distance, best = distance, set()
+                best.add(candidate)
+        if len(best) != 1:
+            return None
+        candidate = best.pop()
+        return None if is_inflection(word, candidate) else candidate
+
+    def correct(self, cleaned_input):
+        """Rewrite misspelled words of the cleaned input, or return None if nothing changed"""
+        changed = False
+
+        def replace(match):
+            nonlocal changed
+            corrected = self.correct_word(match.group())
+            if corrected is None:
+                return match.group()
+            changed = True
+            return corrected
+
+        # Only the words are rewritten, so apostrophes and spacing still line up with phrases
+        corrected_input = WORD_PATTERN.sub(replace, cleaned_input)
+        return corrected_input if changed else None
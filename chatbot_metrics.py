@@ -0,0 +1,119 @@
+import json
+import os
+from bisect import bisect_left
+from collections import Counter
+
+# Upper bounds of the latency histogram buckets, in seconds (the last bucket is +Inf)
+LATENCY_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005,
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01
+)
+
+# Stages of answering a message that get their own histogram
+STAGES = ('clean', 'match', 'select')
+
+
+def _escape_label(value):
+    """Escape a Prometheus label value"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, cumulative like a Prometheus histogram"""
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, observations at or below it) pairs, ending with +Inf"""
+        running = 0
+        pairs = []
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+
+class ChatMetrics:
+    def __init__(self):
+        """Per-intent match counts, default-fallback rate and per-stage latency"""
+        self.messages = 0
+        self.defaults = 0
+        self.intent_matches = Counter()
+        self.latency = {stage: LatencyHistogram() for stage in STAGES}
+
+    def record_match(self, category, seconds):
+        self.messages += 1
+        if category is None:
+            self.defaults += 1
+        else:
+            self.intent_matches[category] += 1
+        self.latency['match'].observe(seconds)
+
+    def default_rate(self):
+        return self.defaults / self.messages if self.messages else 0.0
+
+    def to_dict(self):
+        """Snapshot of every metric as plain JSON-friendly data"""
+        return {
+            'messages': self.messages,
+            'default_fallbacks': self.defaults,
+            'default_rate': self.default_rate(),
+            'intent_matches': dict(self.intent_matches.most_common()),
+            'latency_seconds': {
+                stage: {
+                    'count': histogram.count,
+                    'sum': histogram.total,
+                    'buckets': {('+Inf' if bound == float('inf') else repr(bound)): count
+                                for bound, count in histogram.cumulative()}
+                }
+                for stage, histogram in self.latency.items()
+            }
+        }
+
+    def to_prometheus(self):
+        """Snapshot in the Prometheus text exposition format"""
+        lines = [
+            "# HELP chatbot_messages_total Messages classified.",
+            "# TYPE chatbot_messages_total counter",
+            f"chatbot_messages_total {self.messages}",
+            "# HELP chatbot_default_fallbacks_total Messages answered with a default reply.",
+            "# TYPE chatbot_default_fallbacks_total counter",
+            f"chatbot_default_fallbacks_total {self.defaults}",
+            "# HELP chatbot_intent_matches_total Messages matched per intent.",
+            "# TYPE chatbot_intent_matches_total counter",
+        ]
+        for intent, count in sorted(self.intent_matches.items()):
+            lines.append(f'chatbot_intent_matches_total{{intent="{_escape_label(intent)}"}} {count}')
+
+        lines.append("# HELP chatbot_stage_latency_seconds Time spent per stage of answering a message.")
+        lines.append("# TYPE chatbot_stage_latency_seconds histogram")
+        for stage, histogram in self.latency.items():
+            for bound, count in histogram.cumulative():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'chatbot_stage_latency_seconds_bucket{{stage="{stage}",le="{le}"}} {count}')
+            lines.append(f'chatbot_stage_latency_seconds_sum{{stage="{stage}"}} {histogram.total}')
+            lines.append(f'chatbot_stage_latency_seconds_count{{stage="{stage}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write a snapshot to disk: JSON for *.json paths, Prometheus text otherwise"""
+        if path.endswith('.json'):
+            content = json.dumps(self.to_dict(), indent=2) + '\n'
+        else:
+            content = self.to_prometheus()
+
+        # Write then rename, so a scraper never reads a half-written file
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as metrics_file:
+            metrics_file.write(content)
+        os.replace(temp_path, path)
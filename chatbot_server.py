@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+import json_lines
+from chatbot import CACHE_POLICIES, DEFAULT_CACHE_SIZE, DEFAULT_INTENTS_PATH, BasicChatbot
+
+# Longest message line accepted from a client, in bytes; room for a long pasted message
+MAX_LINE_BYTES = 64 * 1024
+
+# Seconds a session may stay silent before it is closed
+DEFAULT_IDLE_TIMEOUT = 300
+
+# Sessions served at once; extra connections are turned away
+DEFAULT_MAX_SESSIONS = 10000
+
+
+class ChatSession:
+    """Per-connection state; everything else is shared through the server's bot"""
+
+    __slots__ = ('session_id', 'messages', 'started', 'rng')
+
+    def __init__(self, session_id, rng=None):
+        self.session_id = session_id
+        self.messages = 0
+        self.started = time.monotonic()
+        self.rng = rng  # seeded per session for reproducible tests, else shared randomness
+
+
+class ChatServer:
+    def __init__(self, bot=None, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_sessions=DEFAULT_MAX_SESSIONS, seed=None):
+        """Serve many chat sessions from one bot and its compiled response table"""
+        self.bot = bot or BasicChatbot()
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.seed = seed
+        self.sessions = {}
+        self._session_ids = itertools.count(1)
+
+    def handle_message(self, session, payload):
+        """Build the reply object for one decoded request line"""
+        message = payload.get('message') if isinstance(payload, dict) else None
+        if not isinstance(message, str) or not message.strip():
+            return {'error': "Expected a JSON object with a non-empty 'message'"}, False
+
+        session.messages += 1
+        result = self.bot.classify(message)
+        return {
+            'session': session.session_id,
+            'category': result.category,
+            'reply': self.bot.reply_for(result.category, session.rng),
+            'goodbye': result.terminate
+        }, result.terminate
+
+    async def handle_connection(self, reader, writer):
+        """Serve one client until it says goodbye, goes idle, or disconnects"""
+        if len(self.sessions) >= self.max_sessions:
+            await json_lines.send(writer, {'error': "Server is full, try again later"})
+            writer.close()
+            return
+
+        session_id = next(self._session_ids)
+        rng = random.Random(f"{self.seed}:{session_id}") if self.seed is not None else None
+        session = ChatSession(session_id, rng)
+        self.sessions[session.session_id] = session
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    await json_lines.send(writer, {'error': "Session closed after being idle"})
+                    break
+                except (ValueError, asyncio.LimitOverrunError):
+                    await json_lines.send(writer, {'error': "Message too long"})
+                    break
+
+                if not line:
+                    break
+
+                try:
+                    payload = json.loads(line)
+                except ValueError:
+                    response, done = {'error': "Invalid JSON"}, False
+                else:
+                    response, done = self.handle_message(session, payload)
+
+                # drain() waits while the client is slow to read, so replies never pile up
+                await json_lines.send(writer, response)
+                if done:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            del self.sessions[session.session_id]
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        """Listen on a local TCP port or Unix socket until cancelled"""
+        server, address = await json_lines.start_server(self.handle_connection, host, port, unix_path, MAX_LINE_BYTES)
+        print(f"🤖 {self.bot.name} server listening on {address}")
+
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """Run the chatbot server from the command line"""
+    parser = argparse.ArgumentParser(description="Line-delimited JSON chat server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="serve on a Unix socket path instead of TCP")
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument('--max-sessions', type=int, default=DEFAULT_MAX_SESSIONS)
+    parser.add_argument('--intents', default=DEFAULT_INTENTS_PATH, help="intents JSON file")
+    parser.add_argument('--watch', action='store_true', help="reload the intents file when it changes")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help="0 disables the cache")
+    parser.add_argument('--cache-policy', choices=CACHE_POLICIES, default='lru')
+    parser.add_argument('--seed', type=int, help="seed each session's replies for reproducible runs")
+    parser.add_argument('--fuzzy', action='store_true', help="let misspelled keywords match")
+    args = parser.parse_args()
+
+    bot = BasicChatbot(args.intents, args.cache_size, args.cache_policy, fuzzy=args.fuzzy)
+    if args.watch:
+        bot.watch_intents()
+
+    server = ChatServer(bot, idle_timeout=args.idle_timeout, max_sessions=args.max_sessions, seed=args.seed)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("\nServer stopped. 👋")
+        if bot.cache is not None:
+            print(f"Cache stats: {bot.cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,25 @@
+import argparse
 import random
+import sys
+import time
 
+from hangman_solver import LETTER_BITS, WordIndex
+from hangman_stats import DEFAULT_STATS_PATH, GameStatsStore
+from hangman_wordlist import WordList, is_word_list_file
 
-def display_hangman(wrong_guesses):
-    """Display hangman drawing based on number of wrong guesses"""
-    stages = [
+# Predefined list of words
+WORDS = ["python", "programming", "computer", "keyboard", "monitor"]
+
+MAX_WRONG_GUESSES = 6
+
+# Outcomes of HangmanGame.guess()
+INVALID = 'invalid'
+ALREADY_GUESSED = 'already_guessed'
+CORRECT = 'correct'
+WRONG = 'wrong'
+
+# Gallows drawings by number of wrong guesses, built once rather than per call
+HANGMAN_STAGES = (
         """
            ------
            |    |
@@ -67,8 +83,36 @@ def display_hangman(wrong_guesses):
            |    
         --------
         """
-    ]
-    return stages[wrong_guesses]
+)
+
+
+# ANSI escape sequences used by the redraw mode
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+CLEAR_LINE = '\x1b[K'
+CLEAR_BELOW = '\x1b[J'
+
+
+def display_hangman(wrong_guesses):
+    """Display hangman drawing based on number of wrong guesses"""
+    return HANGMAN_STAGES[wrong_guesses]
+
+
+def letter_mask(letters):
+    """26-bit mask of the a-z letters in a string or set; other characters are ignored"""
+    mask = 0
+    for letter in set(letters):
+        mask |= LETTER_BITS.get(letter, 0)
+    return mask
+
+
+def mask_letters(mask):
+    """The letters of a mask in alphabetical order"""
+    letters = []
+    while mask:
+        lowest = mask & -mask
+        letters.append(chr(ord('a') + lowest.bit_length() - 1))
+        mask ^= lowest
+    return ''.join(letters)
 
 
 def display_word(word, guessed_letters):
@@ -82,80 +126,270 @@ def display_word(word, guessed_letters):
     return display.strip()
 
 
-def hangman_game():
-    """Main hangman game function"""
-    # Predefined list of words
-    words = ["python", "programming", "computer", "keyboard", "monitor"]
+class WordState:
+    def __init__(self, word):
+        """Track which letters of a word (or long phrase) are revealed
+
+        Each letter's positions are found once up front, so a guess only touches the
+        positions of that letter, and the solved check is a counter comparison.
+        """
+        self.word = word
+        self.positions = {}
+        for index, letter in enumerate(word):
+            if letter.isalpha():
+                self.positions.setdefault(letter.lower(), []).append(index)
+
+        # Letters start hidden; spaces and punctuation in phrases are shown as-is
+        self.masked = ['_' if letter.isalpha() else letter for letter in word]
+        self.remaining = len(self.positions)  # unique letters not yet revealed
+
+    def reveal(self, letter):
+        """Reveal every occurrence of a letter and return how many there were"""
+        indices = self.positions.pop(letter, None)
+        if not indices:
+            return 0
+
+        for index in indices:
+            self.masked[index] = self.word[index]
+        self.remaining -= 1
+        return len(indices)
+
+    def is_solved(self):
+        return self.remaining == 0
+
+    def display(self):
+        """The word with guessed letters revealed, like display_word()"""
+        return ' '.join(self.masked)
+
+
+class HangmanGame:
+    def __init__(self, word, max_wrong_guesses=MAX_WRONG_GUESSES):
+        """Game rules without any input or output, so games can be driven from code
+
+        Guessed letters are a 26-bit mask, so checking a guess, checking for a win and
+        listing the guessed letters are bit operations rather than set and string work.
+        Only a-z can be guessed, so words with other letters (like é) are refused.
+        """
+        word = word.lower()
+        unguessable = sorted({letter for letter in word if letter.isalpha() and letter not in LETTER_BITS})
+        if unguessable:
+            raise ValueError(f"{word!r} has letters that cannot be guessed: {''.join(unguessable)}")
+        self.word = word
+        self.state = WordState(self.word)
+        self.word_mask = letter_mask(self.word)
+        self.guessed = 0
+        self.wrong_guesses = 0
+        self.max_wrong_guesses = max_wrong_guesses
+
+    def guess(self, letter):
+        """Play one letter and return INVALID, ALREADY_GUESSED, CORRECT or WRONG"""
+        bit = LETTER_BITS.get(letter)
+        if bit is None:
+            return INVALID
+        if self.guessed & bit:
+            return ALREADY_GUESSED
+
+        self.guessed |= bit
+        if self.word_mask & bit:
+            self.state.reveal(letter)
+            return CORRECT
+
+        self.wrong_guesses += 1
+        return WRONG
+
+    @property
+    def guessed_letters(self):
+        """Guessed letters in alphabetical order"""
+        return mask_letters(self.guessed)
+
+    @property
+    def won(self):
+        return self.word_mask & ~self.guessed == 0
+
+    @property
+    def lost(self):
+        return self.wrong_guesses >= self.max_wrong_guesses
+
+    @property
+    def is_over(self):
+        return self.won or self.lost
 
-    # Select random word
-    word = random.choice(words).lower()
+    @property
+    def remaining_guesses(self):
+        return self.max_wrong_guesses - self.wrong_guesses
 
-    # Initialize game variables
-    guessed_letters = set()
-    wrong_guesses = 0
-    max_wrong_guesses = 6
+    def display(self):
+        return self.state.display()
 
-    print("🎮 Welcome to Hangman Game! 🎮")
-    print("Guess the word one letter at a time!")
-    print(f"The word has {len(word)} letters.")
-    print()
 
-    # Main game loop
-    while wrong_guesses < max_wrong_guesses:
-        # Display current state
-        print(display_hangman(wrong_guesses))
-        print(f"Word: {display_word(word, guessed_letters)}")
-        print(f"Guessed letters: {', '.join(sorted(guessed_letters)) if guessed_letters else 'None'}")
-        print(f"Wrong guesses remaining: {max_wrong_guesses - wrong_guesses}")
+def render_frame(game):
+    """One turn's screen: gallows, masked word, guessed letters and remaining count"""
+    guessed = ', '.join(game.guessed_letters) if game.guessed else 'None'
+    return (f"{HANGMAN_STAGES[game.wrong_guesses]}\n"
+            f"Word: {game.display()}\n"
+            f"Guessed letters: {guessed}\n"
+            f"Wrong guesses remaining: {game.remaining_guesses}\n")
+
+
+class FrameRenderer:
+    def __init__(self, stream=None, ansi=False):
+        """Write each turn's frame to a stream with a single write call
+
+        In ANSI mode the frame stays at the top of the screen and only the lines that
+        changed since the last turn are redrawn; the status message sits just below.
+        """
+        self.stream = stream or sys.stdout
+        self.ansi = ansi
+        self.previous = None
+
+    def render(self, game, status=''):
+        frame = render_frame(game)
+        if not self.ansi:
+            if status:
+                frame = f"{status}\n{'-' * 40}\n{frame}"
+            self.stream.write(frame + '\n')
+            self.stream.flush()
+            return
+
+        lines = frame.split('\n') + [status]
+        if self.previous is None:
+            parts = [CLEAR_SCREEN, '\n'.join(lines)]
+        else:
+            # Cursor positions are 1-based rows; unchanged rows are left alone
+            parts = [f"\x1b[{row};1H{line}{CLEAR_LINE}"
+                     for row, (line, old) in enumerate(zip(lines, self.previous), 1) if line != old]
+            parts.extend(f"\x1b[{row};1H{line}{CLEAR_LINE}"
+                         for row, line in enumerate(lines[len(self.previous):], len(self.previous) + 1))
+        # Park the cursor under the frame and wipe the previous answer
+        parts.append(f"\x1b[{len(lines) + 1};1H{CLEAR_BELOW}")
+        self.previous = lines
+        self.stream.write(''.join(parts))
+        self.stream.flush()
+
+
+def load_words(path):
+    """Read a word list with one word per line, keeping only words made of a-z
+
+    Packed word lists from hangman_wordlist.py are memory-mapped instead of read.
+    """
+    if is_word_list_file(path):
+        return WordList(path)
+    with open(path, encoding='utf-8') as words_file:
+        return [word for word in (line.strip().lower() for line in words_file)
+                if word and all(letter in LETTER_BITS for letter in word)]
+
+
+class LazyWordIndex:
+    def __init__(self, load_dictionary):
+        """WordIndex built on the first hint, so a big word list costs nothing until '?' is typed"""
+        self._load_dictionary = load_dictionary
+        self._index = None
+
+    def __getattr__(self, name):
+        if self._index is None:
+            print("📚 Indexing dictionary...")
+            self._index = WordIndex(self._load_dictionary())
+        return getattr(self._index, name)
+
+
+def hint_message(game, solver):
+    """The solver's suggestion for the current board"""
+    count = solver.candidate_count(game.state.masked, game.guessed)
+    suggestion = solver.suggest(game.state.masked, game.guessed)
+    if suggestion is None:
+        return "🤔 No dictionary word fits this board!"
+
+    examples = ', '.join(solver.candidate_words(game.state.masked, game.guessed, 5))
+    return f"💡 {count:,} words still fit (e.g. {examples}). Try '{suggestion}'!"
+
+
+def hangman_game(words=WORDS, solver=None, weighted=False, ansi=False):
+    """Main hangman game function; returns the finished game"""
+    # Select random word; packed word lists can favour harder words
+    if weighted and isinstance(words, WordList):
+        game = HangmanGame(words.weighted_choice())
+    else:
+        game = HangmanGame(random.choice(words))
+    word = game.word
+
+    if not ansi:
+        print("🎮 Welcome to Hangman Game! 🎮")
+        print("Guess the word one letter at a time!")
+        print(f"The word has {len(word)} letters.")
         print()
 
-        # Check if word is completely guessed
-        if all(letter in guessed_letters for letter in word):
+    # Main game loop; each turn's frame is written in one go
+    renderer = FrameRenderer(ansi=ansi)
+    status = f"🎮 Welcome to Hangman! The word has {len(word)} letters." if ansi else ''
+    while True:
+        renderer.render(game, status)
+
+        if game.won:
             print("🎉 Congratulations! You guessed the word!")
             print(f"The word was: {word.upper()}")
-            return
-
-        # Get user input
-        guess = input("Enter a letter: ").lower().strip()
+            return game
 
-        # Validate input
-        if len(guess) != 1 or not guess.isalpha():
-            print("❌ Please enter a single letter only!")
-            continue
+        if game.lost:
+            print("💀 Game Over! You've been hanged!")
+            print(f"The word was: {word.upper()}")
+            return game
 
-        if guess in guessed_letters:
-            print("❌ You already guessed that letter!")
+        # Get user input and play it
+        guess = input("Enter a letter: " if solver is None else "Enter a letter (or ? for a hint): ").lower().strip()
+        if guess == '?' and solver is not None:
+            status = hint_message(game, solver)
             continue
 
-        # Add guess to guessed letters
-        guessed_letters.add(guess)
+        outcome = game.guess(guess)
 
-        # Check if guess is correct
-        if guess in word:
-            print(f"✅ Good guess! '{guess}' is in the word!")
+        if outcome == INVALID:
+            status = "❌ Please enter a single letter only!"
+        elif outcome == ALREADY_GUESSED:
+            status = "❌ You already guessed that letter!"
+        elif outcome == CORRECT:
+            status = f"✅ Good guess! '{guess}' is in the word!"
         else:
-            wrong_guesses += 1
-            print(f"❌ Sorry, '{guess}' is not in the word!")
-
-        print("-" * 40)
-
-    # Game over - player lost
-    print(display_hangman(wrong_guesses))
-    print("💀 Game Over! You've been hanged!")
-    print(f"The word was: {word.upper()}")
+            status = f"❌ Sorry, '{guess}' is not in the word!"
 
 
 def main():
     """Main function to run the game"""
-    while True:
-        hangman_game()
-
-        # Ask if player wants to play again
-        play_again = input("\nDo you want to play again? (y/n): ").lower().strip()
-        if play_again != 'y' and play_again != 'yes':
-            print("Thanks for playing Hangman! 👋")
-            break
-        print("\n" + "=" * 50 + "\n")
+    parser = argparse.ArgumentParser(description="Play Hangman in the terminal")
+    parser.add_argument('--words', help="word list to pick secret words from (one per line)")
+    parser.add_argument('--dictionary', help="word list for '?' hints (defaults to --words)")
+    parser.add_argument('--hard', action='store_true',
+                        help="pick words by difficulty (packed word lists built with weights)")
+    parser.add_argument('--ansi', action='store_true', help="redraw only the changed lines of the screen")
+    parser.add_argument('--stats', default=DEFAULT_STATS_PATH, help="SQLite file that keeps every game's result")
+    parser.add_argument('--no-stats', action='store_true', help="don't record games")
+    args = parser.parse_args()
+
+    words = load_words(args.words) if args.words else WORDS
+    solver = None
+    if args.dictionary or args.words:
+        solver = LazyWordIndex(lambda: load_words(args.dictionary) if args.dictionary else words)
+
+    stats = None if args.no_stats else GameStatsStore(args.stats)
+    try:
+        while True:
+            start = time.monotonic()
+            game = hangman_game(words, solver, args.hard, args.ansi)
+            if stats is not None:
+                stats.record(game.word, len(game.guessed_letters), game.wrong_guesses, game.won,
+                             time.monotonic() - start)
+
+            # Ask if player wants to play again
+            play_again = input("\nDo you want to play again? (y/n): ").lower().strip()
+            if play_again != 'y' and play_again != 'yes':
+                print("Thanks for playing Hangman! 👋")
+                break
+            print("\n" + "=" * 50 + "\n")
+    finally:
+        if stats is not None:
+            stats.flush()
+            games, wins = stats.totals()
+            print(f"📊 {wins:,} of {games:,} recorded games won")
+            stats.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,225 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import OrderedDict
+
+import json_lines
+from hangman import (ALREADY_GUESSED, CORRECT, INVALID, LETTER_BITS, MAX_WRONG_GUESSES, WORDS, WRONG,
+                     letter_mask, load_words, mask_letters)
+
+# Longest request line accepted from a client, in bytes; a guess fits in far less
+MAX_LINE_BYTES = 4 * 1024
+
+# Seconds a game may go without a guess before it is evicted
+DEFAULT_IDLE_TIMEOUT = 300
+
+# Pending connections the listening socket queues; thousands of players may connect at once
+LISTEN_BACKLOG = 4096
+
+# Games held at once; new games are refused beyond this
+DEFAULT_MAX_GAMES = 100000
+
+
+class ServerGame:
+    """One game's state; the word itself stays in the server's shared word list"""
+
+    __slots__ = ('word_index', 'word_mask', 'guessed', 'wrong', 'last_active')
+
+    def __init__(self, word_index, word_mask):
+        self.word_index = word_index
+        self.word_mask = word_mask  # letters in the word
+        self.guessed = 0  # letters guessed so far
+        self.wrong = 0
+        self.last_active = time.monotonic()
+
+    @property
+    def won(self):
+        return self.word_mask & ~self.guessed == 0
+
+    @property
+    def lost(self):
+        return self.wrong >= MAX_WRONG_GUESSES
+
+
+class HangmanServer:
+    def __init__(self, words=WORDS, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_games=DEFAULT_MAX_GAMES, seed=None):
+        """Host many independent games over line-delimited JSON
+
+        Games are kept in order of last activity, so evicting idle ones only looks
+        at the oldest entries instead of scanning every game.
+        """
+        self.words = words
+        self.idle_timeout = idle_timeout
+        self.max_games = max_games
+        self.rng = random.Random(seed)
+        self.games = OrderedDict()
+        self._game_ids = itertools.count(1)
+        self.games_started = self.games_finished = self.games_evicted = 0
+
+    def new_game(self):
+        """Start a game on a random word; return its id, or None if the server is full"""
+        if len(self.games) >= self.max_games:
+            return None
+        game_id = next(self._game_ids)
+        word_index = self.rng.randrange(len(self.words))
+        self.games[game_id] = ServerGame(word_index, letter_mask(self.words[word_index]))
+        self.games_started += 1
+        return game_id
+
+    def guess(self, game, letter):
+        """Apply one guess to a game and return the outcome"""
+        bit = LETTER_BITS.get(letter) if isinstance(letter, str) else None
+        if bit is None:
+            return INVALID
+        if game.guessed & bit:
+            return ALREADY_GUESSED
+
+        game.guessed |= bit
+        if game.word_mask & bit:
+            return CORRECT
+        game.wrong += 1
+        return WRONG
+
+    def game_view(self, game_id, game):
+        """What the client sees of a game"""
+        word = self.words[game.word_index]
+        view = {
+            'game': game_id,
+            'word': ' '.join(letter if LETTER_BITS.get(letter, 0) & game.guessed else '_' for letter in word),
+            'guessed': mask_letters(game.guessed),
+            'remaining': MAX_WRONG_GUESSES - game.wrong,
+            'status': 'won' if game.won else 'lost' if game.lost else 'playing'
+        }
+        if view['status'] != 'playing':
+            view['answer'] = word
+        return view
+
+    def handle_request(self, payload, owned):
+        """Build the response object for one decoded request line
+
+        owned is the set of ids of the games the requesting connection started; a
+        client can only play its own games.
+        """
+        if not isinstance(payload, dict):
+            return {'error': "Expected a JSON object"}
+
+        if payload.get('new'):
+            game_id = self.new_game()
+            if game_id is None:
+                return {'error': "Server is full, try again later"}
+            owned.add(game_id)
+            return self.game_view(game_id, self.games[game_id])
+
+        game_id = payload.get('game')
+        # true == 1 in JSON as in Python, so bools are refused before the lookup
+        valid = isinstance(game_id, int) and not isinstance(game_id, bool) and game_id in owned
+        game = self.games.get(game_id) if valid else None
+        if game is None:
+            if valid:
+                owned.discard(game_id)  # evicted while idle
+            return {'error': "Unknown or expired game"}
+
+        guess = payload.get('guess')
+        outcome = self.guess(game, guess.lower() if isinstance(guess, str) else guess)
+        game.last_active = time.monotonic()
+        self.games.move_to_end(game_id)
+
+        view = self.game_view(game_id, game)
+        view['outcome'] = outcome
+        if view['status'] != 'playing':
+            del self.games[game_id]
+            owned.discard(game_id)
+            self.games_finished += 1
+        return view
+
+    def evict_idle(self, now=None):
+        """Drop games with no guess for idle_timeout seconds; return how many went"""
+        cutoff = (now or time.monotonic()) - self.idle_timeout
+        evicted = 0
+        while self.games:
+            game_id, game = next(iter(self.games.items()))
+            if game.last_active > cutoff:
+                break
+            del self.games[game_id]
+            evicted += 1
+        self.games_evicted += evicted
+        return evicted
+
+    async def evict_forever(self):
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 0.1))
+            self.evict_idle()
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests from one client; a client may play any number of games
+
+        The client's unfinished games are dropped when it disconnects.
+        """
+        owned = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await json_lines.send(writer, {'error': "Request too long"})
+                    break
+
+                if not line:
+                    break
+
+                try:
+                    payload = json.loads(line)
+                except ValueError:
+                    response = {'error': "Invalid JSON"}
+                else:
+                    response = self.handle_request(payload, owned)
+
+                await json_lines.send(writer, response)
+        except ConnectionError:
+            pass
+        finally:
+            for game_id in owned:
+                self.games.pop(game_id, None)
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8766, unix_path=None):
+        """Listen on a local TCP port or Unix socket until cancelled"""
+        server, address = await json_lines.start_server(self.handle_connection, host, port, unix_path,
+                                                        MAX_LINE_BYTES, LISTEN_BACKLOG)
+        print(f"🎮 Hangman server listening on {address}")
+
+        evictor = asyncio.ensure_future(self.evict_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+
+
+def main():
+    """Run the hangman server from the command line"""
+    parser = argparse.ArgumentParser(description="Line-delimited JSON hangman server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--unix', help="serve on a Unix socket path instead of TCP")
+    parser.add_argument('--words', help="word list to pick secret words from (text or packed)")
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument('--max-games', type=int, default=DEFAULT_MAX_GAMES)
+    parser.add_argument('--seed', type=int, help="seed word selection for reproducible runs")
+    args = parser.parse_args()
+
+    words = load_words(args.words) if args.words else WORDS
+    server = HangmanServer(words, args.idle_timeout, args.max_games, args.seed)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("\nServer stopped. 👋")
+        print(f"Games started: {server.games_started:,}  finished: {server.games_finished:,}  "
+              f"evicted: {server.games_evicted:,}")
+
+
+if __name__ == "__main__":
+    main()
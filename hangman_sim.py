@@ -0,0 +1,152 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from hangman import LETTER_BITS, MAX_WRONG_GUESSES, WORDS, HangmanGame, load_words
+from hangman_solver import ENGLISH_FREQUENCY, WordIndex, popcount
+
+# Games played per task handed to a worker process
+GAMES_PER_CHUNK = 5000
+
+# Strategy and secret words used inside worker processes, set once per worker
+_worker_strategy = None
+_worker_words = None
+
+
+class FrequencyStrategy:
+    """Guess letters in order of English letter frequency"""
+
+    def __init__(self, dictionary=None):
+        self.order = [(letter, LETTER_BITS[letter]) for letter in ENGLISH_FREQUENCY]
+
+    def next_guess(self, game):
+        guessed = game.guessed
+        for letter, bit in self.order:
+            if not guessed & bit:
+                return letter
+        raise ValueError("Every letter has already been guessed")
+
+
+class CandidateFilterStrategy:
+    def __init__(self, dictionary):
+        """Guess the letter found in the most dictionary words that still fit the board"""
+        self.index = dictionary if isinstance(dictionary, WordIndex) else WordIndex(dictionary)
+        self.fallback = FrequencyStrategy()
+
+    def next_guess(self, game):
+        suggestion = self.index.suggest(game.state.masked, game.guessed)
+        return suggestion or self.fallback.next_guess(game)
+
+
+STRATEGIES = {
+    'frequency': FrequencyStrategy,
+    'candidates': CandidateFilterStrategy,
+}
+
+
+class SimulationReport:
+    def __init__(self, strategy, games, wins, guesses, elapsed):
+        """Totals from a batch of simulated games"""
+        self.strategy = strategy
+        self.games = games
+        self.wins = wins
+        self.guesses = guesses
+        self.elapsed = elapsed
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (f"{self.strategy:<12} games {self.games:>10,}  win rate {self.win_rate:>7.2%}  "
+                f"avg guesses {self.guesses / max(self.games, 1):>5.2f}  "
+                f"{self.games_per_second:>10,.0f} games/s")
+
+
+def play_game(word, strategy, max_wrong_guesses=MAX_WRONG_GUESSES):
+    """Let a strategy play one game; return (won, letters guessed)"""
+    game = HangmanGame(word, max_wrong_guesses)
+    while not game.is_over:
+        game.guess(strategy.next_guess(game))
+    return game.won, popcount(game.guessed)
+
+
+def play_chunk(strategy, words, games, seed, max_wrong_guesses=MAX_WRONG_GUESSES):
+    """Play a number of games on random words; return (wins, total guesses)"""
+    rng = random.Random(seed)
+    wins = guesses = 0
+    for _ in range(games):
+        won, letters = play_game(rng.choice(words), strategy, max_wrong_guesses)
+        wins += won
+        guesses += letters
+    return wins, guesses
+
+
+def _init_worker(strategy_name, dictionary, words):
+    global _worker_strategy, _worker_words
+    _worker_strategy = STRATEGIES[strategy_name](dictionary)
+    _worker_words = words
+
+
+def _play_chunk_in_worker(games, seed, max_wrong_guesses):
+    return play_chunk(_worker_strategy, _worker_words, games, seed, max_wrong_guesses)
+
+
+def simulate(words, strategy_name='frequency', games=100000, workers=None, seed=0,
+             dictionary=None, max_wrong_guesses=MAX_WRONG_GUESSES):
+    """Play many games with one strategy, optionally across a process pool
+
+    Each chunk of games gets its own seed, so results do not depend on the number
+    of workers. The dictionary the strategy may consult defaults to the word list.
+    Workers get the words and dictionary once, when they start, not with every chunk.
+    """
+    dictionary = dictionary or words
+    chunk_sizes = [min(GAMES_PER_CHUNK, games - start) for start in range(0, games, GAMES_PER_CHUNK)]
+    chunk_seeds = [seed * 1000003 + index for index in range(len(chunk_sizes))]
+
+    start = time.perf_counter()
+    if not workers or workers <= 1:
+        strategy = STRATEGIES[strategy_name](dictionary)
+        results = [play_chunk(strategy, words, size, chunk_seed, max_wrong_guesses)
+                   for size, chunk_seed in zip(chunk_sizes, chunk_seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(strategy_name, dictionary, words)) as executor:
+            futures = [executor.submit(_play_chunk_in_worker, size, chunk_seed, max_wrong_guesses)
+                       for size, chunk_seed in zip(chunk_sizes, chunk_seeds)]
+            results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    wins = sum(result[0] for result in results)
+    guesses = sum(result[1] for result in results)
+    return SimulationReport(strategy_name, games, wins, guesses, elapsed)
+
+
+def main():
+    """Run simulations from the command line"""
+    parser = argparse.ArgumentParser(description="Simulate hangman games with automatic players")
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES) + ['all'], default='all')
+    parser.add_argument('--words', help="word list to draw secret words from (one per line)")
+    parser.add_argument('--dictionary', help="word list the candidate strategy may consult")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    words = load_words(args.words) if args.words else WORDS
+    dictionary = load_words(args.dictionary) if args.dictionary else None
+    strategies = sorted(STRATEGIES) if args.strategy == 'all' else [args.strategy]
+
+    print(f"🎮 Simulating {args.games:,} games per strategy over {len(words):,} words")
+    for name in strategies:
+        report = simulate(words, name, args.games, args.workers, args.seed, dictionary)
+        print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
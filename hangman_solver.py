@@ -0,0 +1,120 @@
+import string
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(value):
+        return bin(value).count('1')
+
+LETTERS = string.ascii_lowercase
+
+# Bit for each letter in a 26-bit letter mask
+LETTER_BITS = {letter: 1 << index for index, letter in enumerate(LETTERS)}
+
+# Letters from most to least common in English text
+ENGLISH_FREQUENCY = 'etaoinshrdlcumwfgypbvkjxqz'
+
+
+class LengthIndex:
+    def __init__(self, words):
+        """Bitsets over the words of one length; bit i stands for words[i]
+
+        at[position][letter] has the bits of words with that letter at that position,
+        and contains[letter] has the bits of words using the letter anywhere.
+        """
+        self.words = words
+        self.all = (1 << len(words)) - 1
+
+        length = len(words[0])
+        size = (len(words) + 7) // 8
+        at = [{letter: bytearray(size) for letter in LETTERS} for _ in range(length)]
+        contains = {letter: bytearray(size) for letter in LETTERS}
+        for index, word in enumerate(words):
+            byte, bit = index >> 3, 1 << (index & 7)
+            for position, letter in enumerate(word):
+                at[position][letter][byte] |= bit
+                contains[letter][byte] |= bit
+
+        # Built as bytes first; or-ing bits into a growing int would be quadratic
+        self.at = [{letter: int.from_bytes(bits, 'little') for letter, bits in column.items()} for column in at]
+        self.contains = {letter: int.from_bytes(bits, 'little') for letter, bits in contains.items()}
+        self.letter_sets = [(letter, LETTER_BITS[letter], self.contains[letter]) for letter in LETTERS]
+
+    def candidates(self, masked, guessed):
+        """Bitset of the words consistent with the board; guessed is a 26-bit letter mask"""
+        mask = self.all
+        revealed = set()
+        hidden_positions = []
+        for position, shown in enumerate(masked):
+            if shown == '_':
+                hidden_positions.append(position)
+            else:
+                bits = self.at[position].get(shown)
+                if bits is None:  # not a-z, so no dictionary word can fit
+                    return 0
+                mask &= bits
+                revealed.add(shown)
+
+        # A wrong letter appears nowhere; a revealed letter appears in no hidden slot
+        while guessed:
+            lowest = guessed & -guessed
+            letter = LETTERS[lowest.bit_length() - 1]
+            if letter not in revealed:
+                mask &= ~self.contains[letter]
+            guessed ^= lowest
+        for position in hidden_positions:
+            column = self.at[position]
+            for letter in revealed:
+                mask &= ~column[letter]
+        return mask
+
+
+class WordIndex:
+    def __init__(self, words):
+        """Dictionary indexed by word length for fast candidate filtering"""
+        by_length = {}
+        for word in words:
+            by_length.setdefault(len(word), []).append(word)
+        self.lengths = {length: LengthIndex(group) for length, group in by_length.items()}
+
+    @classmethod
+    def from_file(cls, path):
+        """Index a word list with one word per line, keeping only a-z words"""
+        with open(path, encoding='utf-8') as words_file:
+            words = {line.strip().lower() for line in words_file}
+        return cls(sorted(word for word in words if word and all(letter in LETTERS for letter in word)))
+
+    def candidates(self, masked, guessed):
+        """(LengthIndex, bitset) of dictionary words consistent with the board"""
+        index = self.lengths.get(len(masked))
+        if index is None:
+            return None, 0
+        return index, index.candidates(masked, guessed)
+
+    def candidate_count(self, masked, guessed):
+        return popcount(self.candidates(masked, guessed)[1])
+
+    def candidate_words(self, masked, guessed, limit=10):
+        """Up to limit matching words, for showing the player"""
+        index, mask = self.candidates(masked, guessed)
+        words = []
+        while mask and len(words) < limit:
+            lowest = mask & -mask
+            words.append(index.words[lowest.bit_length() - 1])
+            mask ^= lowest
+        return words
+
+    def suggest(self, masked, guessed):
+        """Unguessed letter found in the most candidate words, or None if nothing fits"""
+        index, mask = self.candidates(masked, guessed)
+        if not mask:
+            return None
+
+        best, best_count = None, 0
+        for letter, bit, words_with_letter in index.letter_sets:
+            if guessed & bit:
+                continue
+            count = popcount(mask & words_with_letter)
+            if count > best_count:
+                best, best_count = letter, count
+        return best
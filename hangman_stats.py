@@ -0,0 +1,162 @@
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_STATS_PATH = 'hangman_stats.db'
+
+# Games buffered in memory before a flush is forced
+DEFAULT_BATCH_SIZE = 1000
+
+# Seconds between background flushes
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+GameRecord = namedtuple('GameRecord', 'word guesses wrong_guesses won duration finished')
+SummaryRow = namedtuple('SummaryRow', 'key games wins guesses duration')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    wrong_guesses INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    finished REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS word_stats (
+    word TEXT PRIMARY KEY,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS length_stats (
+    length INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    duration REAL NOT NULL
+);
+"""
+
+# Summary rows are bumped by each batch's totals rather than recomputed from games
+UPSERT_SUMMARY = """
+INSERT INTO {table} ({key}, games, wins, guesses, duration) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT({key}) DO UPDATE SET
+    games = games + excluded.games,
+    wins = wins + excluded.wins,
+    guesses = guesses + excluded.guesses,
+    duration = duration + excluded.duration
+"""
+
+
+def summarize(records, key):
+    """Per-key [games, wins, guesses, duration] totals for a batch of records"""
+    totals = {}
+    for record in records:
+        row = totals.setdefault(key(record), [0, 0, 0, 0.0])
+        row[0] += 1
+        row[1] += record.won
+        row[2] += record.guesses
+        row[3] += record.duration
+    return [(name, *row) for name, row in totals.items()]
+
+
+class GameStatsStore:
+    def __init__(self, path=DEFAULT_STATS_PATH, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """Append-only game history in SQLite (WAL mode) with maintained summary tables
+
+        record() only appends to an in-memory batch. Batches are written in one
+        transaction when they fill up or when the background thread's interval comes
+        round, and the per-word and per-length summary rows are updated in the same
+        transaction, so aggregate queries never scan the games table.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')  # WAL keeps this crash-safe
+        self._connection.executescript(SCHEMA)
+
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_forever, args=(flush_interval,), daemon=True)
+            self._flusher.start()
+
+    def record(self, word, guesses, wrong_guesses, won, duration, finished=None):
+        """Queue one finished game"""
+        record = GameRecord(word, guesses, wrong_guesses, int(won), duration, finished or time.time())
+        with self._lock:
+            self.pending.append(record)
+            if len(self.pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        """Write every queued game now; return how many were written"""
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self):
+        records, self.pending = self.pending, []
+        if not records:
+            return 0
+
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO games (word, length, guesses, wrong_guesses, won, duration, finished) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(r.word, len(r.word), r.guesses, r.wrong_guesses, r.won, r.duration, r.finished)
+                 for r in records])
+            self._connection.executemany(UPSERT_SUMMARY.format(table='word_stats', key='word'),
+                                         summarize(records, lambda record: record.word))
+            self._connection.executemany(UPSERT_SUMMARY.format(table='length_stats', key='length'),
+                                         summarize(records, lambda record: len(record.word)))
+        return len(records)
+
+    def _flush_forever(self, interval):
+        while not self._closed.wait(interval):
+            self.flush()
+
+    def _query(self, sql, parameters=()):
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def word_stats(self, word):
+        """SummaryRow for one word, or None if it has never been played"""
+        rows = self._query('SELECT word, games, wins, guesses, duration FROM word_stats WHERE word = ?', (word,))
+        return SummaryRow(*rows[0]) if rows else None
+
+    def top_words(self, limit=10, min_games=1):
+        """Words with the best win rate among those played at least min_games times"""
+        rows = self._query('SELECT word, games, wins, guesses, duration FROM word_stats WHERE games >= ? '
+                           'ORDER BY CAST(wins AS REAL) / games DESC, games DESC LIMIT ?', (min_games, limit))
+        return [SummaryRow(*row) for row in rows]
+
+    def length_stats(self):
+        """SummaryRow per word length, shortest first"""
+        rows = self._query('SELECT length, games, wins, guesses, duration FROM length_stats ORDER BY length')
+        return [SummaryRow(*row) for row in rows]
+
+    def totals(self):
+        """(games, wins) over every recorded game, from the per-length summary"""
+        games, wins = self._query('SELECT COALESCE(SUM(games), 0), COALESCE(SUM(wins), 0) FROM length_stats')[0]
+        return games, wins
+
+    def close(self):
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,240 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from array import array
+
+from hangman_solver import ENGLISH_FREQUENCY, LETTERS
+
+# File layout, all little-endian:
+#   header   magic, flags, word count, and the start of each section below
+#   offsets  count + 1 uint64 byte offsets into the blob; word i is blob[offsets[i]:offsets[i + 1]]
+#   alias    optional; count uint32 thresholds then count uint32 aliases (Vose alias table)
+#   blob     every word's UTF-8 bytes back to back
+MAGIC = b'HWL1'
+HEADER = struct.Struct('<4sIQQQQ')
+HAS_WEIGHTS = 1
+
+# Rarity of each letter from 0 (e) to 1 (z), used to score difficulty
+LETTER_RARITY = {letter: rank / 25 for rank, letter in enumerate(ENGLISH_FREQUENCY)}
+
+# Words are streamed to a temporary blob file in chunks of this many bytes
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def difficulty(word):
+    """Rough hardness score: more distinct letters and rarer letters are harder to guess"""
+    return 1.0 + sum(LETTER_RARITY.get(letter, 1.0) for letter in set(word))
+
+
+def build_alias_table(weights):
+    """Vose alias table for weights: (thresholds, aliases) as uint32 arrays
+
+    To sample, pick a slot i uniformly, then keep i if a random 32-bit number is
+    below thresholds[i], otherwise take aliases[i]. Slots that are always kept
+    point at themselves, so the threshold never needs to reach 2 ** 32.
+    """
+    count = len(weights)
+    total = sum(weights)
+    if count == 0 or total <= 0:
+        raise ValueError("Weights must contain at least one positive value")
+
+    scaled = array('d', (weight * count / total for weight in weights))
+    thresholds = array('I', bytes(4 * count))
+    aliases = array('I', range(count))
+    small = [index for index, value in enumerate(scaled) if value < 1.0]
+    large = [index for index, value in enumerate(scaled) if value >= 1.0]
+
+    while small and large:
+        low, high = small.pop(), large.pop()
+        thresholds[low] = int(scaled[low] * 4294967296.0)
+        aliases[low] = high
+        scaled[high] -= 1.0 - scaled[low]
+        if scaled[high] < 1.0:
+            small.append(high)
+        else:
+            large.append(high)
+    # Whatever is left is 1.0 give or take rounding and keeps its own slot
+    return thresholds, aliases
+
+
+def iter_word_file(path, min_length=1, max_length=None):
+    """(word, weight) pairs from a text file; weight comes from an optional second column"""
+    with open(path, encoding='utf-8') as words_file:
+        for line in words_file:
+            fields = line.split()
+            if not fields:
+                continue
+            word = fields[0].lower()
+            if not (word.isalpha() and all(letter in LETTERS for letter in word)):
+                continue
+            if len(word) < min_length or (max_length and len(word) > max_length):
+                continue
+            weight = float(fields[1]) if len(fields) > 1 else difficulty(word)
+            yield word, weight
+
+
+def build_word_list(pairs, output_path, weighted=True):
+    """Write (word, weight) pairs to output_path in the packed format; return the word count
+
+    Words are streamed to a temporary file, so only the offsets and weights are held
+    in memory (16 bytes per word) rather than a list of str. Every word must be
+    lowercase a-z, the letters a game can be played with; ValueError otherwise.
+    """
+    offsets = array('Q', [0])
+    weights = array('d')
+    buffer = bytearray()
+    directory = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryFile(dir=directory) as blob:
+        for word, weight in pairs:
+            if not word or not all(letter in LETTERS for letter in word):
+                raise ValueError(f"{word!r} is not made of the letters a-z")
+            encoded = word.encode('utf-8')
+            buffer += encoded
+            offsets.append(offsets[-1] + len(encoded))
+            weights.append(weight)
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                blob.write(buffer)
+                buffer.clear()
+        blob.write(buffer)
+
+        count = len(weights)
+        if count == 0:
+            raise ValueError("No words to write")
+        alias_table = build_alias_table(weights) if weighted else None
+        del weights
+
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+            if alias_table:
+                for column in alias_table:
+                    column.byteswap()
+
+        offsets_start = HEADER.size
+        alias_start = offsets_start + offsets.itemsize * len(offsets)
+        blob_start = alias_start + (8 * count if alias_table else 0)
+        flags = HAS_WEIGHTS if alias_table else 0
+
+        # Write under a temporary name so readers never see a half-built file
+        temp_path = output_path + '.tmp'
+        with open(temp_path, 'wb') as output:
+            output.write(HEADER.pack(MAGIC, flags, count, offsets_start, alias_start, blob_start))
+            offsets.tofile(output)
+            if alias_table:
+                for column in alias_table:
+                    column.tofile(output)
+            blob.seek(0)
+            while True:
+                chunk = blob.read(WRITE_BUFFER_SIZE)
+                if not chunk:
+                    break
+                output.write(chunk)
+        os.replace(temp_path, output_path)
+    return count
+
+
+def is_word_list_file(path):
+    """True if path starts with the packed word list magic"""
+    with open(path, 'rb') as candidate:
+        return candidate.read(len(MAGIC)) == MAGIC
+
+
+class WordList:
+    def __init__(self, path):
+        """Read-only, memory-mapped packed word list
+
+        Opening only maps the file, so startup time and memory do not grow with the
+        number of words; pages are read in as words are looked up. Works as a
+        sequence, so random.choice(word_list) is O(1).
+        """
+        if sys.byteorder != 'little':
+            raise OSError("Packed word lists are little-endian; this platform is not supported")
+
+        self.path = path
+        with open(path, 'rb') as words_file:
+            self._map = mmap.mmap(words_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, flags, count, offsets_start, alias_start, blob_start = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a packed word list")
+
+        self.count = count
+        self.weighted = bool(flags & HAS_WEIGHTS)
+        view = memoryview(self._map)
+        self._offsets = view[offsets_start:alias_start if self.weighted else blob_start].cast('Q')
+        if self.weighted:
+            self._thresholds = view[alias_start:alias_start + 4 * count].cast('I')
+            self._aliases = view[alias_start + 4 * count:blob_start].cast('I')
+        self._blob = view[blob_start:]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("word list index out of range")
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def __reduce__(self):
+        # Worker processes reopen the file instead of copying the mapping
+        return WordList, (self.path,)
+
+    def choice(self, rng=random):
+        """Uniformly random word"""
+        return self[rng.randrange(self.count)]
+
+    def weighted_choice(self, rng=random):
+        """Random word in proportion to its stored weight (difficulty by default)"""
+        if not self.weighted:
+            return self.choice(rng)
+        index = rng.randrange(self.count)
+        if rng.getrandbits(32) >= self._thresholds[index]:
+            index = self._aliases[index]
+        return self[index]
+
+    def close(self):
+        # Views must be released before the mapping can be closed
+        for name in ('_offsets', '_thresholds', '_aliases', '_blob'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    """Convert a plain text word list (one word per line) into the packed format"""
+    parser = argparse.ArgumentParser(description="Build a memory-mapped hangman word list")
+    parser.add_argument('input', help="text file with one word per line, optionally followed by a weight")
+    parser.add_argument('output', help="packed word list to write")
+    parser.add_argument('--min-length', type=int, default=4)
+    parser.add_argument('--max-length', type=int, default=None)
+    parser.add_argument('--no-weights', action='store_true', help="skip the weighted-selection table")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = build_word_list(iter_word_file(args.input, args.min_length, args.max_length),
+                            args.output, weighted=not args.no_weights)
+    size = os.path.getsize(args.output)
+    print(f"📦 Wrote {count:,} words to {args.output} ({size / 1e6:,.1f} MB) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import asyncio
+import json
+
+# Pending connections a listening socket queues unless a server asks for more
+DEFAULT_LISTEN_BACKLOG = 100
+
+
+async def send(writer, obj):
+    """Write one JSON line and wait for the transport buffer to drain"""
+    writer.write(json.dumps(obj).encode() + b'\n')
+    await writer.drain()
+
+
+async def start_server(handle_connection, host, port, unix_path, max_line_bytes, backlog=DEFAULT_LISTEN_BACKLOG):
+    """Listen on a local TCP port, or on a Unix socket if unix_path is set; return (server, address)
+
+    Lines longer than max_line_bytes make the connection's readline() raise
+    ValueError, so one client cannot make the server buffer without limit.
+    """
+    if unix_path:
+        server = await asyncio.start_unix_server(handle_connection, unix_path, limit=max_line_bytes,
+                                                 backlog=backlog)
+        return server, unix_path
+    server = await asyncio.start_server(handle_connection, host, port, limit=max_line_bytes, backlog=backlog)
+    return server, f"{host}:{port}"
@@ -0,0 +1,175 @@
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from math import fsum, nan
+from operator import mul
+
+from portfolio_ledger import SymbolTable
+
+# Accounts revalued per pass; bounds the per-entry price list built for each pass
+REVALUE_CHUNK_SIZE = 20_000
+
+# Accounts handed to a worker process per task
+ACCOUNTS_PER_SHARD = 100_000
+
+# Book inherited by worker processes, set once per worker
+_worker_book = None
+
+
+class AccountBook:
+    def __init__(self):
+        """Holdings of many accounts as a sparse account x symbol matrix
+
+        Rows are stored compressed (CSR): offsets[account] is where the account's
+        holdings start in two flat arrays of symbol ids (sorted within each account)
+        and share counts. A book of a million accounts with ten positions each takes
+        about 130 MB instead of a million dicts.
+
+        Changes to a position the account already holds are made in place. New
+        positions wait in a small pending dict until compact() merges them, which
+        revaluation does first.
+        """
+        self.symbols = SymbolTable()
+        self.offsets = array('Q', [0])
+        self.columns = array('I')
+        self.quantities = array('q')
+        self.pending = {}  # (account, symbol id) -> shares in positions not yet in the matrix
+
+    def add_account(self, holdings=None):
+        """Open an account with {symbol: shares}; return its id"""
+        positions = sorted((self.symbols.intern(symbol), quantity) for symbol, quantity in (holdings or {}).items()
+                           if quantity)
+        if any(quantity < 0 for _, quantity in positions):
+            raise ValueError("Holdings cannot be negative")
+        self.columns.extend(symbol_id for symbol_id, _ in positions)
+        self.quantities.extend(quantity for _, quantity in positions)
+        self.offsets.append(len(self.columns))
+        return len(self.offsets) - 2
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _find(self, account, symbol_id):
+        # Index of the account's entry for a symbol, or -1
+        start, stop = self.offsets[account], self.offsets[account + 1]
+        index = bisect_left(self.columns, symbol_id, start, stop)
+        return index if index < stop and self.columns[index] == symbol_id else -1
+
+    def trade(self, account, symbol, change):
+        """Add change shares (negative to sell) of a symbol to an account; return the new position"""
+        if not 0 <= account < len(self):
+            raise IndexError(f"No account {account}")
+        symbol_id = self.symbols.intern(symbol)
+        index = self._find(account, symbol_id)
+        held = self.quantities[index] if index >= 0 else 0
+        held += self.pending.get((account, symbol_id), 0)
+        if held + change < 0:
+            raise ValueError(f"Cannot sell {-change} of {held} {symbol} shares")
+
+        if index >= 0:
+            self.quantities[index] += change
+        else:
+            self.pending[account, symbol_id] = self.pending.get((account, symbol_id), 0) + change
+        return held + change
+
+    def position(self, account, symbol):
+        symbol_id = self.symbols.id_of(symbol)
+        if symbol_id is None:
+            return 0
+        index = self._find(account, symbol_id)
+        held = self.quantities[index] if index >= 0 else 0
+        return held + self.pending.get((account, symbol_id), 0)
+
+    def holdings(self, account):
+        """{symbol: shares} for one account"""
+        start, stop = self.offsets[account], self.offsets[account + 1]
+        shares = dict(zip(self.columns[start:stop], self.quantities[start:stop]))
+        for (pending_account, symbol_id), change in self.pending.items():
+            if pending_account == account:
+                shares[symbol_id] = shares.get(symbol_id, 0) + change
+        return {self.symbols[symbol_id]: quantity for symbol_id, quantity in sorted(shares.items()) if quantity}
+
+    def compact(self):
+        """Merge pending positions into the matrix and drop emptied ones, in one pass over the book"""
+        by_account = {}
+        for (account, symbol_id), change in self.pending.items():
+            by_account.setdefault(account, []).append((symbol_id, change))
+
+        offsets, columns, quantities = array('Q', [0]), array('I'), array('q')
+        old_offsets, old_columns, old_quantities = self.offsets, self.columns, self.quantities
+        for account in range(len(self)):
+            start, stop = old_offsets[account], old_offsets[account + 1]
+            added = by_account.get(account)
+            if added is None and old_quantities[start:stop].count(0) == 0:
+                columns += old_columns[start:stop]
+                quantities += old_quantities[start:stop]
+            else:
+                positions = sorted(list(zip(old_columns[start:stop], old_quantities[start:stop])) + (added or []))
+                for symbol_id, quantity in positions:
+                    if quantity:
+                        columns.append(symbol_id)
+                        quantities.append(quantity)
+            offsets.append(len(columns))
+
+        self.offsets, self.columns, self.quantities = offsets, columns, quantities
+        self.pending = {}
+
+    def price_vector(self, prices):
+        """array of prices by symbol id from {symbol: price}; unpriced symbols are NaN"""
+        return array('d', (prices.get(symbol, nan) for symbol in self.symbols))
+
+    def revalue_range(self, vector, first=0, stop=None):
+        """Market value of accounts first..stop-1 against a price vector, as an array
+
+        Each pass values every entry in a chunk of accounts with one map() over the
+        share counts and gathered prices, then sums each account's slice of them.
+        """
+        stop = len(self) if stop is None else stop
+        values = array('d')
+        price_of = vector.__getitem__
+        for chunk_start in range(first, stop, REVALUE_CHUNK_SIZE):
+            chunk_stop = min(chunk_start + REVALUE_CHUNK_SIZE, stop)
+            base = self.offsets[chunk_start]
+            end = self.offsets[chunk_stop]
+            entry_values = list(map(mul, memoryview(self.quantities)[base:end],
+                                    map(price_of, memoryview(self.columns)[base:end])))
+
+            bounds = [offset - base for offset in self.offsets[chunk_start:chunk_stop + 1]]
+            values.extend(map(fsum, map(entry_values.__getitem__, map(slice, bounds[:-1], bounds[1:]))))
+        return values
+
+    def revalue(self, prices, workers=None):
+        """Market value of every account, from {symbol: price} or a price vector
+
+        With workers, shards of ACCOUNTS_PER_SHARD accounts are revalued in a process
+        pool; workers get the book once, when they start, not with every shard.
+        """
+        if self.pending:
+            self.compact()
+        vector = prices if isinstance(prices, array) else self.price_vector(prices)
+        if not workers or workers <= 1 or len(self) <= ACCOUNTS_PER_SHARD:
+            return self.revalue_range(vector)
+
+        values = array('d')
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as executor:
+            shards = range(0, len(self), ACCOUNTS_PER_SHARD)
+            futures = [executor.submit(_revalue_in_worker, vector, first, min(first + ACCOUNTS_PER_SHARD, len(self)))
+                       for first in shards]
+            for future in futures:
+                values += future.result()
+        return values
+
+    @property
+    def nbytes(self):
+        """Bytes held by the matrix buffers"""
+        return sum(column.itemsize * len(column) for column in (self.offsets, self.columns, self.quantities))
+
+
+def _init_worker(book):
+    """Keep the book for the worker's lifetime; under fork it is inherited rather than pickled"""
+    global _worker_book
+    _worker_book = book
+
+
+def _revalue_in_worker(vector, first, stop):
+    return _worker_book.revalue_range(vector, first, stop)
@@ -0,0 +1,280 @@
+import csv
+import gzip
+import io
+import json
+import math
+import re
+import time
+from datetime import datetime
+
+from portfolio_ledger import ACTION_CODES, DATE_FORMAT
+
+# Trades validated and applied per lock acquisition
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Rows formatted per write during export
+EXPORT_CHUNK_SIZE = 50_000
+
+# Buffer for exported files; a few large writes instead of one per row
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Fast gzip: exports are usually compressed for transfer, not for archiving
+GZIP_LEVEL = 1
+
+# Rejected rows reported by line; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+SYMBOL_PATTERN = re.compile(r'[A-Z0-9][A-Z0-9.\-]{0,15}')
+
+# Column order of exported history, which import_trades() reads back
+HISTORY_COLUMNS = ['date', 'action', 'symbol', 'quantity', 'price', 'total']
+# The first four are the columns save_portfolio_to_file() has always written
+HOLDINGS_COLUMNS = ['Stock Symbol', 'Quantity', 'Price per Share', 'Total Value', 'Average Cost', 'Weight']
+REQUIRED_COLUMNS = ('action', 'symbol', 'quantity', 'price')
+
+SECONDS = [f"{second:02d}" for second in range(60)]
+
+
+def open_text(path, mode):
+    """Open a text file for 'r' or 'w', through gzip when the name ends in .gz
+
+    Files are read as utf-8-sig, which drops the byte-order mark Excel and many
+    brokers put at the start of a CSV, so it does not end up in the first column name.
+    """
+    encoding = 'utf-8-sig' if mode == 'r' else 'utf-8'
+    if path.endswith('.gz'):
+        if mode == 'r':
+            return io.TextIOWrapper(gzip.open(path, 'rb'), encoding=encoding, newline='')
+        raw = gzip.open(path, 'wb', compresslevel=GZIP_LEVEL)
+        return io.TextIOWrapper(io.BufferedWriter(raw, WRITE_BUFFER_SIZE), encoding=encoding, newline='')
+    return open(path, mode, encoding=encoding, newline='', buffering=WRITE_BUFFER_SIZE)
+
+
+def is_jsonl(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    return name.lower().endswith(('.jsonl', '.ndjson'))
+
+
+def iter_raw_trades(path):
+    """(line number, action, symbol, quantity, price, date) per row of a CSV or JSONL trade file
+
+    CSV files need a header naming at least action, symbol, quantity and price; a
+    date column is optional. Values are passed on unvalidated.
+    """
+    with open_text(path, 'r') as trade_file:
+        if is_jsonl(path):
+            for line_number, line in enumerate(trade_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    yield (line_number, row.get('action'), row.get('symbol'), row.get('quantity'),
+                           row.get('price'), row.get('date'))
+                except (ValueError, AttributeError):
+                    yield line_number, None, None, None, None, None
+            return
+
+        reader = csv.reader(trade_file)
+        header = [name.strip().lower() for name in next(reader, [])]
+        missing = [name for name in REQUIRED_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"{path} has no {', '.join(missing)} column")
+        action, symbol, quantity, price = (header.index(name) for name in REQUIRED_COLUMNS)
+        date = header.index('date') if 'date' in header else None
+        width = len(header)
+        for line_number, row in enumerate(reader, 2):
+            if len(row) < width:
+                if row:
+                    yield line_number, None, None, None, None, None
+                continue
+            yield (line_number, row[action], row[symbol], row[quantity], row[price],
+                   None if date is None else row[date])
+
+
+class TradeParser:
+    def __init__(self):
+        """Validates raw trade values, caching what repeats from row to row
+
+        Broker files use a few thousand symbols and often many trades per second, so
+        checked symbols and parsed dates are remembered rather than redone per row.
+        """
+        self.symbols = {}  # raw symbol -> checked symbol
+        self.dates = {}  # raw date -> epoch seconds
+
+    def timestamp(self, value):
+        """Epoch seconds from a number, an epoch string or an ISO date; now if there is none"""
+        if value is None or value == '':
+            return int(time.time())
+        if isinstance(value, (int, float)):
+            return int(value)
+        timestamp = self.dates.get(value)
+        if timestamp is None:
+            if value.isdigit():
+                timestamp = int(value)
+            else:
+                timestamp = int(datetime.fromisoformat(value).timestamp())
+            if len(self.dates) >= DEFAULT_CHUNK_SIZE:
+                self.dates.clear()  # dates rarely repeat far apart; keep memory flat
+            self.dates[value] = timestamp
+        return timestamp
+
+    def symbol(self, value):
+        symbol = self.symbols.get(value)
+        if symbol is None:
+            symbol = value.strip().upper() if isinstance(value, str) else ''
+            if not SYMBOL_PATTERN.fullmatch(symbol):
+                raise ValueError(f"invalid symbol {value!r}")
+            self.symbols[value] = symbol
+        return symbol
+
+    def parse(self, action, symbol, quantity, price, date):
+        """(timestamp, signed quantity, price, symbol) from raw values, or ValueError saying what is wrong"""
+        code = ACTION_CODES.get(action)
+        if code is None:
+            code = ACTION_CODES.get(action.strip().upper() if isinstance(action, str) else action)
+            if code is None:
+                raise ValueError(f"action must be BUY or SELL, not {action!r}")
+
+        # int() would truncate 10.5 to 10 and turn true into 1, so both are refused first
+        whole = (not isinstance(quantity, bool)
+                 and not (isinstance(quantity, float) and not quantity.is_integer()))
+        if whole:
+            try:
+                shares = int(quantity)
+            except ValueError:
+                value = float(quantity)  # "10.0" from a spreadsheet
+                whole = value.is_integer()
+                shares = int(value) if whole else 0
+        if not whole or shares <= 0:
+            raise ValueError(f"quantity must be a positive whole number, not {quantity!r}")
+
+        price = float(price)
+        if not 0 < price < math.inf:
+            raise ValueError(f"price must be positive, not {price!r}")
+
+        return self.timestamp(date), code * shares, price, self.symbol(symbol)
+
+
+def read_trades(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Chunks of (valid trades, rejected rows) from a trade file
+
+    Trades are (line number, timestamp, signed quantity, price, symbol) and
+    rejected rows are (line number, message). Only one chunk is held at a time.
+    A row older than the trade before it in the file is rejected.
+    """
+    parse = TradeParser().parse
+    trades, rejected = [], []
+    last = -math.inf
+    for line_number, action, symbol, quantity, price, date in iter_raw_trades(path):
+        try:
+            trade = parse(action, symbol, quantity, price, date)
+        except (ValueError, TypeError, OverflowError) as error:
+            unreadable = action is None and symbol is None
+            rejected.append((line_number, "unreadable row" if unreadable else str(error)))
+        else:
+            if trade[0] < last:
+                rejected.append((line_number, "trade is older than the one before it"))
+            else:
+                trades.append((line_number, *trade))
+                last = trade[0]
+
+        if len(trades) + len(rejected) >= chunk_size:
+            yield trades, rejected
+            trades, rejected = [], []
+    if trades or rejected:
+        yield trades, rejected
+
+
+def import_trades(tracker, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream a CSV or JSONL trade file into a tracker; return (imported, rejected count, first errors)
+
+    Each chunk is applied under one acquisition of the tracker's lock, and journaled
+    if the tracker has a store. Rows must be in time order; they may be older than
+    trades already recorded, and are merged into the history in place.
+    """
+    imported = rejected = 0
+    errors = []
+    for trades, invalid in read_trades(path, chunk_size):
+        refused = tracker.apply_trades(trades)
+        imported += len(trades) - len(refused)
+        invalid += refused
+        rejected += len(invalid)
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors += sorted(invalid)[:MAX_REPORTED_ERRORS - len(errors)]
+    return imported, rejected, errors
+
+
+def write_history(tracker, path, start=None, end=None):
+    """Stream the transaction history, optionally between two epoch times, to CSV; return rows written
+
+    The ledger is read in chunks and each chunk goes out in one write, so memory
+    stays flat. The file can be read back with import_trades().
+    """
+    ledger = tracker.portfolio_history
+    first, stop = ledger.date_range(start, end)
+    # Time zones are offset by whole minutes, so only the seconds change within a
+    # minute and the rest of the date is formatted once per minute
+    minute, prefix = None, ''
+    with open_text(path, 'w') as history_file:
+        writer = csv.writer(history_file)
+        writer.writerow(HISTORY_COLUMNS)
+        for chunk_start in range(first, stop, EXPORT_CHUNK_SIZE):
+            rows = []
+            for timestamp, action, symbol, quantity, price, total in ledger.rows(
+                    chunk_start, min(chunk_start + EXPORT_CHUNK_SIZE, stop)):
+                if timestamp // 60 != minute:
+                    minute = timestamp // 60
+                    prefix = datetime.fromtimestamp(minute * 60).strftime(DATE_FORMAT)[:-2]
+                rows.append((prefix + SECONDS[timestamp % 60], action, symbol, quantity, price, round(total, 2)))
+            writer.writerows(rows)
+    return stop - first
+
+
+def write_holdings(tracker, csv_path=None, txt_path=None):
+    """Write the holdings as CSV and/or a text report in one pass over one snapshot; return rows written"""
+    rows, total_value = tracker.holdings()
+    _, net_invested, trades = tracker.totals()
+
+    csv_file = open_text(csv_path, 'w') if csv_path else None
+    txt_file = open_text(txt_path, 'w') if txt_path else None
+    try:
+        writer = csv.writer(csv_file) if csv_file else None
+        if writer:
+            writer.writerow(HOLDINGS_COLUMNS)
+        lines = []
+        if txt_file:
+            lines += ["STOCK PORTFOLIO REPORT\n", "=" * 70 + "\n",
+                      f"Generated: {datetime.now().strftime(DATE_FORMAT)}\n\n",
+                      f"{'Stock':<8} {'Shares':<10} {'Price':<12} {'Avg Cost':<12} {'Total Value':<15} {'Weight':<8}\n",
+                      "-" * 70 + "\n"]
+
+        for chunk_start in range(0, len(rows), EXPORT_CHUNK_SIZE):
+            records = []
+            for symbol, quantity, price, value, cost_basis in rows[chunk_start:chunk_start + EXPORT_CHUNK_SIZE]:
+                weight = value / total_value * 100 if total_value else 0.0
+                average_cost = cost_basis / quantity
+                records.append((symbol, quantity, price, value, round(average_cost, 4), round(weight, 4)))
+                if txt_file:
+                    lines.append(f"{symbol:<8} {quantity:<10} ${price:<11.2f} ${average_cost:<11.2f} "
+                                 f"${value:<14.2f} {weight:.1f}%\n")
+            if writer:
+                writer.writerows(records)
+            if txt_file:
+                txt_file.write(''.join(lines))
+                lines.clear()
+
+        if writer:
+            writer.writerow(['', '', 'TOTAL PORTFOLIO VALUE:', total_value])
+        if txt_file:
+            gain = total_value - net_invested
+            txt_file.write(''.join([
+                "-" * 70 + "\n",
+                f"TOTAL PORTFOLIO VALUE: ${total_value:.2f}\n",
+                f"Net Amount Invested: ${net_invested:.2f}\n",
+                f"Unrealized Gain/Loss: ${gain:.2f}\n",
+                f"Holdings: {len(rows):,}  Transactions: {trades:,}\n"]))
+    finally:
+        for output in (csv_file, txt_file):
+            if output:
+                output.close()
+    return len(rows)
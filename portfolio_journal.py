@@ -0,0 +1,250 @@
+import os
+import struct
+import threading
+
+DEFAULT_JOURNAL_DIRECTORY = 'portfolio_data'
+JOURNAL_NAME = 'trades.journal'
+SNAPSHOT_NAME = 'portfolio.snapshot'
+
+# Journal record: epoch seconds, signed quantity (negative for a SELL), price and the
+# length of the UTF-8 symbol that follows
+TRADE = struct.Struct('<qqdB')
+
+# Snapshot: header, then one HOLDING plus symbol per position
+SNAPSHOT_MAGIC = b'PFSNAP01'
+SNAPSHOT_HEADER = struct.Struct('<8sQQddI')  # magic, journal offset, trades, invested, sold, holdings
+HOLDING = struct.Struct('<qddB')  # quantity, cost basis, last price, symbol length
+
+# Buffered journal bytes that force a write and fsync
+DEFAULT_SYNC_BYTES = 1 << 20
+
+# Seconds between background fsyncs; at most this much trading is lost in a crash
+DEFAULT_SYNC_INTERVAL = 0.5
+
+# Trades between snapshots
+DEFAULT_SNAPSHOT_EVERY = 100_000
+
+# Journal bytes read per chunk during replay
+READ_CHUNK_SIZE = 8 << 20
+
+
+def encode_trade(timestamp, change, price, symbol):
+    name = symbol.encode('utf-8')
+    return TRADE.pack(int(timestamp), change, price, len(name)) + name
+
+
+def iter_trades(journal_file, offset=0, stop=None):
+    """(timestamp, signed quantity, price, symbol, end offset) for each whole record from offset on
+
+    The file is read in chunks, so memory stays flat however long the journal is. A
+    torn record at the end (from a crash mid-write) is left out. With stop, records
+    that end after that offset are left out too.
+    """
+    names = {}  # decoded symbols, since the same few repeat throughout
+    header = TRADE.size
+    unpack_from = TRADE.unpack_from
+    journal_file.seek(offset)
+    data = b''
+    while True:
+        chunk = journal_file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        data += chunk
+        position, size = 0, len(data)
+        while position + header <= size:
+            timestamp, change, price, length = unpack_from(data, position)
+            end = position + header + length
+            if end > size:
+                break
+            if stop is not None and offset + end > stop:
+                return
+            raw = data[position + header:end]
+            symbol = names.get(raw)
+            if symbol is None:
+                symbol = names[raw] = raw.decode('utf-8')
+            yield timestamp, change, price, symbol, offset + end
+            position = end
+        # Carry a record split across chunks over to the next read
+        data = data[position:]
+        offset += position
+
+
+class TradeJournal:
+    def __init__(self, path, sync_bytes=DEFAULT_SYNC_BYTES, sync_interval=DEFAULT_SYNC_INTERVAL):
+        """Append-only file of trades with batched fsync
+
+        append() only adds to an in-memory buffer. The buffer is written and fsynced
+        when it passes sync_bytes or when the background thread's interval comes
+        round, so the cost of fsync is shared by every trade in the batch.
+        """
+        self.path = path
+        self.sync_bytes = sync_bytes
+        self._file = open(path, 'ab')
+        self.size = self._file.tell()  # bytes written, including the buffer
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+
+        self._closed = threading.Event()
+        self._syncer = None
+        if sync_interval:
+            self._syncer = threading.Thread(target=self._sync_forever, args=(sync_interval,), daemon=True)
+            self._syncer.start()
+
+    def append(self, timestamp, change, price, symbol):
+        record = encode_trade(timestamp, change, price, symbol)
+        with self._lock:
+            self._buffer += record
+            self.size += len(record)
+            if len(self._buffer) >= self.sync_bytes:
+                self._sync_locked()
+
+    def sync(self):
+        """Write and fsync everything appended so far"""
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if not self._buffer:
+            return
+        self._file.write(self._buffer)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._buffer.clear()
+
+    def _sync_forever(self, interval):
+        while not self._closed.wait(interval):
+            self.sync()
+
+    def close(self):
+        self._closed.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        self.sync()
+        self._file.close()
+
+
+def write_snapshot(path, journal_offset, trades, total_invested, total_sold, portfolio, cost_basis, prices):
+    """Write holdings and aggregates atomically; journal_offset is where replay resumes"""
+    parts = [SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, journal_offset, trades, total_invested, total_sold,
+                                  len(portfolio))]
+    for symbol, quantity in portfolio.items():
+        name = symbol.encode('utf-8')
+        parts.append(HOLDING.pack(quantity, cost_basis[symbol], prices[symbol], len(name)))
+        parts.append(name)
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as snapshot_file:
+        snapshot_file.write(b''.join(parts))
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path):
+    """(journal offset, trades, invested, sold, {symbol: (quantity, cost basis, price)}), or None if absent"""
+    try:
+        with open(path, 'rb') as snapshot_file:
+            data = snapshot_file.read()
+    except FileNotFoundError:
+        return None
+
+    magic, journal_offset, trades, total_invested, total_sold, count = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a portfolio snapshot")
+
+    holdings = {}
+    offset = SNAPSHOT_HEADER.size
+    for _ in range(count):
+        quantity, cost_basis, price, length = HOLDING.unpack_from(data, offset)
+        offset += HOLDING.size
+        holdings[data[offset:offset + length].decode('utf-8')] = (quantity, cost_basis, price)
+        offset += length
+    return journal_offset, trades, total_invested, total_sold, holdings
+
+
+class PortfolioStore:
+    def __init__(self, directory=DEFAULT_JOURNAL_DIRECTORY, snapshot_every=DEFAULT_SNAPSHOT_EVERY,
+                 sync_bytes=DEFAULT_SYNC_BYTES, sync_interval=DEFAULT_SYNC_INTERVAL):
+        """A trade journal plus periodic snapshots in one directory
+
+        Recovery loads the latest snapshot and replays only the journal written after
+        it, so rebuilding holdings depends on snapshot_every rather than on how long
+        the journal has grown. The journal is kept whole, since it is also the
+        transaction history.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self.snapshot_every = snapshot_every
+        self.sync_bytes = sync_bytes
+        self.sync_interval = sync_interval
+        self.journal = None
+        self.trades_since_snapshot = 0
+
+    def recover(self, tracker):
+        """Rebuild a tracker's holdings, aggregates and history; return the number of journal trades replayed
+
+        Trades before the snapshot only go back into the history, which is read
+        straight into the ledger; trades after it are replayed. Symbols the provider no
+        longer quotes keep their last traded price. A torn record at the end of the
+        journal is cut off before new trades are appended.
+        """
+        prices = tracker.stock_prices
+        quoted = set(prices)
+        snapshot = read_snapshot(self.snapshot_path)
+        journal_offset = 0
+        if snapshot is not None:
+            journal_offset, trades, tracker.total_invested, tracker.total_sold, holdings = snapshot
+            tracker.trades_before_history = trades
+            for symbol, (quantity, cost_basis, price) in holdings.items():
+                tracker.portfolio[symbol] = quantity
+                tracker.cost_basis[symbol] = cost_basis
+                prices.setdefault(symbol, price)
+
+        replayed = 0
+        end = journal_offset
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as journal_file:
+                history = tracker.portfolio_history
+                history.extend(trade[:4] for trade in iter_trades(journal_file, 0, journal_offset))
+                if snapshot is not None:
+                    tracker.trades_before_history = max(0, tracker.trades_before_history - len(history))
+                for timestamp, change, price, symbol, end in iter_trades(journal_file, journal_offset):
+                    if symbol not in quoted:
+                        prices[symbol] = price
+                    tracker.apply_trade(timestamp, change, price, symbol)
+                    replayed += 1
+            if os.path.getsize(self.journal_path) > end:
+                os.truncate(self.journal_path, end)
+
+        self.journal = TradeJournal(self.journal_path, self.sync_bytes, self.sync_interval)
+        self.trades_since_snapshot = replayed
+        return replayed
+
+    def record(self, tracker, timestamp, change, price, symbol):
+        """Journal one trade that the tracker has just applied, snapshotting when due"""
+        self.journal.append(timestamp, change, price, symbol)
+        self.trades_since_snapshot += 1
+        if self.trades_since_snapshot >= self.snapshot_every:
+            self.snapshot(tracker)
+
+    def record_trades(self, tracker, trades):
+        """Journal (timestamp, change, price, symbol) trades the tracker has just applied, snapshotting when due"""
+        append = self.journal.append
+        for timestamp, change, price, symbol in trades:
+            append(timestamp, change, price, symbol)
+        self.trades_since_snapshot += len(trades)
+        if self.trades_since_snapshot >= self.snapshot_every:
+            self.snapshot(tracker)
+
+    def snapshot(self, tracker):
+        """Write the tracker's current state; call with the tracker's lock held"""
+        self.journal.sync()
+        write_snapshot(self.snapshot_path, self.journal.size, tracker.trade_count, tracker.total_invested,
+                       tracker.total_sold, tracker.portfolio, tracker.cost_basis, tracker.stock_prices)
+        self.trades_since_snapshot = 0
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
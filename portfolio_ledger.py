@@ -0,0 +1,211 @@
+import operator
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from heapq import merge
+from itertools import accumulate, compress, islice
+
+# Action codes; a trade's quantity is stored multiplied by its code
+BUY = 1
+SELL = -1
+ACTION_CODES = {'BUY': BUY, 'SELL': SELL}
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Column attributes, in the order of the rows _row() builds
+COLUMNS = ('timestamps', 'symbol_column', 'quantities', 'prices', 'bought', 'sold')
+
+
+class SymbolTable:
+    def __init__(self):
+        """Symbols interned to small integer ids, numbered in order of first sight"""
+        self.names = []  # symbol id -> symbol
+        self.ids = {}  # symbol -> symbol id
+
+    def intern(self, symbol):
+        """Id for a symbol, assigning the next one on first sight"""
+        symbol_id = self.ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self.ids[symbol] = len(self.names)
+            self.names.append(symbol)
+        return symbol_id
+
+    def id_of(self, symbol):
+        """Id of a symbol seen before, or None"""
+        return self.ids.get(symbol)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, symbol_id):
+        return self.names[symbol_id]
+
+    def __iter__(self):
+        return iter(self.names)
+
+
+class TransactionLedger:
+    def __init__(self, lock=None):
+        """Trade history stored column by column in typed arrays
+
+        Symbols are interned to small integer ids, times are epoch seconds and
+        quantities are signed (negative for a SELL), so a trade costs 44 bytes instead
+        of a dict with a preformatted date string. Each trade's amount is also kept on
+        its own side, bought or sold, so totals are plain sums over whole columns, and
+        since trades are kept in time order, date ranges are found by bisecting the
+        timestamps.
+
+        Sums read the columns through memoryviews under lock, which must be the lock
+        trades are added under (the tracker passes its own), since an array cannot
+        grow while it is viewed.
+        """
+        self.lock = lock or threading.Lock()
+        self.symbols = SymbolTable()
+        self.timestamps = array('q')
+        self.symbol_column = array('I')
+        self.quantities = array('q')  # shares bought, or minus shares sold
+        self.prices = array('d')
+        self.bought = array('d')  # amount paid for a BUY, else 0.0
+        self.sold = array('d')  # amount received for a SELL, else 0.0
+
+    def _row(self, timestamp, change, price, symbol):
+        # Values of one trade in COLUMNS order
+        amount = abs(change) * price
+        return (int(timestamp), self.symbols.intern(symbol), change, price,
+                amount if change > 0 else 0.0, 0.0 if change > 0 else amount)
+
+    def _column_list(self):
+        return [getattr(self, name) for name in COLUMNS]
+
+    def append(self, timestamp, action, symbol, quantity, price):
+        """Add one trade; action is BUY or SELL and timestamp is epoch seconds
+
+        A trade older than the last one is inserted after the trades made at or
+        before its time, so the ledger stays in time order.
+        """
+        row = self._row(timestamp, action * quantity, price, symbol)
+        if not self.timestamps or row[0] >= self.timestamps[-1]:
+            for column, value in zip(self._column_list(), row):
+                column.append(value)
+            return
+        index = bisect_right(self.timestamps, row[0])
+        for column, value in zip(self._column_list(), row):
+            column.insert(index, value)
+
+    def extend(self, trades):
+        """Add (timestamp, signed quantity, price, symbol) trades in any order, as a journal holds them
+
+        Trades are appended as they come and the ledger is sorted once at the end if
+        any arrived out of time order, rather than inserting each one in place.
+        """
+        appends = [column.append for column in self._column_list()]
+        row = self._row
+        for trade in trades:
+            for append, value in zip(appends, row(*trade)):
+                append(value)
+
+        timestamps = self.timestamps
+        if any(map(operator.gt, timestamps, islice(timestamps, 1, None))):
+            order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+            for name, column in zip(COLUMNS, self._column_list()):
+                setattr(self, name, array(column.typecode, map(column.__getitem__, order)))
+
+    def merge(self, trades):
+        """Add (timestamp, signed quantity, price, symbol) trades given in time order
+
+        Only the trades newer than the first one added are rewritten, in one merge
+        pass, so a batch that continues the history costs no more than appending.
+        """
+        if not trades:
+            return
+        columns = self._column_list()
+        index = bisect_right(self.timestamps, int(trades[0][0]))
+        later = list(zip(*(column[index:] for column in columns)))
+        for column in columns:
+            del column[index:]
+        added = [self._row(*trade) for trade in trades]
+        for column, values in zip(columns, zip(*merge(later, added, key=operator.itemgetter(0)))):
+            column.extend(values)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        """One trade as the dict the tracker used to keep per transaction"""
+        change, price = self.quantities[index], self.prices[index]
+        return {
+            'date': datetime.fromtimestamp(self.timestamps[index]).strftime(DATE_FORMAT),
+            'action': 'BUY' if change > 0 else 'SELL',
+            'symbol': self.symbols[self.symbol_column[index]],
+            'quantity': abs(change),
+            'price': price,
+            'total': abs(change) * price
+        }
+
+    def rows(self, start=0, stop=None):
+        """(timestamp, action name, symbol, quantity, price, total) tuples for a slice of the ledger"""
+        # Slices are copies, so trades can still be appended while a caller iterates
+        symbols = self.symbols
+        for timestamp, symbol_id, change, price in zip(
+                self.timestamps[start:stop], self.symbol_column[start:stop],
+                self.quantities[start:stop], self.prices[start:stop]):
+            quantity = abs(change)
+            yield timestamp, 'BUY' if change > 0 else 'SELL', symbols[symbol_id], quantity, price, quantity * price
+
+    def date_range(self, start=None, end=None):
+        """(first, stop) indexes of trades with start <= timestamp <= end, by bisection"""
+        first = 0 if start is None else bisect_left(self.timestamps, int(start))
+        stop = len(self) if end is None else bisect_right(self.timestamps, int(end))
+        return first, max(first, stop)
+
+    def totals(self, start=0, stop=None):
+        """(amount bought, amount sold) over a slice of the ledger"""
+        with self.lock:
+            return sum(memoryview(self.bought)[start:stop]), sum(memoryview(self.sold)[start:stop])
+
+    def symbol_totals(self, symbol, start=0, stop=None):
+        """(net shares, amount bought, amount sold) of one symbol over a slice of the ledger"""
+        symbol_id = self.symbols.id_of(symbol)
+        if symbol_id is None:
+            return 0, 0.0, 0.0
+
+        with self.lock:
+            selected = list(map(symbol_id.__eq__, memoryview(self.symbol_column)[start:stop]))
+            return (sum(compress(memoryview(self.quantities)[start:stop], selected)),
+                    sum(compress(memoryview(self.bought)[start:stop], selected)),
+                    sum(compress(memoryview(self.sold)[start:stop], selected)))
+
+    def later_gain(self, symbol, timestamp):
+        """Most shares of a symbol that its trades after timestamp add, counted from any point after it
+
+        The position at any time after timestamp is the final position less the
+        shares added from then on, so a trade merged in at timestamp can sell at most
+        the final position less this without a later position going negative.
+        """
+        symbol_id = self.symbols.id_of(symbol)
+        if symbol_id is None:
+            return 0
+        with self.lock:
+            start = bisect_right(self.timestamps, int(timestamp))
+            selected = list(map(symbol_id.__eq__, memoryview(self.symbol_column)[start:]))
+            changes = list(compress(memoryview(self.quantities)[start:], selected))
+        return max(0, max(accumulate(reversed(changes)), default=0))
+
+    def net_shares(self):
+        """{symbol: shares held} replayed from the whole ledger"""
+        shares = [0] * len(self.symbols)
+        for symbol_id, change in zip(self.symbol_column, self.quantities):
+            shares[symbol_id] += change
+        return {self.symbols[symbol_id]: count for symbol_id, count in enumerate(shares) if count}
+
+    def count(self, action=None):
+        """Number of trades, or of trades with one action"""
+        if action is None:
+            return len(self)
+        return sum(map((0).__lt__ if action == BUY else (0).__gt__, self.quantities))
+
+    @property
+    def nbytes(self):
+        """Bytes held by the column buffers"""
+        return sum(column.itemsize * len(column) for column in self._column_list())
@@ -0,0 +1,279 @@
+import argparse
+import csv
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import accumulate, repeat
+from math import fsum, nan, sqrt
+from operator import add, mul, sub, truediv
+
+from portfolio_io import SYMBOL_PATTERN
+
+# Store layout, one file, all little-endian:
+#   header    magic, day count, symbol count, and the start of each section below
+#   calendar  int32 date ordinals of every trading day, in order
+#   closes    each symbol's float64 closes back to back, one per calendar day from its
+#             first quote to the last day; days without a quote repeat the last close
+#   index     per symbol: start (in closes), first calendar position, count, name length, name
+MAGIC = b'PFPS'
+HEADER = struct.Struct('<4sIIQQQ')
+INDEX_ENTRY = struct.Struct('<QIIB')
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def iter_price_file(path):
+    """(date ordinal, symbol, close) per row of a CSV with date, symbol and price (or close) columns"""
+    with open(path, newline='', encoding='utf-8-sig') as prices_file:
+        for row in csv.DictReader(prices_file):
+            close = row.get('close') or row.get('price')
+            yield (date.fromisoformat(row['date'][:10]).toordinal(), row['symbol'].strip().upper(), float(close))
+
+
+def build_price_store(rows, output_path):
+    """Write a store from (date ordinal, symbol, close) rows in date order; return (days, symbols)
+
+    Gaps in a symbol's quotes are filled with its previous close, so every column
+    is dense from the symbol's first quote to the end of the calendar.
+    """
+    days = array('i')
+    columns = {}  # symbol -> (first position, closes so far)
+    for day, symbol, close in rows:
+        if not days or day != days[-1]:
+            if days and day < days[-1]:
+                raise ValueError("Price rows must be in date order")
+            days.append(day)
+        position = len(days) - 1
+        column = columns.get(symbol)
+        if column is None:
+            if not SYMBOL_PATTERN.fullmatch(symbol):
+                raise ValueError(f"invalid symbol {symbol!r}")
+            columns[symbol] = (position, array('d', [close]))
+            continue
+        first, closes = column
+        missing = position - first - len(closes)
+        if missing >= 0:
+            closes.extend([closes[-1]] * missing)
+            closes.append(close)
+        else:
+            closes[-1] = close  # a repeated row for the same day; the last one wins
+
+    for first, closes in columns.values():
+        closes.extend([closes[-1]] * (len(days) - first - len(closes)))
+    write_price_store(output_path, days, columns)
+    return len(days), len(columns)
+
+
+def write_price_store(output_path, days, columns):
+    """Write a calendar of date ordinals and {symbol: (first position, closes)} to a store file"""
+    calendar_start = HEADER.size
+    closes_start = calendar_start + 4 * len(days)
+    closes_start += -closes_start % 8  # keep the float64 column aligned
+    index_start = closes_start + 8 * sum(len(closes) for _, closes in columns.values())
+
+    index = []
+    position = 0
+    for symbol, (first, closes) in columns.items():
+        name = symbol.encode('utf-8')
+        index.append(INDEX_ENTRY.pack(position, first, len(closes), len(name)) + name)
+        position += len(closes)
+
+    # Write under a temporary name so readers never see a half-built file
+    temp_path = output_path + '.tmp'
+    with open(temp_path, 'wb') as output:
+        output.write(HEADER.pack(MAGIC, len(days), len(columns), calendar_start, closes_start, index_start))
+        _write_column(output, array('i', days))
+        output.write(bytes(closes_start - output.tell()))
+        for _, closes in columns.values():
+            _write_column(output, closes)
+        output.write(b''.join(index))
+    os.replace(temp_path, output_path)
+
+
+def _write_column(output, column):
+    if sys.byteorder != 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    column.tofile(output)
+
+
+class PriceStore:
+    def __init__(self, path):
+        """Read-only, memory-mapped daily closes
+
+        Opening maps the file and reads only the symbol index. Closes are read through
+        memoryviews, so only the pages of the symbols and dates being analysed are
+        ever read in; decades of prices for thousands of symbols need not fit in memory.
+        """
+        if sys.byteorder != 'little':
+            raise OSError("Price stores are little-endian; this platform is not supported")
+
+        self.path = path
+        with open(path, 'rb') as store_file:
+            self._map = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, day_count, symbol_count, calendar_start, closes_start, index_start = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a price store")
+
+        view = memoryview(self._map)
+        self.days = view[calendar_start:calendar_start + 4 * day_count].cast('i')
+        self._closes = view[closes_start:index_start].cast('d')
+        self.columns = {}  # symbol -> (start in closes, first calendar position, count)
+        offset = index_start
+        for _ in range(symbol_count):
+            start, first, count, length = INDEX_ENTRY.unpack_from(self._map, offset)
+            offset += INDEX_ENTRY.size
+            self.columns[self._map[offset:offset + length].decode('utf-8')] = (start, first, count)
+            offset += length
+
+    def __len__(self):
+        return len(self.days)
+
+    def __contains__(self, symbol):
+        return symbol in self.columns
+
+    def closes(self, symbol):
+        """(first calendar position, memoryview of closes) for a symbol; KeyError if it has none"""
+        start, first, count = self.columns[symbol]
+        return first, self._closes[start:start + count]
+
+    def date_range(self, start=None, end=None):
+        """(first, stop) calendar positions of days with start <= day <= end, by bisection"""
+        first = 0 if start is None else bisect_left(self.days, start.toordinal())
+        stop = len(self) if end is None else bisect_right(self.days, end.toordinal())
+        return first, max(first, stop)
+
+    def date(self, position):
+        return date.fromordinal(self.days[position])
+
+    def value_series(self, holdings, start=None, end=None):
+        """(first position, array of daily values) of {symbol: shares} between two dates
+
+        The series starts on the first day every holding has a price. Each symbol adds
+        its slice of closes times its share count to the running total with one map().
+        """
+        first, stop = self.date_range(start, end)
+        columns = [(quantity, self.columns[symbol]) for symbol, quantity in holdings.items() if quantity]
+        first = max([first] + [column_first for _, (_, column_first, _) in columns])
+        if first >= stop:
+            return first, array('d')
+
+        values = [0.0] * (stop - first)
+        closes = self._closes
+        for quantity, (start, column_first, _) in columns:
+            offset = start - column_first
+            values = list(map(add, values, map(mul, closes[offset + first:offset + stop], repeat(quantity))))
+        return first, array('d', values)
+
+    def close(self):
+        # Views must be released before the mapping can be closed
+        for name in ('days', '_closes'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def daily_returns(values):
+    """Fractional change from each day to the next"""
+    return array('d', map(sub, map(truediv, values[1:], values[:-1]), repeat(1.0)))
+
+
+def annualized_volatility(returns, periods_per_year=TRADING_DAYS_PER_YEAR):
+    """Sample standard deviation of returns, scaled to a year"""
+    count = len(returns)
+    if count < 2:
+        return nan
+    mean = fsum(returns) / count
+    deviations = [value - mean for value in returns]
+    return sqrt(fsum(map(mul, deviations, deviations)) / (count - 1) * periods_per_year)
+
+
+def max_drawdown(values):
+    """(largest fall from a running peak as a fraction, peak index, trough index)"""
+    if not values:
+        return 0.0, 0, 0
+    peaks = list(accumulate(values, max))
+    drawdowns = list(map(truediv, values, peaks))
+    trough = min(range(len(drawdowns)), key=drawdowns.__getitem__)
+    # Running peaks never fall, so the peak was set where its value first appears
+    peak = bisect_left(peaks, peaks[trough], 0, trough + 1)
+    return 1.0 - drawdowns[trough], peak, trough
+
+
+def rolling_mean(series, window):
+    """Mean over each run of window consecutive values, from running sums"""
+    if len(series) < window:
+        return array('d')
+    sums = [0.0, *accumulate(series)]
+    return array('d', map(truediv, map(sub, sums[window:], sums[:-window]), repeat(window)))
+
+
+def rolling_volatility(returns, window, periods_per_year=TRADING_DAYS_PER_YEAR):
+    """Annualized volatility over each run of window returns, from running sums of returns and squares
+
+    Running sums are accurate here because daily returns are small and centred near
+    zero; a series with a large mean should be demeaned first.
+    """
+    if len(returns) < window or window < 2:
+        return array('d')
+    sums = [0.0, *accumulate(returns)]
+    squares = [0.0, *accumulate(map(mul, returns, returns))]
+    window_sums = list(map(sub, sums[window:], sums[:-window]))
+    window_squares = map(sub, squares[window:], squares[:-window])
+    scale = periods_per_year / (window - 1)
+    return array('d', (sqrt(max(0.0, (total_squares - total * total / window) * scale))
+                       for total, total_squares in zip(window_sums, window_squares)))
+
+
+def risk_summary(store, holdings, start=None, end=None):
+    """Return, volatility and drawdown of holdings over a date range as a dict, or None without prices
+
+    Symbols the store has no prices for are left out and listed under 'unpriced'.
+    """
+    priced = {symbol: quantity for symbol, quantity in holdings.items() if symbol in store}
+    first, values = store.value_series(priced, start, end)
+    if not priced or len(values) < 2:
+        return None
+    drawdown, peak, trough = max_drawdown(values)
+    return {
+        'days': len(values),
+        'start': store.date(first),
+        'end': store.date(first + len(values) - 1),
+        'return': values[-1] / values[0] - 1.0,
+        'volatility': annualized_volatility(daily_returns(values)),
+        'max_drawdown': drawdown,
+        'peak': store.date(first + peak),
+        'trough': store.date(first + trough),
+        'unpriced': sorted(set(holdings) - set(priced)),
+    }
+
+
+def main():
+    """Build a price store from a CSV of daily closes"""
+    parser = argparse.ArgumentParser(description="Build a memory-mapped store of daily closing prices")
+    parser.add_argument('input', help="CSV with date, symbol and price (or close) columns, in date order")
+    parser.add_argument('output', help="price store file to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    days, symbols = build_price_store(iter_price_file(args.input), args.output)
+    print(f"📦 Wrote {days:,} days of closes for {symbols:,} symbols to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import csv
+import random
+import threading
+import time
+
+# Starting prices (in USD) for the simulated feed
+DEFAULT_PRICES = {
+    "AAPL": 180.50,  # Apple
+    "TSLA": 250.75,  # Tesla
+    "GOOGL": 140.25,  # Google
+    "MSFT": 375.80,  # Microsoft
+    "AMZN": 145.30,  # Amazon
+    "META": 325.60,  # Meta (Facebook)
+    "NVDA": 450.20,  # NVIDIA
+    "NFLX": 425.40,  # Netflix
+    "AMD": 105.85,  # AMD
+    "INTC": 43.25  # Intel
+}
+
+# Standard deviation of each random-walk step, as a fraction of the price
+DEFAULT_VOLATILITY = 0.001
+
+# Ticks pulled from a provider per call
+DEFAULT_BATCH_SIZE = 1000
+
+# Prices never walk below this
+MIN_PRICE = 0.01
+
+
+class QuoteProvider:
+    """Source of prices: a starting quote per symbol, then a stream of (symbol, price) ticks"""
+
+    def prices(self):
+        """{symbol: price} for every symbol the provider quotes"""
+        raise NotImplementedError
+
+    def next_ticks(self, count):
+        """Up to count (symbol, price) updates; an empty list means the feed has ended"""
+        raise NotImplementedError
+
+
+class RandomWalkFeed(QuoteProvider):
+    def __init__(self, prices=None, volatility=DEFAULT_VOLATILITY, seed=None):
+        """Simulated market: each tick moves one random symbol by a small random step"""
+        self.current = dict(prices or DEFAULT_PRICES)
+        self.symbols = list(self.current)
+        self.volatility = volatility
+        self.rng = random.Random(seed)
+
+    def prices(self):
+        return dict(self.current)
+
+    def next_ticks(self, count):
+        current = self.current
+        gauss = self.rng.gauss
+        volatility = self.volatility
+        ticks = []
+        for symbol in self.rng.choices(self.symbols, k=count):
+            price = max(current[symbol] * (1.0 + gauss(0.0, volatility)), MIN_PRICE)
+            current[symbol] = price
+            ticks.append((symbol, price))
+        return ticks
+
+
+class CsvReplayFeed(QuoteProvider):
+    def __init__(self, path, loop=False):
+        """Replay ticks from a CSV file with 'symbol' and 'price' columns, in file order
+
+        Other columns (a date, say) are ignored. The first price of each symbol is its
+        starting quote; with loop=True the file starts over when it runs out.
+        """
+        self.path = path
+        self.loop = loop
+        self._file = None
+        self._rows = None
+        self._rows_since_open = 0
+
+    def _open(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, newline='')
+        self._rows = csv.DictReader(self._file)
+        self._rows_since_open = 0
+
+    def prices(self):
+        first = {}
+        with open(self.path, newline='') as quotes_file:
+            for row in csv.DictReader(quotes_file):
+                first.setdefault(row['symbol'].upper(), float(row['price']))
+        return first
+
+    def next_ticks(self, count):
+        if self._rows is None:
+            self._open()
+
+        ticks = []
+        while len(ticks) < count:
+            row = next(self._rows, None)
+            if row is None:
+                # An empty file would otherwise loop forever
+                if not self.loop or not self._rows_since_open:
+                    break
+                self._open()
+                continue
+            self._rows_since_open += 1
+            ticks.append((row['symbol'].upper(), float(row['price'])))
+        return ticks
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class QuoteFeed(threading.Thread):
+    def __init__(self, tracker, provider, ticks_per_second=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Pull ticks from a provider in the background and apply them to a tracker
+
+        Without ticks_per_second the feed runs as fast as the provider and tracker
+        allow; otherwise batches are paced to that rate.
+        """
+        super().__init__(daemon=True)
+        self.tracker = tracker
+        self.provider = provider
+        self.ticks_per_second = ticks_per_second
+        self.batch_size = batch_size
+        self.ticks = 0
+        self._stopped = threading.Event()
+
+    def run(self):
+        batch_size = self.batch_size
+        if self.ticks_per_second:
+            batch_size = max(1, min(batch_size, int(self.ticks_per_second / 10)))
+        start = time.perf_counter()
+        while not self._stopped.is_set():
+            ticks = self.provider.next_ticks(batch_size)
+            if not ticks:
+                break
+            self.tracker.apply_ticks(ticks)
+            self.ticks += len(ticks)
+
+            if self.ticks_per_second:
+                # Sleep until the schedule catches up with the ticks sent so far
+                delay = start + self.ticks / self.ticks_per_second - time.perf_counter()
+                if delay > 0 and self._stopped.wait(delay):
+                    break
+
+    def stop(self):
+        self._stopped.set()
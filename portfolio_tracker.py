@@ -1,27 +1,206 @@
-import csv
+import argparse
 import os
+import threading
+import time
 from datetime import datetime
 
+from portfolio_io import import_trades, write_history, write_holdings
+from portfolio_journal import DEFAULT_JOURNAL_DIRECTORY, PortfolioStore
+from portfolio_ledger import BUY, DATE_FORMAT, SELL, TransactionLedger
+from portfolio_prices import PriceStore, risk_summary
+from portfolio_quotes import DEFAULT_VOLATILITY, CsvReplayFeed, QuoteFeed, RandomWalkFeed
+
+# Ticks between exact recomputations of the running portfolio value, which
+# keeps floating-point error from the per-tick updates from building up
+RESYNC_TICKS = 1_000_000
+
+# Pace of the live feed in the interactive tracker
+DEFAULT_TICKS_PER_SECOND = 20
+
 
 class StockPortfolioTracker:
-    def __init__(self):
-        """Initialize the portfolio tracker with predefined stock prices"""
-        # Hardcoded stock prices (in USD)
-        self.stock_prices = {
-            "AAPL": 180.50,  # Apple
-            "TSLA": 250.75,  # Tesla
-            "GOOGL": 140.25,  # Google
-            "MSFT": 375.80,  # Microsoft
-            "AMZN": 145.30,  # Amazon
-            "META": 325.60,  # Meta (Facebook)
-            "NVDA": 450.20,  # NVIDIA
-            "NFLX": 425.40,  # Netflix
-            "AMD": 105.85,  # AMD
-            "INTC": 43.25  # Intel
-        }
+    def __init__(self, provider=None):
+        """Initialize the portfolio tracker with prices from a quote provider
+
+        The provider defaults to a simulated random-walk feed over ten well-known
+        stocks. The portfolio's market value, amounts bought and sold, and each
+        holding's cost basis are running totals, adjusted by each trade and price tick
+        instead of recomputed from the holdings or the transaction history.
+        """
+        self.provider = provider or RandomWalkFeed()
+        self.stock_prices = self.provider.prices()  # Latest price per symbol (in USD)
 
         self.portfolio = {}  # User's portfolio: {stock_symbol: quantity}
-        self.portfolio_history = []  # Track all transactions
+        # Held while prices, holdings or history change; reentrant since the ledger's sums take it too
+        self._lock = threading.RLock()
+        self.portfolio_history = TransactionLedger(self._lock)  # Track all transactions
+        self.market_value = 0.0  # Sum of quantity * price over the portfolio
+        self.total_invested = 0.0  # Sum of every BUY total
+        self.total_sold = 0.0  # Sum of every SELL total
+        self.cost_basis = {}  # {stock_symbol: cost of the shares still held, at average cost}
+        self.trades_before_history = 0  # Trades in a snapshot whose journal records are gone
+        self.ticks = 0
+        self.feed = None
+        self.store = None  # PortfolioStore journaling every trade, if any
+        self.price_store = None  # PriceStore of daily closes for historical analytics, if any
+
+    def apply_ticks(self, ticks):
+        """Apply (symbol, price) updates, adjusting the market value by each held symbol's change"""
+        prices = self.stock_prices
+        portfolio = self.portfolio
+        with self._lock:
+            value = self.market_value
+            for symbol, price in ticks:
+                quantity = portfolio.get(symbol)
+                if quantity:
+                    value += (price - prices[symbol]) * quantity
+                prices[symbol] = price
+            self.market_value = value
+
+            before = self.ticks
+            self.ticks += len(ticks)
+            if self.ticks // RESYNC_TICKS != before // RESYNC_TICKS:
+                self._resync_market_value()
+
+    def _resync_market_value(self):
+        self.market_value = sum(quantity * self.stock_prices[symbol] for symbol, quantity in self.portfolio.items())
+
+    def start_feed(self, ticks_per_second=DEFAULT_TICKS_PER_SECOND):
+        """Stream prices from the provider in a background thread"""
+        self.feed = QuoteFeed(self, self.provider, ticks_per_second)
+        self.feed.start()
+        return self.feed
+
+    def stop_feed(self):
+        if self.feed is not None:
+            self.feed.stop()
+            self.feed.join()
+            self.feed = None
+
+    def open_store(self, store):
+        """Recover holdings from a PortfolioStore, then journal every trade to it; return trades replayed"""
+        with self._lock:
+            replayed = store.recover(self)
+            self._resync_market_value()
+            self.store = store
+        return replayed
+
+    def close_store(self):
+        """Snapshot and close the store, so the next start has no journal to replay"""
+        with self._lock:
+            if self.store is not None:
+                self.store.snapshot(self)
+                self.store.close()
+                self.store = None
+
+    @property
+    def trade_count(self):
+        """Trades ever made, including those from before a recovered snapshot"""
+        return self.trades_before_history + len(self.portfolio_history)
+
+    def apply_trade(self, timestamp, change, price, symbol):
+        """Apply a trade of change shares (negative for a SELL) and return its amount
+
+        Shared by buy(), sell() and journal replay; the caller has checked the trade
+        and, outside of recovery, holds the lock.
+        """
+        amount = self._change_holdings(change, price, symbol)
+        self.portfolio_history.append(timestamp, BUY if change > 0 else SELL, symbol, abs(change), price)
+        return amount
+
+    def _change_holdings(self, change, price, symbol):
+        # Holdings and running totals for one trade, without recording it in the history
+        quantity = abs(change)
+        amount = quantity * price
+        if change > 0:
+            self.portfolio[symbol] = self.portfolio.get(symbol, 0) + quantity
+            self.cost_basis[symbol] = self.cost_basis.get(symbol, 0.0) + amount
+            self.market_value += amount
+            self.total_invested += amount
+            return amount
+
+        held = self.portfolio[symbol]
+        self.market_value -= amount
+        self.total_sold += amount
+        if quantity == held:
+            del self.portfolio[symbol]
+            del self.cost_basis[symbol]
+        else:
+            self.portfolio[symbol] = held - quantity
+            self.cost_basis[symbol] *= (held - quantity) / held  # average cost per share is unchanged
+        if not self.portfolio:
+            self.market_value = 0.0  # drop any rounding left in the running total
+        return amount
+
+    def _trade(self, symbol, change):
+        price = self.stock_prices[symbol]
+        timestamp = int(time.time())
+        history = self.portfolio_history
+        if len(history) and timestamp < history.timestamps[-1]:
+            timestamp = history.timestamps[-1]  # the clock stepped back; keep the history in order
+        amount = self.apply_trade(timestamp, change, price, symbol)
+        if self.store is not None:
+            self.store.record(self, timestamp, change, price, symbol)
+        return amount
+
+    def buy(self, symbol, quantity):
+        """Buy shares at the current price, update the running totals and return the amount paid"""
+        with self._lock:
+            return self._trade(symbol, quantity)
+
+    def sell(self, symbol, quantity):
+        """Sell shares at the current price, update the running totals and return the amount received"""
+        with self._lock:
+            held = self.portfolio.get(symbol, 0)
+            if not 0 < quantity <= held:
+                raise ValueError(f"Cannot sell {quantity} of {held} {symbol} shares")
+            return self._trade(symbol, -quantity)
+
+    def apply_trades(self, trades):
+        """Apply imported (line number, timestamp, change, price, symbol) trades under one lock
+
+        Trades must be in time order among themselves; ones older than trades already
+        in the history are merged into place. Trades that sell more than is held at
+        their time, or more than later trades in the history still need, are refused;
+        (line number, message) is returned for each. Unknown symbols are valued at
+        their trade price until the feed quotes them.
+        """
+        refused, accepted = [], []
+        history = self.portfolio_history
+        with self._lock:
+            prices, portfolio, store = self.stock_prices, self.portfolio, self.store
+            last = history.timestamps[-1] if len(history) else None
+            for line_number, timestamp, change, price, symbol in trades:
+                if change < 0:
+                    held = portfolio.get(symbol, 0)
+                    if last is not None and timestamp < last:
+                        held -= history.later_gain(symbol, timestamp)
+                    if -change > held:
+                        refused.append((line_number, f"cannot sell {-change} of {max(held, 0)} {symbol} shares"))
+                        continue
+                if symbol not in prices:
+                    prices[symbol] = price
+                self._change_holdings(change, price, symbol)
+                accepted.append((timestamp, change, price, symbol))
+            history.merge(accepted)
+            if store is not None:
+                store.record_trades(self, accepted)
+            # Trades were made at their own prices; value the holdings at current ones
+            self._resync_market_value()
+        return refused
+
+    def holdings(self):
+        """(rows, total value) from one consistent snapshot; rows are (symbol, quantity, price, value, cost basis)"""
+        with self._lock:
+            rows = [(symbol, quantity, self.stock_prices[symbol], quantity * self.stock_prices[symbol],
+                     self.cost_basis[symbol])
+                    for symbol, quantity in self.portfolio.items()]
+            return rows, self.market_value
+
+    def totals(self):
+        """(market value, net amount invested, transactions) from one consistent snapshot"""
+        with self._lock:
+            return self.market_value, self.total_invested - self.total_sold, self.trade_count
 
     def display_available_stocks(self):
         """Display all available stocks with their current prices"""
@@ -43,7 +222,8 @@ class StockPortfolioTracker:
             "INTC": "Intel"
         }
 
-        for symbol, price in self.stock_prices.items():
+        # A copy, since the feed thread may add symbols while this prints
+        for symbol, price in list(self.stock_prices.items()):
             company = stock_info.get(symbol, "Unknown")
             print(f"{symbol:<12} {company:<15} ${price:<11.2f}")
 
@@ -67,25 +247,8 @@ class StockPortfolioTracker:
                     print("❌ Please enter a positive number of shares.")
                     continue
 
-                # Add to portfolio
-                if stock_symbol in self.portfolio:
-                    self.portfolio[stock_symbol] += quantity
-                else:
-                    self.portfolio[stock_symbol] = quantity
-
-                # Calculate investment amount
-                investment = quantity * self.stock_prices[stock_symbol]
-
-                # Record transaction
-                transaction = {
-                    'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'action': 'BUY',
-                    'symbol': stock_symbol,
-                    'quantity': quantity,
-                    'price': self.stock_prices[stock_symbol],
-                    'total': investment
-                }
-                self.portfolio_history.append(transaction)
+                # Add to portfolio at the current price
+                investment = self.buy(stock_symbol, quantity)
 
                 print(f"✅ Successfully added {quantity} shares of {stock_symbol}")
                 print(f"💰 Investment amount: ${investment:.2f}")
@@ -120,24 +283,8 @@ class StockPortfolioTracker:
                     print(f"❌ Please enter a number between 1 and {max_shares}.")
                     continue
 
-                # Calculate sell amount
-                sell_amount = quantity * self.stock_prices[stock_symbol]
-
-                # Update portfolio
-                self.portfolio[stock_symbol] -= quantity
-                if self.portfolio[stock_symbol] == 0:
-                    del self.portfolio[stock_symbol]
-
-                # Record transaction
-                transaction = {
-                    'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'action': 'SELL',
-                    'symbol': stock_symbol,
-                    'quantity': quantity,
-                    'price': self.stock_prices[stock_symbol],
-                    'total': sell_amount
-                }
-                self.portfolio_history.append(transaction)
+                # Update portfolio at the current price
+                sell_amount = self.sell(stock_symbol, quantity)
 
                 print(f"✅ Successfully sold {quantity} shares of {stock_symbol}")
                 print(f"💰 Sell amount: ${sell_amount:.2f}")
@@ -153,34 +300,21 @@ class StockPortfolioTracker:
             return
 
         print("\n📈 Your Current Portfolio:")
-        print("-" * 70)
-        print(f"{'Stock':<8} {'Shares':<8} {'Price':<12} {'Total Value':<15} {'Weight':<10}")
-        print("-" * 70)
-
-        total_portfolio_value = 0
-        portfolio_details = []
+        print("-" * 83)
+        print(f"{'Stock':<8} {'Shares':<8} {'Price':<12} {'Avg Cost':<12} {'Total Value':<15} {'Weight':<10}")
+        print("-" * 83)
 
-        for symbol, quantity in self.portfolio.items():
-            price = self.stock_prices[symbol]
-            total_value = quantity * price
-            total_portfolio_value += total_value
-
-            portfolio_details.append({
-                'symbol': symbol,
-                'quantity': quantity,
-                'price': price,
-                'total_value': total_value
-            })
+        rows, total_portfolio_value = self.holdings()
 
         # Display each stock with weight percentage
-        for stock in portfolio_details:
-            weight = (stock['total_value'] / total_portfolio_value) * 100
-            print(f"{stock['symbol']:<8} {stock['quantity']:<8} ${stock['price']:<11.2f} "
-                  f"${stock['total_value']:<14.2f} {weight:<9.1f}%")
+        for symbol, quantity, price, total_value, cost_basis in rows:
+            weight = (total_value / total_portfolio_value) * 100
+            print(f"{symbol:<8} {quantity:<8} ${price:<11.2f} ${cost_basis / quantity:<11.2f} "
+                  f"${total_value:<14.2f} {weight:<9.1f}%")
 
-        print("-" * 70)
-        print(f"{'TOTAL PORTFOLIO VALUE:':<45} ${total_portfolio_value:.2f}")
-        print("-" * 70)
+        print("-" * 83)
+        print(f"{'TOTAL PORTFOLIO VALUE:':<58} ${total_portfolio_value:.2f}")
+        print("-" * 83)
 
     def calculate_portfolio_summary(self):
         """Calculate and display portfolio summary statistics"""
@@ -188,18 +322,17 @@ class StockPortfolioTracker:
             print("❌ Your portfolio is empty!")
             return
 
-        total_value = sum(quantity * self.stock_prices[symbol]
-                          for symbol, quantity in self.portfolio.items())
-
-        total_invested = sum(t['total'] for t in self.portfolio_history if t['action'] == 'BUY')
-        total_sold = sum(t['total'] for t in self.portfolio_history if t['action'] == 'SELL')
-
+        # Amounts are summed from the ledger, so the summary reflects the whole history
+        with self._lock:
+            total_value, trades = self.market_value, self.trade_count
+            total_invested, total_sold = self.portfolio_history.totals()
         net_invested = total_invested - total_sold
         unrealized_gain_loss = total_value - net_invested
 
         print("\n📊 Portfolio Summary:")
         print("-" * 40)
         print(f"Total Stocks Owned: {len(self.portfolio)}")
+        print(f"Transactions: {trades:,}")
         print(f"Current Portfolio Value: ${total_value:.2f}")
         print(f"Total Amount Invested: ${net_invested:.2f}")
         print(f"Unrealized Gain/Loss: ${unrealized_gain_loss:.2f}")
@@ -207,9 +340,30 @@ class StockPortfolioTracker:
             roi_percentage = (unrealized_gain_loss / net_invested) * 100
             print(f"Return on Investment: {roi_percentage:.2f}%")
 
-    def view_transaction_history(self):
-        """Display all transaction history"""
-        if not self.portfolio_history:
+        if self.price_store is not None:
+            self.display_risk_summary()
+
+    def display_risk_summary(self):
+        """Display how the current holdings would have fared over the stored price history"""
+        with self._lock:
+            holdings = dict(self.portfolio)
+        risk = risk_summary(self.price_store, holdings)
+        if risk is None:
+            print("❌ No price history for these holdings!")
+            return
+
+        print(f"\n📉 Current Holdings Over History ({risk['start']} to {risk['end']}):")
+        print("-" * 40)
+        print(f"Total Return: {risk['return'] * 100:.2f}%")
+        print(f"Annualized Volatility: {risk['volatility'] * 100:.2f}%")
+        print(f"Max Drawdown: {risk['max_drawdown'] * 100:.2f}% ({risk['peak']} to {risk['trough']})")
+        if risk['unpriced']:
+            print(f"No history for: {', '.join(risk['unpriced'])}")
+
+    def view_transaction_history(self, start=None, end=None):
+        """Display transaction history, optionally only trades between two epoch times"""
+        first, stop = self.portfolio_history.date_range(start, end)
+        if first == stop:
             print("❌ No transactions found!")
             return
 
@@ -218,64 +372,68 @@ class StockPortfolioTracker:
         print(f"{'Date':<20} {'Action':<6} {'Symbol':<8} {'Shares':<8} {'Price':<12} {'Total':<12}")
         print("-" * 80)
 
-        for transaction in self.portfolio_history:
-            print(f"{transaction['date']:<20} {transaction['action']:<6} "
-                  f"{transaction['symbol']:<8} {transaction['quantity']:<8} "
-                  f"${transaction['price']:<11.2f} ${transaction['total']:<11.2f}")
+        last_timestamp = date = None
+        for timestamp, action, symbol, quantity, price, total in self.portfolio_history.rows(first, stop):
+            # Trades often share a second, so the date is only formatted when it changes
+            if timestamp != last_timestamp:
+                last_timestamp, date = timestamp, datetime.fromtimestamp(timestamp).strftime(DATE_FORMAT)
+            print(f"{date:<20} {action:<6} {symbol:<8} {quantity:<8} ${price:<11.2f} ${total:<11.2f}")
 
-    def save_portfolio_to_file(self):
-        """Save portfolio to CSV and TXT files"""
+    def save_portfolio_to_file(self, compress=False):
+        """Save portfolio to CSV and TXT files, written together in one pass"""
         if not self.portfolio:
             print("❌ Your portfolio is empty! Nothing to save.")
             return
 
         # Create filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = '.gz' if compress else ''
+        csv_filename = f"portfolio_{timestamp}.csv{suffix}"
+        txt_filename = f"portfolio_{timestamp}.txt{suffix}"
 
-        # Save to CSV
-        csv_filename = f"portfolio_{timestamp}.csv"
         try:
-            with open(csv_filename, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(['Stock Symbol', 'Quantity', 'Price per Share', 'Total Value'])
-
-                total_value = 0
-                for symbol, quantity in self.portfolio.items():
-                    price = self.stock_prices[symbol]
-                    stock_total = quantity * price
-                    total_value += stock_total
-                    writer.writerow([symbol, quantity, price, stock_total])
-
-                writer.writerow(['', '', 'TOTAL PORTFOLIO VALUE:', total_value])
-
+            write_holdings(self, csv_filename, txt_filename)
             print(f"✅ Portfolio saved to CSV: {csv_filename}")
-        except Exception as e:
-            print(f"❌ Error saving CSV: {e}")
+            print(f"✅ Portfolio saved to TXT: {txt_filename}")
+        except OSError as e:
+            print(f"❌ Error saving portfolio: {e}")
 
-        # Save to TXT
-        txt_filename = f"portfolio_{timestamp}.txt"
+    def import_trades_from_file(self):
+        """Import trades from a CSV or JSONL file"""
+        path = input("\nEnter path of a CSV or JSONL trade file (.gz is fine): ").strip()
+        if not path:
+            return
+
+        start = time.perf_counter()
         try:
-            with open(txt_filename, 'w') as txtfile:
-                txtfile.write("STOCK PORTFOLIO REPORT\n")
-                txtfile.write("=" * 50 + "\n")
-                txtfile.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            imported, rejected, errors = import_trades(self, path)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error importing trades: {e}")
+            return
+        elapsed = time.perf_counter() - start
 
-                txtfile.write(f"{'Stock':<8} {'Shares':<8} {'Price':<12} {'Total Value':<15}\n")
-                txtfile.write("-" * 50 + "\n")
+        print(f"✅ Imported {imported:,} trades in {elapsed:.2f}s")
+        if rejected:
+            print(f"⚠️  Rejected {rejected:,} rows:")
+            for line_number, message in errors:
+                print(f"   line {line_number}: {message}")
 
-                total_value = 0
-                for symbol, quantity in self.portfolio.items():
-                    price = self.stock_prices[symbol]
-                    stock_total = quantity * price
-                    total_value += stock_total
-                    txtfile.write(f"{symbol:<8} {quantity:<8} ${price:<11.2f} ${stock_total:<14.2f}\n")
+    def export_transaction_history(self):
+        """Export the transaction history to a CSV file"""
+        if not len(self.portfolio_history):
+            print("❌ No transactions found!")
+            return
 
-                txtfile.write("-" * 50 + "\n")
-                txtfile.write(f"TOTAL PORTFOLIO VALUE: ${total_value:.2f}\n")
+        path = input("\nEnter file to export to (end in .gz to compress): ").strip()
+        if not path:
+            return
 
-            print(f"✅ Portfolio saved to TXT: {txt_filename}")
-        except Exception as e:
-            print(f"❌ Error saving TXT: {e}")
+        try:
+            rows = write_history(self, path)
+        except OSError as e:
+            print(f"❌ Error exporting history: {e}")
+            return
+        print(f"✅ Exported {rows:,} transactions to {path}")
 
     def run(self):
         """Main program loop"""
@@ -293,9 +451,11 @@ class StockPortfolioTracker:
             print("5. 📊 Portfolio Summary")
             print("6. 📋 Transaction History")
             print("7. 💾 Save Portfolio to File")
-            print("8. 🚪 Exit")
+            print("8. 📥 Import Trades from File")
+            print("9. 📤 Export Transaction History")
+            print("10. 🚪 Exit")
 
-            choice = input("\nEnter your choice (1-8): ").strip()
+            choice = input("\nEnter your choice (1-10): ").strip()
 
             if choice == '1':
                 self.display_available_stocks()
@@ -312,19 +472,61 @@ class StockPortfolioTracker:
             elif choice == '7':
                 self.save_portfolio_to_file()
             elif choice == '8':
+                self.import_trades_from_file()
+            elif choice == '9':
+                self.export_transaction_history()
+            elif choice == '10':
                 print("\n💼 Thank you for using Stock Portfolio Tracker!")
                 print("Happy investing! 📈")
                 break
             else:
-                print("❌ Invalid choice! Please enter a number between 1-8.")
+                print("❌ Invalid choice! Please enter a number between 1-10.")
 
             input("\nPress Enter to continue...")
 
 
 def main():
     """Main function to run the stock portfolio tracker"""
-    tracker = StockPortfolioTracker()
-    tracker.run()
+    parser = argparse.ArgumentParser(description="Track a stock portfolio against live prices")
+    parser.add_argument('--replay', help="CSV of symbol,price ticks to replay instead of the simulated feed")
+    parser.add_argument('--ticks-per-second', type=float, default=DEFAULT_TICKS_PER_SECOND,
+                        help="0 keeps prices fixed")
+    parser.add_argument('--volatility', type=float, default=DEFAULT_VOLATILITY,
+                        help="random-walk step size as a fraction of the price")
+    parser.add_argument('--seed', type=int, help="seed the simulated feed")
+    parser.add_argument('--data', default=DEFAULT_JOURNAL_DIRECTORY,
+                        help="directory for the trade journal and snapshots")
+    parser.add_argument('--no-journal', action='store_true', help="keep trades in memory only")
+    parser.add_argument('--prices', help="price store built by portfolio_prices.py, for historical risk figures")
+    parser.add_argument('--import', dest='imports', action='append', default=[], metavar='FILE',
+                        help="CSV or JSONL trade file to import at startup; may be repeated")
+    args = parser.parse_args()
+
+    if args.replay:
+        provider = CsvReplayFeed(args.replay, loop=True)
+    else:
+        provider = RandomWalkFeed(volatility=args.volatility, seed=args.seed)
+
+    tracker = StockPortfolioTracker(provider)
+    if args.prices:
+        tracker.price_store = PriceStore(args.prices)
+    if not args.no_journal:
+        replayed = tracker.open_store(PortfolioStore(args.data))
+        if tracker.portfolio:
+            print(f"📂 Restored {len(tracker.portfolio)} holdings from {args.data} "
+                  f"({replayed:,} journaled trades replayed)")
+    try:
+        for path in args.imports:
+            imported, rejected, _ = import_trades(tracker, path)
+            print(f"📥 Imported {imported:,} trades from {path} ({rejected:,} rows rejected)")
+        if args.ticks_per_second > 0:
+            tracker.start_feed(args.ticks_per_second)
+        tracker.run()
+    finally:
+        tracker.stop_feed()
+        tracker.close_store()
+        if tracker.price_store is not None:
+            tracker.price_store.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+import json
+import random
+import re
+
+import pytest
+
+from chatbot import BasicChatbot
+
+MESSAGES = [
+    "Hello",
+    "hi there, how are you?",
+    "What's your name?",
+    "How old are you?",
+    "What can you do?",
+    "Tell me about programming",
+    "Thank you so much",
+    "Goodbye",
+    "thanks, bye!",
+    "is it going to be sunny tomorrow",
+    "the quick brown fox jumps over the lazy dog",
+    "can you help me write some python code",
+    "see you later",
+    "what's up",
+    "this",
+    "hithere",
+    "say hi",
+    "good   morning",
+    "",
+]
+
+
+def legacy_match_category(bot, cleaned_input):
+    """The per-category re.search loop the keyword index replaced"""
+    for category, data in bot.responses.items():
+        for pattern in data['patterns']:
+            if re.search(pattern, cleaned_input):
+                return category
+    return None
+
+
+def shuffled_words(count, seed=3):
+    """Messages made of the intents' own words in random order, so many match by accident"""
+    bot = BasicChatbot(cache_size=0)
+    words = sorted(set(re.findall(r"[a-z']+", ' '.join(
+        pattern for data in bot.responses.values() for pattern in data['patterns']))))
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(1, 6))) for _ in range(count)]
+
+
+@pytest.mark.parametrize('message', MESSAGES + shuffled_words(500))
+def test_indexed_matcher_agrees_with_regex_loop(message):
+    bot = BasicChatbot(cache_size=0)
+    cleaned = bot.clean_input(message)
+    expected = legacy_match_category(bot, cleaned)
+    assert bot.match_category(cleaned) == expected
+    assert bot.classify(message).category == expected
+
+
+def test_indexed_matcher_agrees_on_a_custom_intents_file(tmp_path):
+    intents = {
+        'bot_name': 'TestBot',
+        'intents': [
+            {'name': 'order', 'patterns': [r'\b(track|where is) my (order|parcel)\b'], 'replies': ["On its way"]},
+            {'name': 'refund', 'patterns': [r'\brefunds?\b', r'money back'], 'replies': ["Sure"]},
+            {'name': 'digits', 'patterns': [r'\border \d+\b'], 'replies': ["Looking"]},
+        ],
+        'default_responses': ["Sorry?"],
+    }
+    path = tmp_path / 'intents.json'
+    path.write_text(json.dumps(intents), encoding='utf-8')
+    bot = BasicChatbot(str(path), cache_size=0)
+    for message in ["where is my parcel", "track my order 12", "order 42 please", "I want my money back",
+                    "refunds", "refundable", "my order", "where is my order refund"]:
+        cleaned = bot.clean_input(message)
+        assert bot.match_category(cleaned) == legacy_match_category(bot, cleaned), message
+
+
+def test_cache_returns_the_same_classification():
+    def fields(result):
+        return result.category, result.span, result.terminate, result.terminate_span
+
+    cached = BasicChatbot(cache_size=16)
+    uncached = BasicChatbot(cache_size=0)
+    for message in MESSAGES * 2:
+        assert fields(cached.classify(message)) == fields(uncached.classify(message))
+
+
+@pytest.mark.parametrize('message', ["this is bold", "my node server", "the leaves are falling",
+                                     "she told me a long story"])
+def test_fuzzy_fallback_leaves_real_words_alone(message):
+    assert BasicChatbot(cache_size=0, fuzzy=True).classify(message).category is None
+
+
+@pytest.mark.parametrize('message, category', [("whats the wether like", 'weather'),
+                                               ("i love programing", 'programming'),
+                                               ("farewel", 'goodbye')])
+def test_fuzzy_fallback_corrects_typos(message, category):
+    assert BasicChatbot(cache_size=0, fuzzy=True).classify(message).category == category
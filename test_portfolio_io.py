@@ -0,0 +1,126 @@
+import gzip
+import math
+
+import pytest
+
+from portfolio_io import TradeParser, import_trades, read_trades
+from portfolio_ledger import BUY, SELL
+from portfolio_tracker import StockPortfolioTracker
+
+HEADER = "date,action,symbol,quantity,price\n"
+
+
+def write(path, text, encoding='utf-8'):
+    path.write_text(text, encoding=encoding)
+    return str(path)
+
+
+def read_all(path, chunk_size=1000):
+    trades, rejected = [], []
+    for chunk_trades, chunk_rejected in read_trades(path, chunk_size):
+        trades += chunk_trades
+        rejected += chunk_rejected
+    return trades, rejected
+
+
+@pytest.mark.parametrize('quantity, shares', [(10, 10), ("10", 10), ("10.0", 10), (10.0, 10), (" 7 ", 7)])
+def test_parser_accepts_whole_quantities(quantity, shares):
+    assert TradeParser().parse('BUY', 'aapl', quantity, '1.5', 60) == (60, shares, 1.5, 'AAPL')
+
+
+@pytest.mark.parametrize('quantity', [10.5, "10.5", True, False, 0, "0", -3, "-3", math.inf, "inf", math.nan])
+def test_parser_refuses_quantities_that_are_not_positive_whole_numbers(quantity):
+    with pytest.raises(ValueError, match="positive whole number"):
+        TradeParser().parse('BUY', 'AAPL', quantity, 1.0, 60)
+
+
+@pytest.mark.parametrize('action, symbol, price, message', [
+    ('HOLD', 'AAPL', 1.0, "BUY or SELL"),
+    (None, 'AAPL', 1.0, "BUY or SELL"),
+    ('BUY', 'not a symbol', 1.0, "invalid symbol"),
+    ('BUY', '', 1.0, "invalid symbol"),
+    ('BUY', None, 1.0, "invalid symbol"),
+    ('BUY', 'AAPL', 0, "price must be positive"),
+    ('BUY', 'AAPL', -1, "price must be positive"),
+    ('BUY', 'AAPL', 'inf', "price must be positive"),
+    ('BUY', 'AAPL', 'nan', "price must be positive"),
+])
+def test_parser_refuses_bad_values(action, symbol, price, message):
+    with pytest.raises(ValueError, match=message):
+        TradeParser().parse(action, symbol, 1, price, 60)
+
+
+def test_parser_signs_sells_and_reads_iso_dates():
+    parse = TradeParser().parse
+    assert parse('sell', 'MSFT', 2, 3.0, '60')[:2] == (60, 2 * SELL)
+    assert parse(' Buy ', 'MSFT', 2, 3.0, '1970-01-01T00:01:00+00:00')[:2] == (60, 2 * BUY)
+
+
+def test_reader_reports_bad_rows_by_line_and_keeps_going(tmp_path):
+    path = write(tmp_path / 'trades.csv', HEADER + "\n".join([
+        "2020-01-01,BUY,AAPL,10,100",
+        "2020-01-02,BUY,AAPL,1.5,100",
+        "2020-01-03,BUY,AAPL",
+        "2020-01-04,SELL,AAPL,2,110",
+        "2020-01-02,BUY,MSFT,1,200",
+        "not a date,BUY,MSFT,1,200",
+    ]) + "\n")
+    trades, rejected = read_all(path, chunk_size=2)
+    assert [trade[0] for trade in trades] == [2, 5]
+    assert [line for line, _ in rejected] == [3, 4, 6, 7]
+    messages = dict(rejected)
+    assert "positive whole number" in messages[3]
+    assert messages[4] == "unreadable row"
+    assert messages[6] == "trade is older than the one before it"
+
+
+def test_reader_needs_the_required_columns(tmp_path):
+    path = write(tmp_path / 'trades.csv', "date,action,symbol,price\n2020-01-01,BUY,AAPL,1\n")
+    with pytest.raises(ValueError, match="no quantity column"):
+        read_all(path)
+
+
+def test_reader_handles_a_byte_order_mark(tmp_path):
+    path = write(tmp_path / 'trades.csv', HEADER + "2020-01-01,BUY,AAPL,1,2\n", encoding='utf-8-sig')
+    trades, rejected = read_all(path)
+    assert rejected == []
+    assert trades[0][1] != 0 and trades[0][4] == 'AAPL'
+
+
+def test_reader_reads_gzipped_jsonl(tmp_path):
+    path = str(tmp_path / 'trades.jsonl.gz')
+    with gzip.open(path, 'wt', encoding='utf-8') as trade_file:
+        trade_file.write('{"action": "BUY", "symbol": "AAPL", "quantity": 3, "price": 2, "date": 60}\n')
+        trade_file.write('{"action": "BUY", "symbol": "AAPL", "quantity": true, "price": 2, "date": 61}\n')
+        trade_file.write('["not", "an", "object"]\n')
+        trade_file.write('{broken\n')
+    trades, rejected = read_all(path)
+    assert trades == [(1, 60, 3, 2.0, 'AAPL')]
+    assert [line for line, _ in rejected] == [2, 3, 4]
+    assert dict(rejected)[3] == dict(rejected)[4] == "unreadable row"
+
+
+def test_import_refuses_selling_more_than_is_held(tmp_path):
+    tracker = StockPortfolioTracker()
+    path = write(tmp_path / 'trades.csv', HEADER + "60,BUY,AAPL,5,10\n120,SELL,AAPL,6,10\n180,SELL,AAPL,5,10\n")
+    imported, rejected, errors = import_trades(tracker, path)
+    assert (imported, rejected) == (2, 1)
+    assert errors == [(3, "cannot sell 6 of 5 AAPL shares")]
+    assert 'AAPL' not in tracker.portfolio
+
+
+def test_import_checks_sells_in_the_past_against_later_history(tmp_path):
+    tracker = StockPortfolioTracker()
+    tracker.apply_trades([(1, 100, 10, 10.0, 'AAPL'), (2, 200, -10, 10.0, 'AAPL'), (3, 300, 10, 10.0, 'AAPL')])
+    # Nothing is held at 250, though 10 shares are held now
+    path = write(tmp_path / 'late.csv', HEADER + "250,SELL,AAPL,5,10\n150,SELL,AAPL,1,10\n")
+    imported, rejected, errors = import_trades(tracker, path)
+    assert (imported, rejected) == (0, 2)
+    assert errors[0] == (2, "cannot sell 5 of 0 AAPL shares")
+    assert errors[1] == (3, "trade is older than the one before it")
+
+    # Selling 5 at 150 leaves enough for the sell at 200 only if the sell there is smaller
+    path = write(tmp_path / 'early.csv', HEADER + "50,BUY,AAPL,5,10\n150,SELL,AAPL,5,10\n")
+    assert import_trades(tracker, path)[:2] == (2, 0)
+    assert tracker.portfolio['AAPL'] == 10
+    assert list(tracker.portfolio_history.timestamps) == [50, 100, 150, 200, 300]
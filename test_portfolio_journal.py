@@ -0,0 +1,92 @@
+import io
+import os
+
+import pytest
+
+import portfolio_journal
+from portfolio_journal import PortfolioStore, encode_trade, iter_trades
+from portfolio_tracker import StockPortfolioTracker
+
+TRADES = [(60 * day, change, 10.0 + day, symbol)
+          for day, (change, symbol) in enumerate([(10, 'AAPL'), (5, 'MSFT'), (-4, 'AAPL'), (7, 'GOOGL'),
+                                                  (-5, 'MSFT'), (3, 'AAPL'), (-2, 'GOOGL')], 1)]
+
+
+def state(tracker):
+    return (tracker.portfolio, tracker.cost_basis, tracker.total_invested, tracker.total_sold,
+            tracker.trade_count, list(tracker.portfolio_history.rows()))
+
+
+def tracker_with(directory, trades=(), snapshot_every=1000):
+    """A tracker recovered from directory that then makes trades, journaled without the background thread"""
+    tracker = StockPortfolioTracker()
+    store = PortfolioStore(str(directory), snapshot_every=snapshot_every, sync_interval=None)
+    tracker.open_store(store)
+    tracker.apply_trades([(line, *trade) for line, trade in enumerate(trades, 1)])
+    return tracker
+
+
+def in_memory(trades):
+    tracker = StockPortfolioTracker()
+    tracker.apply_trades([(line, *trade) for line, trade in enumerate(trades, 1)])
+    return tracker
+
+
+def test_close_and_reopen_keeps_holdings_and_history(tmp_path):
+    tracker = tracker_with(tmp_path, TRADES)
+    expected = state(tracker)
+    tracker.close_store()
+
+    reopened = StockPortfolioTracker()
+    assert reopened.open_store(PortfolioStore(str(tmp_path), sync_interval=None)) == 0
+    assert state(reopened) == expected
+
+
+@pytest.mark.parametrize('snapshot_every', [1, 5, 1000])
+def test_crash_recovery_replays_the_journal_after_the_snapshot(tmp_path, snapshot_every):
+    tracker = tracker_with(tmp_path, TRADES[:4], snapshot_every)
+    tracker.apply_trades([(1, *TRADES[4])])
+    tracker.apply_trades([(1, *trade) for trade in TRADES[5:]])
+    tracker.store.journal.sync()  # written but not closed, as a crash would leave it
+
+    recovered = StockPortfolioTracker()
+    replayed = recovered.open_store(PortfolioStore(str(tmp_path), sync_interval=None))
+    assert replayed == {1: 0, 5: 2, 1000: len(TRADES)}[snapshot_every]
+    assert state(recovered) == state(in_memory(TRADES))
+
+
+def test_torn_record_is_cut_off_before_new_trades_are_appended(tmp_path):
+    tracker = tracker_with(tmp_path, TRADES[:3])
+    tracker.store.journal.sync()
+    journal_path = tracker.store.journal_path
+    with open(journal_path, 'ab') as journal_file:
+        journal_file.write(encode_trade(*TRADES[3])[:-3])  # crashed mid-write
+
+    recovered = tracker_with(tmp_path, TRADES[4:5])
+    assert state(recovered) == state(in_memory(TRADES[:3] + TRADES[4:5]))
+    recovered.store.journal.sync()
+    with open(journal_path, 'rb') as journal_file:
+        assert [trade[:4] for trade in iter_trades(journal_file)] == TRADES[:3] + TRADES[4:5]
+
+
+def test_a_torn_record_alone_recovers_to_nothing(tmp_path):
+    with open(os.path.join(str(tmp_path), portfolio_journal.JOURNAL_NAME), 'wb') as journal_file:
+        journal_file.write(encode_trade(*TRADES[0])[:5])
+    tracker = tracker_with(tmp_path)
+    assert tracker.portfolio == {} and tracker.trade_count == 0
+    assert os.path.getsize(tracker.store.journal_path) == 0
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 25, 64, 1 << 20])
+def test_iter_trades_reads_records_split_across_chunks(monkeypatch, chunk_size):
+    monkeypatch.setattr(portfolio_journal, 'READ_CHUNK_SIZE', chunk_size)
+    records = [encode_trade(*trade) for trade in TRADES]
+    data = b''.join(records) + records[0][:9]
+    ends = [sum(map(len, records[:index])) for index in range(1, len(records) + 1)]
+
+    read = list(iter_trades(io.BytesIO(data)))
+    assert [trade[:4] for trade in read] == TRADES
+    assert [trade[4] for trade in read] == ends
+
+    assert [trade[:4] for trade in iter_trades(io.BytesIO(data), ends[1], ends[4])] == TRADES[2:5]
+    assert [trade[:4] for trade in iter_trades(io.BytesIO(data), 0, ends[2] - 1)] == TRADES[:2]